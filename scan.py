@@ -24,6 +24,7 @@ import sys
 import argparse
 import json
 import logging
+import traceback
 from pathlib import Path
 from datetime import datetime
 
@@ -147,6 +148,28 @@ def calculate_risk_and_confidence(http_status: int, provider: str, cname: str) -
     return "low", 30
 
 
+def load_appended_subdomains(results_file: Path) -> set:
+    """
+    Subdomains update_from_log.py appended to the NDJSON sidecar of results_file.
+
+    Those entries only reach results_file when it compacts the sidecar, so
+    duplicate checks have to look at both files.
+    """
+    sidecar = results_file.with_suffix('.ndjson')
+    subdomains = set()
+
+    if sidecar.exists():
+        with open(sidecar, 'r') as f:
+            for line in f:
+                try:
+                    subdomains.add(json.loads(line).get('subdomain'))
+                except json.JSONDecodeError:
+                    # Blank or partial line from an interrupted append
+                    continue
+
+    return subdomains
+
+
 def save_result_to_all_results(subdomain_data: dict, results_file: Path = RESULTS_FILE):
     """
     Append a single result to all_results.json (incremental save).
@@ -167,6 +190,8 @@ def save_result_to_all_results(subdomain_data: dict, results_file: Path = RESULT
         except (json.JSONDecodeError, IOError):
             pass
 
+    existing_subdomains |= load_appended_subdomains(results_file)
+
     # Only add if not duplicate
     if subdomain_data.get('subdomain') not in existing_subdomains:
         existing.append(subdomain_data)
@@ -635,9 +660,13 @@ def main():
         print(f"Error loading configuration: {str(e)}", file=sys.stderr)
         return 1
 
-    # Initialize orchestrator
-    orchestrator = OrchestratorV2(config)
+    # Initialize orchestrator; closing it releases its on-disk caches
+    with OrchestratorV2(config) as orchestrator:
+        return run(args, orchestrator)
+
 
+def run(args, orchestrator: OrchestratorV2) -> int:
+    """Collect or load the domain list, scan it and save results"""
     # Collect domains from source if requested
     if args.collect_domains:
         from src.collection.domain_collector import DomainCollector
@@ -676,7 +705,6 @@ def main():
         except Exception as e:
             print(f"Error collecting domains: {str(e)}", file=sys.stderr)
             if args.verbose:
-                import traceback
                 traceback.print_exc()
             return 1
 
@@ -716,7 +744,6 @@ def main():
         except Exception as e:
             print(f"Error reading Google Sheet: {str(e)}", file=sys.stderr)
             if args.verbose:
-                import traceback
                 traceback.print_exc()
             return 1
 
@@ -915,7 +942,6 @@ def main():
             print(f"💾 Progress saved at row {absolute_row} ({domains_processed} scanned this session)", file=sys.stderr)
             print(f"   Run again to resume from row {absolute_row + 1}.\n", file=sys.stderr)
         if args.verbose:
-            import traceback
             traceback.print_exc()
         return 1
 
@@ -8,7 +8,10 @@ NO database, NO scheduling - just simple data fetching and caching.
 
 import requests
 import csv
+import io
 import math
+import sys
+import zipfile
 import logging
 from typing import List, Dict, Optional
 from pathlib import Path
@@ -97,73 +100,98 @@ class DomainCollector:
                 ...
             ]
         """
-        logger.info(f"Downloading Tranco top {top_n} domains...")
+        logger.info("Downloading Tranco top %d domains...", top_n)
 
         try:
-            import zipfile
-            import io
-
             # Download ZIP file
             response = requests.get(self.tranco_url, timeout=60)
             response.raise_for_status()
 
-            # Extract CSV from ZIP
-            zip_file = zipfile.ZipFile(io.BytesIO(response.content))
-            csv_data = zip_file.read('top-1m.csv').decode('utf-8')
-
-            # Parse CSV and calculate authority scores
+            # Stream the CSV member straight out of the ZIP; only the first
+            # top_n rows are ever decoded instead of the full 1M-line file
             domains_with_ranks = []
-            reader = csv.reader(csv_data.split('\n'))
 
-            for i, row in enumerate(reader):
-                if i >= top_n:
-                    break
+            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file, \
+                    zip_file.open('top-1m.csv') as member:
+                reader = csv.reader(io.TextIOWrapper(member, encoding='utf-8'))
 
-                if len(row) == 2:
-                    rank, domain = row
+                # Parse CSV and calculate authority scores
+                for i, row in enumerate(reader):
+                    if i >= top_n:
+                        break
 
-                    # Calculate authority score based on rank
-                    # Logarithmic scale: rank 1 = 100, rank 10000 = ~60
-                    authority_score = self._rank_to_authority(int(rank), top_n)
+                    if len(row) == 2:
+                        rank, domain = row
 
-                    domains_with_ranks.append({
-                        'rank': int(rank),
-                        'domain': domain.strip(),
-                        'authority_score': authority_score
-                    })
+                        # Calculate authority score based on rank
+                        # Logarithmic scale: rank 1 = 100, rank 10000 = ~60
+                        authority_score = self._rank_to_authority(int(rank), top_n)
+
+                        domains_with_ranks.append({
+                            'rank': int(rank),
+                            'domain': domain.strip(),
+                            'authority_score': authority_score
+                        })
 
             # Cache to file
-            cache_file = self.cache_dir / f'tranco_top{top_n}.csv'
-            with open(cache_file, 'w') as f:
-                for d in domains_with_ranks:
-                    f.write(f"{d['rank']},{d['domain']},{d['authority_score']}\n")
+            self._write_tranco_cache(top_n, domains_with_ranks)
 
-            logger.info(f"✅ Downloaded {len(domains_with_ranks)} Tranco domains")
+            logger.info("✅ Downloaded %d Tranco domains", len(domains_with_ranks))
             return domains_with_ranks
 
         except Exception as e:
-            logger.error(f"Failed to download Tranco domains: {e}")
+            logger.error("Failed to download Tranco domains: %s", e)
 
             # Try to use cached version
-            cache_file = self.cache_dir / f'tranco_top{top_n}.csv'
-            if cache_file.exists():
+            domains_with_ranks = self._read_tranco_cache(top_n)
+            if domains_with_ranks is not None:
                 logger.info("Using cached Tranco domains")
-                domains_with_ranks = []
-
-                with open(cache_file, 'r') as f:
-                    for line in f:
-                        parts = line.strip().split(',')
-                        if len(parts) == 3:
-                            domains_with_ranks.append({
-                                'rank': int(parts[0]),
-                                'domain': parts[1],
-                                'authority_score': int(parts[2])
-                            })
-
                 return domains_with_ranks
 
             raise
 
+    def _write_tranco_cache(self, top_n: int, domains_with_ranks: List[Dict]) -> None:
+        """
+        Cache Tranco domains as rank,domain,authority_score CSV rows.
+
+        Args:
+            top_n: Number of top domains the list was built for
+            domains_with_ranks: Domain dicts as returned by collect_tranco_domains
+        """
+        cache_file = self.cache_dir / f'tranco_top{top_n}.csv'
+        with open(cache_file, 'w') as f:
+            f.writelines(
+                f"{d['rank']},{d['domain']},{d['authority_score']}\n" for d in domains_with_ranks
+            )
+
+    def _read_tranco_cache(self, top_n: int) -> Optional[List[Dict]]:
+        """
+        Load cached Tranco domains (only used when the download fails).
+
+        Args:
+            top_n: Number of top domains the list was built for
+
+        Returns:
+            List of domain dicts, or None if no cache exists
+        """
+        cache_file = self.cache_dir / f'tranco_top{top_n}.csv'
+        if not cache_file.exists():
+            return None
+
+        domains_with_ranks = []
+
+        with open(cache_file, 'r') as f:
+            for line in f:
+                parts = line.strip().split(',')
+                if len(parts) == 3:
+                    domains_with_ranks.append({
+                        'rank': int(parts[0]),
+                        'domain': parts[1],
+                        'authority_score': int(parts[2])
+                    })
+
+        return domains_with_ranks
+
     def _rank_to_authority(self, rank: int, max_rank: int) -> int:
         """
         Convert Tranco rank to authority score (1-100) using logarithmic scale.
@@ -283,17 +311,17 @@ class DomainCollector:
         myleadfox_dir = Path('data/domain_sources/myleadfox')
 
         if not myleadfox_dir.exists():
-            logger.warning(f"MyLeadFox directory not found: {myleadfox_dir}")
+            logger.warning("MyLeadFox directory not found: %s", myleadfox_dir)
             return []
 
-        # Find all CSV files
-        csv_files = list(myleadfox_dir.glob('*.csv'))
+        # Find all CSV files (sorted so domain order is stable for row-based resume)
+        csv_files = sorted(myleadfox_dir.glob('*.csv'))
 
         if not csv_files:
-            logger.warning(f"No CSV files found in {myleadfox_dir}")
+            logger.warning("No CSV files found in %s", myleadfox_dir)
             return []
 
-        domains = set()
+        seen = set()
 
         for csv_file in csv_files:
             try:
@@ -305,12 +333,13 @@ class DomainCollector:
                         if domain:
                             # Remove quotes if present
                             domain = domain.strip('"')
-                            domains.add(domain)
+                            seen.add(sys.intern(domain))
 
-            except Exception as e:
-                logger.error(f"Failed to read {csv_file.name}: {e}")
+            except Exception:
+                logger.exception("Failed to read %s", csv_file.name)
                 continue
 
-        domains_list = sorted(list(domains))
-        logger.debug(f"Loaded {len(domains_list)} domains from {len(csv_files)} MyLeadFox CSV files")
+        # Sorted so the list is stable across runs: scan.py resumes by row number
+        domains_list = sorted(seen)
+        logger.debug("Loaded %d domains from %d MyLeadFox CSV files", len(domains_list), len(csv_files))
         return domains_list
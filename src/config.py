@@ -6,11 +6,18 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Prefer the LibYAML-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class Config:
     """Configuration manager"""
 
-    DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.yaml'
+    PROJECT_ROOT = Path(__file__).parent.parent
+    DEFAULT_CONFIG_PATH = PROJECT_ROOT / 'config' / 'settings.yaml'
 
     def __init__(self, config_file: Optional[str] = None):
         """
@@ -56,7 +63,7 @@ class Config:
         """Load YAML file"""
         try:
             with open(filepath, 'r') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=_YamlLoader) or {}
         except Exception as e:
             print(f"Warning: Failed to load {filepath}: {e}")
             return {}
@@ -123,3 +130,20 @@ class Config:
                 return default
 
         return value if value is not None else default
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """
+        Get a file path setting, resolving relative paths against the project root
+
+        Args:
+            key: Configuration key (e.g., 'tools.dnsx.cache_file')
+
+        Returns:
+            Absolute path, or None if the setting is empty or missing
+        """
+        value = self.get(key)
+        if not value:
+            return None
+
+        path = Path(value).expanduser()
+        return path if path.is_absolute() else self.PROJECT_ROOT / path
@@ -4,19 +4,37 @@ Confidence scoring system for vulnerability assessment
 from typing import Dict, Any, List
 
 
+# Scoring weights
+_W_NXDOMAIN = 40            # NXDOMAIN is strong indicator
+_W_HTTP_404 = 30            # 404 status code
+_W_HTTP_403 = 10            # 403 might indicate unclaimed (generic)
+_W_HTTP_403_SHOPIFY = 35    # 403 on Shopify is STRONG indicator of unclaimed store
+_W_FINGERPRINT_HIGH = 25    # High confidence fingerprint
+_W_FINGERPRINT_MEDIUM = 15  # Medium confidence fingerprint
+_W_FINGERPRINT_LOW = 5      # Low confidence fingerprint
+_W_CNAME_PATTERN = 5        # CNAME matches pattern
+
+
+def _is_shopify(provider) -> bool:
+    """Case-insensitive check for the Shopify provider name"""
+    # Provider names come from a small fixed set (interned by ProviderDetector),
+    # so the exact-match fast path avoids lowercasing on every call
+    return provider == 'Shopify' or (bool(provider) and provider.lower() == 'shopify')
+
+
 class ConfidenceScorer:
     """Calculate confidence scores for subdomain takeover vulnerabilities"""
 
-    # Scoring weights
+    # Scoring weights (read-only view of the module constants)
     WEIGHTS = {
-        'nxdomain': 40,           # NXDOMAIN is strong indicator
-        'http_404': 30,           # 404 status code
-        'http_403': 10,           # 403 might indicate unclaimed (generic)
-        'http_403_shopify': 35,   # 403 on Shopify is STRONG indicator of unclaimed store
-        'fingerprint_high': 25,   # High confidence fingerprint
-        'fingerprint_medium': 15, # Medium confidence fingerprint
-        'fingerprint_low': 5,     # Low confidence fingerprint
-        'cname_pattern': 5,       # CNAME matches pattern
+        'nxdomain': _W_NXDOMAIN,
+        'http_404': _W_HTTP_404,
+        'http_403': _W_HTTP_403,
+        'http_403_shopify': _W_HTTP_403_SHOPIFY,
+        'fingerprint_high': _W_FINGERPRINT_HIGH,
+        'fingerprint_medium': _W_FINGERPRINT_MEDIUM,
+        'fingerprint_low': _W_FINGERPRINT_LOW,
+        'cname_pattern': _W_CNAME_PATTERN,
     }
 
     def __init__(self):
@@ -37,23 +55,22 @@ class ConfidenceScorer:
 
         # DNS factors
         if finding.get('nxdomain'):
-            score += self.WEIGHTS['nxdomain']
+            score += _W_NXDOMAIN
             self.evidence.append("NXDOMAIN - DNS record does not exist")
 
         # HTTP status code factors
         http_status = finding.get('http_status') or finding.get('status')
-        provider = finding.get('provider', '').lower()
 
         if http_status == 404:
-            score += self.WEIGHTS['http_404']
+            score += _W_HTTP_404
             self.evidence.append("HTTP 404 - Not Found")
         elif http_status == 403:
             # Shopify 403 is a STRONG indicator of unclaimed store
-            if provider == 'shopify':
-                score += self.WEIGHTS['http_403_shopify']
+            if _is_shopify(finding.get('provider')):
+                score += _W_HTTP_403_SHOPIFY
                 self.evidence.append("HTTP 403 - Shopify unclaimed store (HIGH RISK)")
             else:
-                score += self.WEIGHTS['http_403']
+                score += _W_HTTP_403
                 self.evidence.append("HTTP 403 - Forbidden")
 
         # Fingerprint factors
@@ -61,18 +78,18 @@ class ConfidenceScorer:
         if fingerprint:
             confidence_level = finding.get('fingerprint_confidence', 'medium')
             if confidence_level == 'high':
-                score += self.WEIGHTS['fingerprint_high']
+                score += _W_FINGERPRINT_HIGH
                 self.evidence.append(f"High-confidence fingerprint matched: '{fingerprint[:50]}'")
             elif confidence_level == 'medium':
-                score += self.WEIGHTS['fingerprint_medium']
+                score += _W_FINGERPRINT_MEDIUM
                 self.evidence.append(f"Medium-confidence fingerprint matched: '{fingerprint[:50]}'")
             else:
-                score += self.WEIGHTS['fingerprint_low']
+                score += _W_FINGERPRINT_LOW
                 self.evidence.append(f"Fingerprint matched: '{fingerprint[:50]}'")
 
         # CNAME pattern match
         if finding.get('cname') and finding.get('provider'):
-            score += self.WEIGHTS['cname_pattern']
+            score += _W_CNAME_PATTERN
             self.evidence.append(f"CNAME points to {finding['provider']} ({finding['cname']})")
 
         return min(score, 100)  # Cap at 100
@@ -4,12 +4,22 @@ IP-based Cloud Provider Detection
 This is what the user asked for: "can you check with IP ?"
 Much more accurate than CNAME-only matching.
 """
+import heapq
 import json
 import logging
+import socket
+import threading
+from bisect import bisect_right
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import ipaddress
 
+# orjson parses the multi-megabyte range files several times faster
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class IPMatcher:
     """
@@ -18,154 +28,259 @@ class IPMatcher:
     This provides accurate provider detection beyond just CNAME patterns.
     """
 
+    # Max distinct IPs remembered by match_ip
+    MATCH_CACHE_SIZE = 8192
+
+    # Provider -> (ranges file under ip_ranges/, parser), in match priority order
+    RANGE_FILES = {
+        'AWS': ('aws.json', '_parse_aws_ranges'),
+        'GCP': ('gcp.json', '_parse_gcp_ranges'),
+        'Azure': ('azure.json', '_parse_azure_ranges'),
+        'Shopify': ('shopify.json', '_parse_shopify_ranges'),  # Cloudflare IPs
+    }
+
     def __init__(self, config_dir: Path):
         """
         Initialize IP matcher
 
+        Range files are parsed lazily, the first time a lookup needs that
+        provider, so runs that only touch some providers skip the rest.
+
         Args:
             config_dir: Path to config directory with ip_ranges/
         """
         self.config_dir = config_dir
         self.logger = logging.getLogger(__name__)
-        self.ip_ranges = self._load_ip_ranges()
+        self.ip_ranges_dir = config_dir / 'ip_ranges'
+
+        # provider -> range table, filled in by _ensure_loaded
+        self.ip_ranges: Dict[str, Dict[int, Dict[str, List]]] = {}
+        self._loaded = set()
+        self._load_lock = threading.Lock()
 
-    def _load_ip_ranges(self) -> Dict:
+        if not self.ip_ranges_dir.exists():
+            self.logger.warning(f"IP ranges directory not found: {self.ip_ranges_dir}")
+            self._loaded.update(self.RANGE_FILES)
+
+        # ip string -> match result (None cached too); many subdomains share
+        # the same CDN/load balancer A records
+        self._match_cache: Dict[str, Optional[Dict]] = {}
+
+    def _ensure_loaded(self, provider: str) -> Optional[Dict[int, Dict[str, List]]]:
         """
-        Load cloud provider IP ranges from JSON files
+        Load a provider's IP ranges on first use
+
+        Args:
+            provider: Provider key from RANGE_FILES
 
         Returns:
-            Dictionary of provider -> IP ranges
+            The provider's range table, or None if unavailable
         """
-        ip_ranges = {}
-        ip_ranges_dir = self.config_dir / 'ip_ranges'
+        if provider not in self._loaded:
+            with self._load_lock:
+                if provider not in self._loaded:
+                    table = self._load_provider_ranges(provider)
+                    if table is not None:
+                        self.ip_ranges[provider] = table
+                    self._loaded.add(provider)
 
-        if not ip_ranges_dir.exists():
-            self.logger.warning(f"IP ranges directory not found: {ip_ranges_dir}")
-            return {}
+        return self.ip_ranges.get(provider)
 
-        # Load AWS ranges
-        aws_file = ip_ranges_dir / 'aws.json'
-        if aws_file.exists():
-            try:
-                with open(aws_file) as f:
-                    data = json.load(f)
-                    ip_ranges['AWS'] = self._parse_aws_ranges(data)
-                    self.logger.debug(f"Loaded {len(ip_ranges['AWS'])} AWS IP ranges")
-            except Exception as e:
-                self.logger.error(f"Failed to load AWS ranges: {str(e)}")
-
-        # Load GCP ranges
-        gcp_file = ip_ranges_dir / 'gcp.json'
-        if gcp_file.exists():
-            try:
-                with open(gcp_file) as f:
-                    data = json.load(f)
-                    ip_ranges['GCP'] = self._parse_gcp_ranges(data)
-                    self.logger.debug(f"Loaded {len(ip_ranges['GCP'])} GCP IP ranges")
-            except Exception as e:
-                self.logger.error(f"Failed to load GCP ranges: {str(e)}")
-
-        # Load Azure ranges (if available)
-        azure_file = ip_ranges_dir / 'azure.json'
-        if azure_file.exists():
-            try:
-                with open(azure_file) as f:
-                    data = json.load(f)
-                    ip_ranges['Azure'] = self._parse_azure_ranges(data)
-                    if ip_ranges['Azure']:
-                        self.logger.debug(f"Loaded {len(ip_ranges['Azure'])} Azure IP ranges")
-            except Exception as e:
-                self.logger.error(f"Failed to load Azure ranges: {str(e)}")
-
-        # Load Shopify ranges (Cloudflare IPs)
-        shopify_file = ip_ranges_dir / 'shopify.json'
-        if shopify_file.exists():
-            try:
-                with open(shopify_file) as f:
-                    data = json.load(f)
-                    ip_ranges['Shopify'] = self._parse_shopify_ranges(data)
-                    if ip_ranges['Shopify']:
-                        self.logger.debug(f"Loaded {len(ip_ranges['Shopify'])} Shopify IP ranges")
-            except Exception as e:
-                self.logger.error(f"Failed to load Shopify ranges: {str(e)}")
+    def _load_provider_ranges(self, provider: str) -> Optional[Dict[int, Dict[str, List]]]:
+        """
+        Load one provider's IP ranges from its JSON file
 
-        return ip_ranges
+        Args:
+            provider: Provider key from RANGE_FILES
 
-    def _parse_aws_ranges(self, data: Dict) -> List[Dict]:
-        """Parse AWS IP ranges JSON"""
-        ranges = []
+        Returns:
+            Range table, or None if the file is missing or unreadable
+        """
+        filename, parser = self.RANGE_FILES[provider]
+        ranges_file = self.ip_ranges_dir / filename
+        if not ranges_file.exists():
+            return None
 
-        for prefix in data.get('ipv4_ranges', []):
-            try:
-                ranges.append({
-                    'network': ipaddress.ip_network(prefix['ip_prefix']),
-                    'service': prefix.get('service'),
-                    'region': prefix.get('region')
-                })
-            except:
-                pass
+        try:
+            data = _json_loads(ranges_file.read_bytes())
+            table = getattr(self, parser)(data)
+        except Exception as e:
+            self.logger.error(f"Failed to load {provider} ranges: {str(e)}")
+            return None
 
-        return ranges
+        count = self._range_count(table)
+        if count:
+            self.logger.debug(f"Loaded {count} {provider} IP ranges")
+        return table
 
-    def _parse_gcp_ranges(self, data: Dict) -> List[Dict]:
+    def _parse_aws_ranges(self, data: Dict) -> Dict[int, Dict[str, List]]:
+        """Parse AWS IP ranges JSON"""
+        return self._parse_prefix_records(data.get('ipv4_ranges', []), region_key='region')
+
+    def _parse_gcp_ranges(self, data: Dict) -> Dict[int, Dict[str, List]]:
         """Parse GCP IP ranges JSON"""
-        ranges = []
+        return self._parse_prefix_records(data.get('ipv4_ranges', []), region_key='scope')
+
+    def _parse_azure_ranges(self, data: Dict) -> Dict[int, Dict[str, List]]:
+        """Parse Azure IP ranges JSON"""
+        return self._parse_prefix_records(data.get('ipv4_ranges', []), region_key='region')
 
-        for prefix in data.get('ipv4_ranges', []):
+    def _parse_shopify_ranges(self, data: Dict) -> Dict[int, Dict[str, List]]:
+        """Parse Shopify (Cloudflare) IP ranges JSON"""
+        entries = []
+
+        # Plain CIDR strings for both IPv4 and IPv6
+        for cidr in data.get('ipv4_ranges', []) + data.get('ipv6_ranges', []):
             try:
-                ranges.append({
-                    'network': ipaddress.ip_network(prefix['ip_prefix']),
-                    'service': prefix.get('service'),
-                    'scope': prefix.get('scope')
-                })
-            except:
-                pass
+                network = ipaddress.ip_network(cidr)
+            except ValueError:
+                continue
+            entries.append((network, 'Shopify', None))
 
-        return ranges
+        return self._build_range_table(entries)
 
-    def _parse_azure_ranges(self, data: Dict) -> List[Dict]:
-        """Parse Azure IP ranges JSON"""
-        ranges = []
+    def _parse_prefix_records(self, records: List[Dict], region_key: str) -> Dict[int, Dict[str, List]]:
+        """
+        Parse a list of {'ip_prefix': ..., 'service': ..., <region_key>: ...} records
+
+        Args:
+            records: Prefix records from a provider ranges file
+            region_key: Key holding the region ('region' for AWS/Azure, 'scope' for GCP)
+
+        Returns:
+            Range table (see _build_range_table)
+        """
+        entries = []
 
-        for prefix in data.get('ipv4_ranges', []):
+        for prefix in records:
             try:
-                ranges.append({
-                    'network': ipaddress.ip_network(prefix['ip_prefix']),
-                    'service': prefix.get('service'),
-                    'region': prefix.get('region')
-                })
-            except:
-                pass
+                network = ipaddress.ip_network(prefix['ip_prefix'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            entries.append((network, prefix.get('service'), prefix.get(region_key)))
 
-        return ranges
+        return self._build_range_table(entries)
 
-    def _parse_shopify_ranges(self, data: Dict) -> List[Dict]:
-        """Parse Shopify (Cloudflare) IP ranges JSON"""
-        ranges = []
+    @staticmethod
+    def _build_range_table(entries: List[Tuple]) -> Dict[int, Dict[str, List]]:
+        """
+        Build a provider's range table from parsed (network, service, region) entries
 
-        # Parse IPv4 ranges
-        for cidr in data.get('ipv4_ranges', []):
-            try:
-                ranges.append({
-                    'network': ipaddress.ip_network(cidr),
-                    'service': 'Shopify',
-                    'cdn': 'Cloudflare'
-                })
-            except:
-                pass
-
-        # Parse IPv6 ranges
-        for cidr in data.get('ipv6_ranges', []):
-            try:
-                ranges.append({
-                    'network': ipaddress.ip_network(cidr),
-                    'service': 'Shopify',
-                    'cdn': 'Cloudflare'
-                })
-            except:
-                pass
+        Networks are only handled with ipaddress here; the table keeps them as
+        (start, end) integers sorted by start address, one set of parallel
+        lists per IP version, so lookups are a binary search over plain ints
+        and no ip_network objects stay alive after loading.
+
+        Range files list some addresses more than once (duplicate prefixes,
+        narrow prefixes inside broader ones), and a lookup reports the first
+        listed network containing the address. The networks are therefore
+        flattened into disjoint intervals, each labelled with the earliest
+        listed network covering it, and neighbouring intervals with the same
+        service/region are merged.
+
+        Args:
+            entries: List of (ip_network, service, region) tuples
+
+        Returns:
+            Dict of IP version -> {'start', 'end', 'service', 'region'} columns
+        """
+        by_version = {4: [], 6: []}
+        for position, (network, service, region) in enumerate(entries):
+            by_version[network.version].append((
+                int(network.network_address),
+                int(network.broadcast_address),
+                position,
+                service,
+                region
+            ))
+
+        table = {}
+        for version, intervals in by_version.items():
+            intervals.sort()
+
+            # Every address between two consecutive boundaries is covered by
+            # the same set of networks
+            boundaries = sorted({start for start, *_ in intervals} | {end + 1 for _, end, *_ in intervals})
+
+            columns = {'start': [], 'end': [], 'service': [], 'region': []}
+            active = []  # heap of (position, end, service, region)
+            pending = 0
+            for low, high in zip(boundaries, boundaries[1:]):
+                while pending < len(intervals) and intervals[pending][0] <= low:
+                    start, end, position, service, region = intervals[pending]
+                    heapq.heappush(active, (position, end, service, region))
+                    pending += 1
+                while active and active[0][1] < low:
+                    heapq.heappop(active)
+                if not active:
+                    continue
+
+                _, _, service, region = active[0]
+                if (columns['end'] and columns['end'][-1] == low - 1
+                        and columns['service'][-1] == service and columns['region'][-1] == region):
+                    columns['end'][-1] = high - 1
+                else:
+                    columns['start'].append(low)
+                    columns['end'].append(high - 1)
+                    columns['service'].append(service)
+                    columns['region'].append(region)
+
+            table[version] = columns
+
+        return table
+
+    @staticmethod
+    def _range_count(table: Dict[int, Dict[str, List]]) -> int:
+        """Number of networks in a range table across IP versions"""
+        return sum(len(columns['start']) for columns in table.values())
+
+    @staticmethod
+    def _find_range(columns: Dict[str, List], ip_int: int) -> Optional[int]:
+        """
+        Find the interval containing ip_int
+
+        Args:
+            columns: One IP version's columns from _build_range_table
+            ip_int: IP address as an integer
+
+        Returns:
+            Row number in the columns, or None if not matched
+        """
+        start = columns['start']
+        end = columns['end']
+
+        # Fast reject: outside the provider's overall span for this version
+        if not start or ip_int < start[0] or ip_int > end[-1]:
+            return None
 
-        return ranges
+        # Intervals are disjoint, so only the last one starting at or before
+        # ip_int can contain it
+        i = bisect_right(start, ip_int) - 1
+        if end[i] >= ip_int:
+            return i
+
+        return None
+
+    @staticmethod
+    def _ip_to_int(ip_address: str) -> Optional[Tuple[int, int]]:
+        """
+        Convert an IP address string to (version, integer)
+
+        Uses socket.inet_pton rather than ipaddress.ip_address, which avoids
+        building an address object per lookup.
+
+        Returns:
+            (4 or 6, address as int), or None if not a valid IP address
+        """
+        try:
+            return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip_address), 'big')
+        except (OSError, TypeError):
+            pass
+
+        try:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip_address), 'big')
+        except (OSError, TypeError):
+            return None
 
     def match_ip(self, ip_address: str) -> Optional[Dict]:
         """
@@ -178,21 +293,44 @@ class IPMatcher:
             Dict with provider info if matched, None otherwise
         """
         try:
-            ip = ipaddress.ip_address(ip_address)
-        except ValueError:
+            return self._match_cache[ip_address]
+        except KeyError:
+            pass
+
+        result = self._match_ip_uncached(ip_address)
+
+        if len(self._match_cache) >= self.MATCH_CACHE_SIZE:
+            # Drop the oldest half (dicts keep insertion order)
+            for stale in list(self._match_cache)[:self.MATCH_CACHE_SIZE // 2]:
+                self._match_cache.pop(stale, None)
+        self._match_cache[ip_address] = result
+
+        return result
+
+    def _match_ip_uncached(self, ip_address: str) -> Optional[Dict]:
+        """Look up ip_address in every provider's range table, in RANGE_FILES order"""
+        parsed = self._ip_to_int(ip_address)
+        if parsed is None:
             return None
 
+        version, ip_int = parsed
+
         # Check each provider
-        for provider, ranges in self.ip_ranges.items():
-            for range_info in ranges:
-                if ip in range_info['network']:
-                    return {
-                        'provider': provider,
-                        'service': range_info.get('service'),
-                        'region': range_info.get('region') or range_info.get('scope'),
-                        'detection_method': 'ip_range',
-                        'ip_confirmed': True
-                    }
+        for provider in self.RANGE_FILES:
+            ranges = self._ensure_loaded(provider)
+            if ranges is None:
+                continue
+
+            columns = ranges[version]
+            row = self._find_range(columns, ip_int)
+            if row is not None:
+                return {
+                    'provider': provider,
+                    'service': columns['service'][row],
+                    'region': columns['region'][row],
+                    'detection_method': 'ip_range',
+                    'ip_confirmed': True
+                }
 
         return None
 
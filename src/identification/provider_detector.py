@@ -5,8 +5,9 @@ Combines IP range matching, CNAME patterns, and HTTP headers
 for accurate provider identification.
 """
 import re
+import sys
 import logging
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 
 from ..models.subdomain import Subdomain
@@ -33,6 +34,46 @@ class ProviderDetector:
         self.providers_config = providers_config
         self.ip_matcher = IPMatcher(config_dir)
         self.logger = logging.getLogger(__name__)
+        self._compiled_cname_patterns = self._compile_cname_patterns()
+
+        # One regex over every provider's patterns: a CNAME that matches no
+        # provider is rejected with a single scan instead of one per provider
+        self._any_cname_pattern = re.compile(
+            '|'.join(f'(?:{regex.pattern})' for _, _, regex in self._compiled_cname_patterns),
+            re.IGNORECASE
+        ) if self._compiled_cname_patterns else None
+
+    def _compile_cname_patterns(self) -> List[Tuple[str, str, re.Pattern]]:
+        """
+        Compile CNAME patterns from config once
+
+        All of a provider's patterns are joined into one alternation, so each
+        provider costs a single regex search per CNAME.
+
+        Returns:
+            List of (provider_key, provider_name, compiled pattern) in config order
+        """
+        compiled = []
+        providers = self.providers_config.get('providers', {})
+
+        for provider_key, provider_config in providers.items():
+            patterns = provider_config.get('patterns', {}).get('cname', [])
+
+            valid = []
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except re.error:
+                    self.logger.warning(f"Invalid regex pattern: {pattern}")
+                    continue
+                valid.append(pattern)
+
+            if valid:
+                combined = re.compile('|'.join(f'(?:{p})' for p in valid), re.IGNORECASE)
+                provider_name = sys.intern(provider_config.get('name', provider_key))
+                compiled.append((provider_key, provider_name, combined))
+
+        return compiled
 
     def detect_provider(self, subdomain: Subdomain) -> Optional[str]:
         """
@@ -81,21 +122,16 @@ class ProviderDetector:
         Returns:
             Dict with provider info if matched
         """
-        providers = self.providers_config.get('providers', {})
-
-        for provider_key, provider_config in providers.items():
-            patterns = provider_config.get('patterns', {}).get('cname', [])
-
-            for pattern in patterns:
-                try:
-                    if re.search(pattern, cname, re.IGNORECASE):
-                        return {
-                            'provider': provider_config.get('name', provider_key),
-                            'provider_key': provider_key
-                        }
-                except re.error:
-                    self.logger.warning(f"Invalid regex pattern: {pattern}")
-                    continue
+        if self._any_cname_pattern is None or not self._any_cname_pattern.search(cname):
+            return None
+
+        # Something matched; walk providers in config order so priority is kept
+        for provider_key, provider_name, regex in self._compiled_cname_patterns:
+            if regex.search(cname):
+                return {
+                    'provider': provider_name,
+                    'provider_key': provider_key
+                }
 
         return None
 
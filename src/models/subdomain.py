@@ -1,12 +1,27 @@
 """
 Subdomain data model
 """
-from dataclasses import dataclass, field, asdict
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _compile_ci(pattern: str) -> re.Pattern:
+    """Compile a case-insensitive provider pattern once"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Slotted instances drop the per-object __dict__ (a large share of each
+# Subdomain's footprint); dataclass(slots=True) needs Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Subdomain:
     """Subdomain data model"""
 
@@ -63,7 +78,9 @@ class Subdomain:
     verified_by: List[str] = field(default_factory=list)
 
     # Metadata
-    discovered_at: datetime = field(default_factory=datetime.now)
+    # Epoch nanoseconds; cheaper to create than a datetime for every
+    # enumerated subdomain. Use the discovered_at property for a datetime.
+    discovered_at_ns: int = field(default_factory=time.time_ns)
     source: Optional[str] = None
 
     def __post_init__(self):
@@ -74,29 +91,86 @@ class Subdomain:
         # Normalize subdomain
         self.subdomain = self.subdomain.lower().strip()
 
+    @property
+    def discovered_at(self) -> datetime:
+        """Discovery time as a local (naive) datetime"""
+        return datetime.fromtimestamp(self.discovered_at_ns / 1e9)
+
+    @discovered_at.setter
+    def discovered_at(self, value: datetime):
+        self.discovered_at_ns = round(value.timestamp() * 1e6) * 1000
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        data = asdict(self)
-        # Convert datetime to ISO format
-        data['discovered_at'] = self.discovered_at.isoformat()
-        return data
+        # Built field by field rather than with dataclasses.asdict, which
+        # deep-copies recursively; the lists only hold strings, so a shallow
+        # copy is enough
+        return {
+            'subdomain': self.subdomain,
+            'parent_domain': self.parent_domain,
+            'cname': self.cname,
+            'cname_chain': list(self.cname_chain),
+            'a_records': list(self.a_records),
+            'aaaa_records': list(self.aaaa_records),
+            'ns_records': list(self.ns_records),
+            'dns_resolved': self.dns_resolved,
+            'nxdomain': self.nxdomain,
+            'dns_ttl': self.dns_ttl,
+            'dns_response_code': self.dns_response_code,
+            'authoritative_ns': self.authoritative_ns,
+            'soa_record': self.soa_record,
+            'mx_records': list(self.mx_records),
+            'txt_records': list(self.txt_records),
+            'cname_chain_count': self.cname_chain_count,
+            'final_cname_target': self.final_cname_target,
+            'dangling_cname': self.dangling_cname,
+            'vulnerable_cname_hop': self.vulnerable_cname_hop,
+            'takeover_risk': self.takeover_risk,
+            'http_status': self.http_status,
+            'http_title': self.http_title,
+            'http_server': self.http_server,
+            'http_body_snippet': self.http_body_snippet,
+            'takeover_evidence': self.takeover_evidence,
+            'technologies': list(self.technologies),
+            'cdn': self.cdn,
+            'provider': self.provider,
+            'provider_pattern': self.provider_pattern,
+            'provider_detection_method': self.provider_detection_method,
+            'provider_service': self.provider_service,
+            'provider_region': self.provider_region,
+            'ip_confirmed': self.ip_confirmed,
+            'is_vulnerable': self.is_vulnerable,
+            'vulnerability_type': self.vulnerability_type,
+            'fingerprint_matched': self.fingerprint_matched,
+            'risk_level': self.risk_level,
+            'verified_by': list(self.verified_by),
+            'discovered_at': self.discovered_at.isoformat(),
+            'source': self.source
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Subdomain':
         """Create from dictionary"""
-        # Convert ISO format to datetime
-        if 'discovered_at' in data and isinstance(data['discovered_at'], str):
-            data['discovered_at'] = datetime.fromisoformat(data['discovered_at'])
-        return cls(**data)
+        data = dict(data)
+        discovered_at = data.pop('discovered_at', None)
+
+        subdomain = cls(**data)
+
+        if discovered_at is not None:
+            # Convert ISO format to datetime
+            if isinstance(discovered_at, str):
+                discovered_at = datetime.fromisoformat(discovered_at)
+            subdomain.discovered_at = discovered_at
+
+        return subdomain
 
     def matches_provider_pattern(self, pattern: str) -> bool:
         """Check if CNAME matches a provider pattern"""
         if not self.cname:
             return False
 
-        import re
         try:
-            return bool(re.search(pattern, self.cname, re.IGNORECASE))
+            return _compile_ci(pattern).search(self.cname) is not None
         except re.error:
             return False
 
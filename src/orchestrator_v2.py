@@ -15,10 +15,13 @@ Old (WRONG) workflow: subfinder → DNS → HTTP → Verify
 New (CORRECT) workflow: subfinder → DNS Validation → Wildcard Filter → HTTP → Provider ID → Verify
 """
 import logging
+import re
+import threading
 import time
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 
 from .models.subdomain import Subdomain
 from .pipeline.subdomain_enum_v2 import MultiToolEnumerator
@@ -33,6 +36,50 @@ from .config import Config
 from .utils.progress_tracker import ProgressTracker, SubdomainProgressTracker
 
 
+def _status_prefix(code: int) -> str:
+    """Live-table marker for an HTTP status code"""
+    if code < 300:
+        return "✓"  # 2xx Success
+    if code < 400:
+        return "→"  # 3xx Redirect
+    if code == 403:
+        return "⚠"  # 403 Forbidden (potential vuln)
+    if code == 404:
+        return "✗"  # 404 Not Found
+    if code < 500:
+        return "⚠"  # Other 4xx
+    return "✗"      # 5xx Server Error
+
+
+# Status code -> marker, precomputed so printing a row is a tuple index
+_STATUS_PREFIX = tuple(_status_prefix(code) for code in range(600))
+
+# One live-table row: status, subdomain, provider (max 10 chars), CNAME, info
+_LIVE_ROW_FORMAT = "  {:<8} {:<45} {:<12.10} {:<25} {}".format
+
+
+# --shopify-takeover-only: CNAME mentions Shopify (covers myshopify.com) and
+# the storefront answers 403/404
+_SHOPIFY_CNAME_SEARCH = re.compile(r'shopify', re.IGNORECASE).search
+_SHOPIFY_TAKEOVER_STATUSES = frozenset({403, 404})
+
+
+# Set on the threads running batch-scan domains (see _scan_domain_quietly)
+_batch_thread = threading.local()
+
+
+class _WarningsOnlyFilter(logging.Filter):
+    """Drop records below WARNING logged by batch-scan worker threads"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or not getattr(_batch_thread, 'quiet', False)
+
+
+def _truncate(value: str, width: int) -> str:
+    """Fit value into width characters, marking cut values with '..'"""
+    return value if len(value) <= width else value[:width - 2] + ".."
+
+
 class OrchestratorV2:
     """
     Redesigned orchestrator with correct 6-phase workflow
@@ -55,20 +102,27 @@ class OrchestratorV2:
 
         # Initialize pipeline stages
         # Use MultiToolEnumerator for maximum coverage
-        self.enumerator = MultiToolEnumerator()
+        self.enumerator = MultiToolEnumerator(
+            permutations=config.get('pipeline.enable_permutations', False),
+            max_permutations=config.get('pipeline.max_permutations', MultiToolEnumerator.MAX_PERMUTATIONS)
+        )
 
         # Get custom DNS resolvers from config (if specified)
-        dns_resolvers = config.config.get('tools', {}).get('dnsx', {}).get('resolvers', None)
+        dnsx_config = config.config.get('tools', {}).get('dnsx', {})
+        dns_resolvers = dnsx_config.get('resolvers', None)
         if dns_resolvers and len(dns_resolvers) > 0:
             self.logger.info(f"Using custom DNS resolvers: {', '.join(dns_resolvers)}")
 
+        # Optional on-disk DNS cache shared between runs (off unless configured)
         self.dns_validator = DNSValidator(
             dnsx_path=config.tool_paths['dnsx'],
-            resolvers=dns_resolvers if dns_resolvers else None
+            resolvers=dns_resolvers if dns_resolvers else None,
+            cache_file=config.get_path('tools.dnsx.cache_file')
         )
 
         self.wildcard_detector = WildcardDetector(
-            num_tests=5
+            num_tests=5,
+            cache_file=config.get_path('pipeline.wildcard_cache_file')
         )
 
         # Initialize CNAME blacklist filter
@@ -89,6 +143,17 @@ class OrchestratorV2:
 
         self.confidence_scorer = ConfidenceScorer()
 
+    def close(self):
+        """Release resources held by pipeline stages (on-disk caches)"""
+        self.dns_validator.close()
+        self.wildcard_detector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _is_subdomain(self, domain: str) -> bool:
         """
         Check if the input is already a subdomain (not a root domain)
@@ -141,38 +206,27 @@ class OrchestratorV2:
         if subdomain.is_vulnerable:
             status = "🔴 VULN"
         elif subdomain.http_status:
-            if subdomain.http_status < 300:
-                status = f"✓ {subdomain.http_status}"  # 2xx Success
-            elif subdomain.http_status < 400:
-                status = f"→ {subdomain.http_status}"  # 3xx Redirect
-            elif subdomain.http_status == 403:
-                status = f"⚠ {subdomain.http_status}"  # 403 Forbidden (potential vuln)
-            elif subdomain.http_status == 404:
-                status = f"✗ {subdomain.http_status}"  # 404 Not Found
-            elif subdomain.http_status < 500:
-                status = f"⚠ {subdomain.http_status}"  # Other 4xx
-            else:
-                status = f"✗ {subdomain.http_status}"  # 5xx Server Error
+            code = subdomain.http_status
+            prefix = _STATUS_PREFIX[code] if 0 <= code < len(_STATUS_PREFIX) else _status_prefix(code)
+            status = f"{prefix} {code}"
         else:
             status = "- DNS"  # DNS only, no HTTP check
 
-        # Truncate values for display
-        sub_display = subdomain.subdomain[:43] + ".." if len(subdomain.subdomain) > 45 else subdomain.subdomain
-        provider_display = subdomain.provider[:10] if subdomain.provider else "-"
-        cname_display = subdomain.cname[:23] + ".." if subdomain.cname and len(subdomain.cname) > 25 else (subdomain.cname or "-")
-
         # Build info string
-        info_parts = []
-        if subdomain.a_records:
-            info_parts.append(f"IP:{subdomain.a_records[0][:15]}")
-        if subdomain.ip_confirmed:
-            info_parts.append("✓CloudIP")
-        if subdomain.is_vulnerable:
-            info_parts.append("⚠️TAKEOVER")
-
-        info_display = " ".join(info_parts) if info_parts else "-"
-
-        print(f"  {status:<8} {sub_display:<45} {provider_display:<12} {cname_display:<25} {info_display}")
+        info_display = " ".join(filter(None, (
+            f"IP:{subdomain.a_records[0][:15]}" if subdomain.a_records else None,
+            "✓CloudIP" if subdomain.ip_confirmed else None,
+            "⚠️TAKEOVER" if subdomain.is_vulnerable else None,
+        ))) or "-"
+
+        # Format precision truncates the provider; the other columns keep a ".." marker
+        print(_LIVE_ROW_FORMAT(
+            status,
+            _truncate(subdomain.subdomain, 45),
+            subdomain.provider or "-",
+            _truncate(subdomain.cname, 25) if subdomain.cname else "-",
+            info_display
+        ))
 
     def scan_domain(self, domain: str, provider_filter: Optional[str] = None, quiet_mode: bool = False, mode: str = 'quick') -> Dict:
         """
@@ -351,26 +405,24 @@ class OrchestratorV2:
                 if not s.provider or s.provider.lower() == provider_filter.lower()
             ]
 
+        # Count by provider (and overall IP confirmation) in a single pass
+        providers = defaultdict(lambda: {'count': 0, 'ip_confirmed': 0})
+        ip_confirmed = 0
+        for subdomain in cloud_hosted:
+            stats = providers[subdomain.provider]
+            stats['count'] += 1
+            if subdomain.ip_confirmed:
+                stats['ip_confirmed'] += 1
+                ip_confirmed += 1
+
         results['phase_results']['provider_identification'] = {
             'cloud_hosted': len(cloud_hosted),
-            'ip_confirmed': sum(1 for s in cloud_hosted if s.ip_confirmed),
-            'cname_only': sum(1 for s in cloud_hosted if not s.ip_confirmed),
-            'providers': {},
+            'ip_confirmed': ip_confirmed,
+            'cname_only': len(cloud_hosted) - ip_confirmed,
+            'providers': dict(providers),
             'filtered_by': provider_filter if provider_filter else None
         }
 
-        # Count by provider
-        for subdomain in cloud_hosted:
-            provider = subdomain.provider
-            if provider not in results['phase_results']['provider_identification']['providers']:
-                results['phase_results']['provider_identification']['providers'][provider] = {
-                    'count': 0,
-                    'ip_confirmed': 0
-                }
-            results['phase_results']['provider_identification']['providers'][provider]['count'] += 1
-            if subdomain.ip_confirmed:
-                results['phase_results']['provider_identification']['providers'][provider]['ip_confirmed'] += 1
-
         self.logger.info(f"Identified {len(cloud_hosted)} cloud-hosted subdomains")
         for provider, stats in results['phase_results']['provider_identification']['providers'].items():
             self.logger.info(f"  {provider}: {stats['count']} (IP confirmed: {stats['ip_confirmed']})")
@@ -392,15 +444,10 @@ class OrchestratorV2:
         http_validated = self.http_validator.validate_batch(identified)
         results['phase_results']['http_validation'] = {
             'validated': len(http_validated),
-            'status_codes': {}
+            # Count status codes
+            'status_codes': dict(Counter(s.http_status or 'unknown' for s in http_validated))
         }
 
-        # Count status codes
-        for subdomain in http_validated:
-            status = subdomain.http_status or 'unknown'
-            results['phase_results']['http_validation']['status_codes'][status] = \
-                results['phase_results']['http_validation']['status_codes'].get(status, 0) + 1
-
         self.logger.info(f"HTTP validated {len(http_validated)} subdomains")
 
         phase5_elapsed = time.time() - phase5_start
@@ -429,9 +476,10 @@ class OrchestratorV2:
         if cloud_with_http:
             # ENHANCED: Deep CNAME verification for takeover detection
             self.logger.info("Performing deep CNAME verification...")
+            verifications = self.dns_validator.verify_cname_targets(cloud_with_http)
             for subdomain in cloud_with_http:
-                if subdomain.cname:
-                    verification = self.dns_validator.verify_cname_target(subdomain)
+                verification = verifications.get(subdomain.subdomain)
+                if verification:
                     # Store verification results
                     if verification['is_dangling']:
                         subdomain.dangling_cname = True
@@ -457,15 +505,10 @@ class OrchestratorV2:
             results['phase_results']['verification'] = {
                 'checked': len(cloud_with_http),
                 'vulnerable': len(vulnerable),
-                'by_risk': {}
+                # Count by risk level
+                'by_risk': dict(Counter(s.risk_level or 'unknown' for s in vulnerable))
             }
 
-            # Count by risk level
-            for subdomain in vulnerable:
-                risk = subdomain.risk_level or 'unknown'
-                results['phase_results']['verification']['by_risk'][risk] = \
-                    results['phase_results']['verification']['by_risk'].get(risk, 0) + 1
-
             self.logger.info(f"Found {len(vulnerable)} vulnerable subdomains")
             for risk, count in results['phase_results']['verification']['by_risk'].items():
                 self.logger.info(f"  {risk.upper()}: {count}")
@@ -480,10 +523,22 @@ class OrchestratorV2:
         }
         self.logger.info(f"Phase 6 completed in {int(phase6_elapsed // 60)}m {int(phase6_elapsed % 60)}s")
 
-        # Compile final results
-        results['all_subdomains'] = [s.to_dict() for s in http_validated]
-        results['cloud_hosted'] = [s.to_dict() for s in cloud_with_http]
-        results['vulnerable'] = [s.to_dict() for s in vulnerable]
+        # Compile final results. cloud_hosted and vulnerable are subsets of
+        # http_validated, so each Subdomain is serialized once and the subset
+        # lists share its dict. Enumeration hands back an unordered set, so
+        # every list is sorted by name to keep output reproducible across runs
+        by_name = lambda s: s.subdomain
+        all_subdomains = sorted(http_validated, key=by_name)
+        results['all_subdomains'] = [s.to_dict() for s in all_subdomains]
+        serialized = {id(s): d for s, d in zip(all_subdomains, results['all_subdomains'])}
+        results['cloud_hosted'] = [
+            serialized.get(id(s)) or s.to_dict()
+            for s in sorted(cloud_with_http, key=by_name)
+        ]
+        results['vulnerable'] = [
+            serialized.get(id(s)) or s.to_dict()
+            for s in sorted(vulnerable, key=by_name)
+        ]
 
         # Calculate total scan time
         total_elapsed = time.time() - results['timing']['scan_start']
@@ -520,6 +575,58 @@ class OrchestratorV2:
 
         return results
 
+    def _scan_domain_quietly(self, domain: str, provider_filter: Optional[str], mode: str) -> Dict:
+        """scan_domain for a batch worker, with this thread's INFO logs muted"""
+        _batch_thread.quiet = True
+        try:
+            return self.scan_domain(domain, provider_filter, quiet_mode=True, mode=mode)
+        finally:
+            _batch_thread.quiet = False
+
+    def _scan_as_completed(self, executor: ThreadPoolExecutor, domains: List[str], workers: int,
+                           provider_filter: Optional[str], mode: str) -> Iterator[Tuple[str, Future]]:
+        """
+        Submit domain scans with a bounded in-flight window, yielding them as they finish
+
+        Only a small multiple of `workers` scans are queued at a time, so a
+        list of tens of thousands of domains doesn't create a future (and
+        hold its result) for every domain up front. If the caller stops
+        iterating early, scans that haven't started yet are cancelled.
+
+        Args:
+            executor: Executor to run scan_domain on
+            domains: Domains to scan
+            workers: Number of concurrent workers
+            provider_filter: Passed through to scan_domain
+            mode: Passed through to scan_domain
+
+        Yields:
+            (domain, completed future) in completion order
+        """
+        max_in_flight = max(1, workers) * 2
+        pending = {}
+        domain_iter = iter(domains)
+
+        try:
+            while True:
+                for domain in domain_iter:
+                    future = executor.submit(self._scan_domain_quietly, domain, provider_filter, mode)
+                    pending[future] = domain
+                    if len(pending) >= max_in_flight:
+                        break
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future
+        finally:
+            # Consumer stopped early (e.g. Ctrl-C): drop queued scans so the
+            # executor only waits for the ones already running
+            for future in pending:
+                future.cancel()
+
     def scan_domains(self, domains: List[str], workers: int = 5, provider_filter: Optional[str] = None, mode: str = 'quick',
                     filter_status: Optional[List[int]] = None, require_cname: bool = False, require_cname_contains: Optional[str] = None,
                     shopify_takeover_only: bool = False) -> List[Dict]:
@@ -544,9 +651,10 @@ class OrchestratorV2:
 
         results = []
 
-        # Suppress verbose logging during batch scans
-        # Save original levels
-        original_levels = {}
+        # Suppress verbose logging from the batch workers with a filter
+        # rather than by changing (and later restoring) the loggers' levels,
+        # so other threads using these loggers keep their INFO output
+        quiet_filter = _WarningsOnlyFilter()
         loggers_to_quiet = [
             self.logger,
             self.enumerator.logger,
@@ -558,97 +666,92 @@ class OrchestratorV2:
         ]
 
         for logger in loggers_to_quiet:
-            original_levels[logger] = logger.level
-            logger.setLevel(logging.WARNING)
-
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = {executor.submit(self.scan_domain, domain, provider_filter, quiet_mode=True, mode=mode): domain for domain in domains}
-
-            for future in as_completed(futures):
-                domain = futures[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-
-                    # Update progress tracker - show each subdomain found (with filtering)
-                    if result.get('all_subdomains'):
-                        # Show each discovered subdomain (apply filters)
-                        for sub in result['all_subdomains']:
-                            # Apply filters
-                            if shopify_takeover_only:
-                                # Must have CNAME to myshopify.com AND 403/404 status
-                                cname = sub.get('cname', '')
+            logger.addFilter(quiet_filter)
+
+        # Wildcards like 4* expand to long lists; test membership against a set
+        status_filter = frozenset(filter_status) if filter_status else None
+
+        # Case-insensitive CNAME pattern check, compiled once per scan rather
+        # than lowercasing the pattern and every hop for each subdomain
+        cname_contains = None
+        if require_cname_contains:
+            cname_contains = re.compile(re.escape(require_cname_contains), re.IGNORECASE).search
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for domain, future in self._scan_as_completed(executor, domains, workers, provider_filter, mode):
+                    try:
+                        result = future.result()
+                        results.append(result)
+
+                        # Update progress tracker - show each subdomain found (with filtering)
+                        if result.get('all_subdomains'):
+                            # Show each discovered subdomain (apply filters)
+                            for sub in result['all_subdomains']:
+                                cname = sub.get('cname')
                                 status = sub.get('http_status')
-                                if not (cname and ('myshopify.com' in cname.lower() or 'shopify' in cname.lower())
-                                       and status in [403, 404]):
-                                    continue  # Skip this subdomain
-                            elif filter_status:
-                                # Filter by status codes
-                                if sub.get('http_status') not in filter_status:
-                                    continue
-
-                            if require_cname:
-                                # Must have CNAME record
-                                if not sub.get('cname'):
-                                    continue
-
-                            if require_cname_contains:
-                                # Check if ANY CNAME in the chain contains the pattern (case-insensitive)
-                                cname_chain = sub.get('cname_chain', [])
-                                pattern_lower = require_cname_contains.lower()
-
-                                # Check all CNAMEs in the chain
-                                found_pattern = False
-                                if cname_chain:
-                                    for cname_hop in cname_chain:
-                                        if pattern_lower in cname_hop.lower():
-                                            found_pattern = True
-                                            break
-
-                                # Also check the primary cname field as fallback
-                                if not found_pattern and sub.get('cname'):
-                                    if pattern_lower in sub.get('cname').lower():
-                                        found_pattern = True
-
-                                if not found_pattern:
-                                    continue  # Skip this subdomain - doesn't contain pattern
-
-                            # Passed all filters - show it with enhanced DNS info and body content
-                            tracker.update(
-                                subdomain=sub.get('subdomain', domain),
-                                provider=sub.get('provider'),
-                                cname=sub.get('cname'),
-                                http_status=sub.get('http_status'),
-                                fingerprint=sub.get('fingerprint'),
-                                vulnerable=sub.get('vulnerable', False),
-                                cname_chain=sub.get('cname_chain', []),
-                                cname_chain_count=sub.get('cname_chain_count', 0),
-                                dns_response_code=sub.get('dns_response_code'),
-                                a_records=sub.get('a_records', []),
-                                final_cname_target=sub.get('final_cname_target'),
-                                http_body_snippet=sub.get('http_body_snippet'),
-                                takeover_evidence=sub.get('takeover_evidence')
-                            )
-                    else:
-                        # No subdomains found - only show if no filters are active
-                        # (Don't clutter output when using specific filters like --shopify-takeover-only)
-                        if not (shopify_takeover_only or filter_status or require_cname or require_cname_contains):
-                            tracker.update(
-                                subdomain=domain,
-                                provider=None,
-                                cname=None,
-                                http_status=None,
-                                fingerprint="No subdomains",
-                                vulnerable=False
-                            )
-
-                except Exception as e:
-                    self.logger.error(f"Failed to scan {domain}: {str(e)}")
-                    tracker.update(subdomain=domain, status="✗")
-
-        # Restore original logging levels
-        for logger, level in original_levels.items():
-            logger.setLevel(level)
-
-        tracker.finish()
+
+                                # Apply filters
+                                if shopify_takeover_only:
+                                    # Must have CNAME to myshopify.com AND 403/404 status
+                                    if not (cname and status in _SHOPIFY_TAKEOVER_STATUSES
+                                            and _SHOPIFY_CNAME_SEARCH(cname)):
+                                        continue  # Skip this subdomain
+                                elif status_filter:
+                                    # Filter by status codes
+                                    if status not in status_filter:
+                                        continue
+
+                                if require_cname:
+                                    # Must have CNAME record
+                                    if not cname:
+                                        continue
+
+                                if cname_contains:
+                                    # Check if ANY CNAME in the chain contains the pattern,
+                                    # with the primary cname field as fallback
+                                    if not (any(cname_contains(hop) for hop in sub.get('cname_chain') or ())
+                                            or (cname and cname_contains(cname))):
+                                        continue  # Skip this subdomain - doesn't contain pattern
+
+                                # Passed all filters - show it with enhanced DNS info and body content
+                                tracker.update(
+                                    subdomain=sub.get('subdomain', domain),
+                                    provider=sub.get('provider'),
+                                    cname=cname,
+                                    http_status=status,
+                                    fingerprint=sub.get('fingerprint'),
+                                    vulnerable=sub.get('vulnerable', False),
+                                    cname_chain=sub.get('cname_chain', []),
+                                    cname_chain_count=sub.get('cname_chain_count', 0),
+                                    dns_response_code=sub.get('dns_response_code'),
+                                    a_records=sub.get('a_records', []),
+                                    final_cname_target=sub.get('final_cname_target'),
+                                    http_body_snippet=sub.get('http_body_snippet'),
+                                    takeover_evidence=sub.get('takeover_evidence')
+                                )
+                        else:
+                            # No subdomains found - only show if no filters are active
+                            # (Don't clutter output when using specific filters like --shopify-takeover-only)
+                            if not (shopify_takeover_only or filter_status or require_cname or require_cname_contains):
+                                tracker.update(
+                                    subdomain=domain,
+                                    provider=None,
+                                    cname=None,
+                                    http_status=None,
+                                    fingerprint="No subdomains",
+                                    vulnerable=False
+                                )
+
+                    except Exception as e:
+                        self.logger.error(f"Failed to scan {domain}: {str(e)}")
+                        tracker.update(subdomain=domain, status="✗")
+
+            tracker.finish()
+        finally:
+            for logger in loggers_to_quiet:
+                logger.removeFilter(quiet_filter)
+            # On Ctrl-C or an error, still write out the rows already queued
+            tracker.close()
+
         return results
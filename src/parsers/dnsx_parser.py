@@ -1,26 +1,32 @@
 """
 Parser for dnsx JSON output
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 from ..models.subdomain import Subdomain
 
 
 class DNSXParser:
     """Parser for dnsx JSON output"""
 
-    def parse(self, json_data: List[Dict[str, Any]], subdomains: List[Subdomain]) -> List[Subdomain]:
+    def parse(self, json_data: Iterable[Dict[str, Any]], subdomains: Optional[List[Subdomain]] = None,
+              subdomain_map: Optional[Dict[str, Subdomain]] = None) -> List[Subdomain]:
         """
         Parse dnsx JSON output and update subdomain objects
 
         Args:
-            json_data: List of JSON objects from dnsx
+            json_data: JSON objects from dnsx (any iterable, consumed once)
             subdomains: Existing subdomain objects to update
+            subdomain_map: Prebuilt {name: Subdomain} map to use instead of
+                          building one from subdomains (for callers that parse
+                          several batches against the same set)
 
         Returns:
-            Updated list of Subdomain objects
+            Updated list of Subdomain objects (every object in the map)
         """
         # Create lookup map
-        subdomain_map = {s.subdomain: s for s in subdomains}
+        built_map = subdomain_map is None
+        if built_map:
+            subdomain_map = {s.subdomain: s for s in subdomains}
 
         for entry in json_data:
             try:
@@ -57,4 +63,8 @@ class DNSXParser:
             except Exception:
                 continue
 
+        # Without duplicate names the map holds exactly the caller's objects
+        # in the caller's order, so hand back that list instead of a copy
+        if built_map and len(subdomain_map) == len(subdomains):
+            return subdomains
         return list(subdomain_map.values())
@@ -1,206 +1,400 @@
 """
 Parser for httpx JSON output
 """
-from typing import List, Dict, Any
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Optional
 from ..models.subdomain import Subdomain
 
+# Hostname part of an httpx URL: everything after the scheme up to the
+# first '/' or ':' (port)
+_HOST_RE = re.compile(r'://([^/:]+)')
+
+# Body snippet cleanup: HTML tags and whitespace runs
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Fallback snippet sources, in order of preference: <h1> text, then <title>
+_HEADING_RES = tuple(
+    re.compile(rf'<{tag}[^>]*>(.*?)</{tag}>', re.IGNORECASE | re.DOTALL)
+    for tag in ('h1', 'title')
+)
+
+# Shopify error messages _extract_error_message builds its snippet around,
+# as (lowercased message, snippet length)
+_SHOPIFY_MESSAGES = tuple(
+    (message.lower(), max_len) for message, max_len in (
+        ("Only one step left", 150),
+        ("This shop is currently unavailable", 150),
+        ("Sorry, this shop is currently unavailable", 150),
+        ("This store doesn't exist", 150),
+        ("No shop configured at this domain", 150),
+        ("This domain is not connected to a Shopify store", 150),
+    )
+)
+
+# Takeover evidence patterns for _detect_takeover_patterns, checked in this
+# order (all lowercase)
+
+# Definitive Shopify takeover indicators
+_DEFINITIVE_PATTERNS = (
+    ("only one step left", "DEFINITE TAKEOVER - Shopify unclaimed store page"),
+    ("this shop is currently unavailable", "HIGH PROBABILITY - Shop unavailable message"),
+    ("sorry, this shop is currently unavailable", "HIGH PROBABILITY - Shop unavailable message"),
+    ("no shop configured at this domain", "DEFINITE TAKEOVER - Domain not connected to any store"),
+    ("this domain is not connected to a shopify store", "DEFINITE TAKEOVER - Unclaimed domain"),
+)
+
+# Suspicious patterns (needs manual verification), only for 403/404 responses
+_SUSPICIOUS_PATTERNS = (
+    ("404", "SUSPICIOUS - 404 error (verify manually)"),
+    ("not found", "SUSPICIOUS - Not found message"),
+    ("doesn't exist", "SUSPICIOUS - Entity doesn't exist"),
+)
+_SUSPICIOUS_STATUSES = frozenset({403, 404})
+
+# Verification/setup page indicators (requires DNS/provider access)
+# These look like "Needs setup" pages but cannot be taken over without DNS access
+_VERIFICATION_PATTERNS = (
+    "checking dns records",
+    "add these new dns records",
+    "shopify_verification_",
+    "needs setup",
+    "domain verification",
+    "verify your domain",
+    "txt record",
+    "dns management",
+    "cloudflare dns",
+    "update dns",
+    "log in to cloudflare",
+    "add dns record",
+    "domain setup",
+)
+
+# False positive indicators (login pages, active sites)
+_FALSE_POSITIVE_PATTERNS = (
+    "login",
+    "password",
+    "sign in",
+    "log in",
+    "enter your email",
+    "username",
+    "forgot password",
+    "create account",
+    "register",
+)
+
+# Every tier above flattened in priority order as (status gate or None,
+# pattern, evidence); the first pattern found in the body decides
+_TAKEOVER_EVIDENCE_TABLE = (
+    tuple((None, pattern, evidence) for pattern, evidence in _DEFINITIVE_PATTERNS)
+    + tuple((_SUSPICIOUS_STATUSES, pattern, evidence) for pattern, evidence in _SUSPICIOUS_PATTERNS)
+    + tuple((None, pattern, "FALSE POSITIVE - Verification page (requires DNS/Cloudflare access)")
+            for pattern in _VERIFICATION_PATTERNS)
+    + tuple((None, pattern, "FALSE POSITIVE - Active site with login/signup")
+            for pattern in _FALSE_POSITIVE_PATTERNS)
+)
+
+# 2xx responses can't match the status-gated rows, so they skip them
+_LIVE_SITE_EVIDENCE_TABLE = tuple(row for row in _TAKEOVER_EVIDENCE_TABLE if row[0] is None)
+
 
 class HTTPXParser:
     """Parser for httpx JSON output"""
 
-    def parse(self, json_data: List[Dict[str, Any]], subdomains: List[Subdomain]) -> List[Subdomain]:
+    # Entries per task handed to a worker process by parse_parallel
+    PARALLEL_CHUNK_SIZE = 64
+
+    def parse(self, json_data: Iterable[Dict[str, Any]], subdomains: Optional[List[Subdomain]] = None,
+              subdomain_map: Optional[Dict[str, Subdomain]] = None) -> List[Subdomain]:
         """
         Parse httpx JSON output and update subdomain objects
 
         Args:
-            json_data: List of JSON objects from httpx
+            json_data: JSON objects from httpx (any iterable, consumed once)
             subdomains: Existing subdomain objects to update
+            subdomain_map: Prebuilt {name: Subdomain} map to use instead of
+                          building one from subdomains (for callers that parse
+                          several batches against the same set)
 
         Returns:
-            Updated list of Subdomain objects
+            Updated list of Subdomain objects (every object in the map)
         """
         # Create lookup map
-        subdomain_map = {s.subdomain: s for s in subdomains}
+        built_map = subdomain_map is None
+        if built_map:
+            subdomain_map = {s.subdomain: s for s in subdomains}
 
         for entry in json_data:
             try:
-                # Extract host from URL
-                url = entry.get('url', '')
-                host = entry.get('host', '')
-
-                # Try to match subdomain
-                if host not in subdomain_map:
-                    # Try extracting from URL
-                    if '://' in url:
-                        host = url.split('://')[1].split('/')[0].split(':')[0]
-
-                if host not in subdomain_map:
+                host = self._match_host(entry.get('host', ''), entry.get('url', ''), subdomain_map)
+                if host is None:
                     continue
 
-                subdomain = subdomain_map[host]
+                self._apply_fields(subdomain_map[host], self._entry_fields(entry))
 
-                # Extract HTTP info
-                subdomain.http_status = entry.get('status_code')
-                subdomain.http_title = entry.get('title')
-                subdomain.http_server = entry.get('webserver')
+            except Exception:
+                continue
 
-                # Extract and analyze response body for takeover indicators
-                body = entry.get('body', '')
-                if body:
-                    subdomain.http_body_snippet = self._extract_error_message(body)
-                    subdomain.takeover_evidence = self._detect_takeover_patterns(body, subdomain.http_status)
+        # Without duplicate names the map holds exactly the caller's objects
+        # in the caller's order, so hand back that list instead of a copy
+        if built_map and len(subdomain_map) == len(subdomains):
+            return subdomains
+        return list(subdomain_map.values())
 
-                # Extract CDN info
-                if entry.get('cdn'):
-                    subdomain.cdn = entry.get('cdn_name', 'Unknown CDN')
+    def parse_parallel(self, json_data: Iterable[Dict[str, Any]], subdomains: Optional[List[Subdomain]] = None,
+                       subdomain_map: Optional[Dict[str, Subdomain]] = None,
+                       executor: Optional[ProcessPoolExecutor] = None) -> List[Subdomain]:
+        """
+        Like parse, but run the per-entry body analysis in worker processes
 
-                # Extract technologies
-                if 'tech' in entry:
-                    tech = entry['tech']
-                    if isinstance(tech, list):
-                        subdomain.technologies = tech
-                    elif isinstance(tech, str):
-                        subdomain.technologies = [tech]
+        Entries are shipped to the workers in chunks and only the extracted
+        fields come back, which are applied to the Subdomain objects here in
+        input order. Worth it when responses carry large bodies; for small
+        ones the pickling outweighs the analysis.
 
-            except Exception:
-                continue
+        Args:
+            json_data: JSON objects from httpx (any iterable, consumed once)
+            subdomains: Existing subdomain objects to update
+            subdomain_map: Prebuilt {name: Subdomain} map (see parse)
+            executor: Process pool to use (e.g. shared between concurrent
+                      callers); a temporary one is created if omitted
 
+        Returns:
+            Updated list of Subdomain objects (every object in the map)
+        """
+        built_map = subdomain_map is None
+        if built_map:
+            subdomain_map = {s.subdomain: s for s in subdomains}
+
+        own_executor = executor is None
+        if own_executor:
+            # Spawned rather than forked, so workers can't inherit pipes that
+            # other threads have open to running tools
+            executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+
+        try:
+            # Keep a bounded number of chunks in flight so the input is
+            # still consumed as a stream; results are applied oldest first
+            max_pending = 2 * (os.cpu_count() or 1)
+            pending = deque()
+            entries = iter(json_data)
+            while True:
+                chunk = list(islice(entries, self.PARALLEL_CHUNK_SIZE))
+                if chunk:
+                    pending.append(executor.submit(_parse_chunk, chunk))
+                while pending and (len(pending) >= max_pending or not chunk):
+                    for host, url, fields in pending.popleft().result():
+                        try:
+                            host = self._match_host(host, url, subdomain_map)
+                        except Exception:
+                            continue
+                        if host is not None:
+                            self._apply_fields(subdomain_map[host], fields)
+                if not chunk:
+                    break
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        if built_map and len(subdomain_map) == len(subdomains):
+            return subdomains
         return list(subdomain_map.values())
 
-    def _extract_error_message(self, body: str) -> str:
+    @staticmethod
+    def _match_host(host: str, url: str, subdomain_map: Dict[str, Subdomain]) -> Optional[str]:
         """
-        Extract relevant error message snippet from HTML body
+        Name in subdomain_map an httpx entry refers to
 
         Args:
-            body: Full HTML response body
+            host: Entry's host field
+            url: Entry's url field, used when host doesn't match
+            subdomain_map: {name: Subdomain} lookup
 
         Returns:
-            Extracted error message (max 200 chars)
+            Matching name, or None if the entry matches no subdomain
+        """
+        if host in subdomain_map:
+            return host
+
+        # Try extracting from URL
+        match = _HOST_RE.search(url)
+        if match and match.group(1) in subdomain_map:
+            return match.group(1)
+        return None
+
+    def _entry_fields(self, entry: Dict[str, Any]) -> tuple:
+        """
+        Extract the Subdomain fields one httpx entry provides
+
+        Args:
+            entry: httpx JSON object
+
+        Returns:
+            (status, title, server, (body snippet, takeover evidence) or None,
+            CDN name or None, technologies or None); None parts leave the
+            Subdomain's current value alone
         """
-        # Common Shopify error patterns to extract
-        shopify_patterns = [
-            # Shopify-specific messages
-            ("Only one step left", 150),
-            ("This shop is currently unavailable", 150),
-            ("Sorry, this shop is currently unavailable", 150),
-            ("This store doesn't exist", 150),
-            ("No shop configured at this domain", 150),
-            ("This domain is not connected to a Shopify store", 150),
+        status_code = entry.get('status_code')
+        body_fields = None
+
+        # Extract and analyze response body for takeover indicators
+        body = entry.get('body', '')
+        if body:
+            # Lowercased once and shared by both body checks
+            body_lower = body.lower()
+            table = (
+                _LIVE_SITE_EVIDENCE_TABLE if status_code and 200 <= status_code < 300
+                else _TAKEOVER_EVIDENCE_TABLE
+            )
+            body_fields = (
+                self._extract_error_message(body, body_lower),
+                self._detect_takeover_patterns(body_lower, status_code, table)
+            )
+
+        # Extract CDN info
+        cdn = entry.get('cdn_name', 'Unknown CDN') if entry.get('cdn') else None
+
+        # Extract technologies
+        technologies = None
+        if 'tech' in entry:
+            tech = entry['tech']
+            if isinstance(tech, list):
+                technologies = tech
+            elif isinstance(tech, str):
+                technologies = [tech]
+
+        return status_code, entry.get('title'), entry.get('webserver'), body_fields, cdn, technologies
+
+    @staticmethod
+    def _apply_fields(subdomain: Subdomain, fields: tuple):
+        """
+        Apply fields from _entry_fields to a Subdomain
 
-            # Generic error indicators
-            ("<h1>", 200),  # Often contains error title
-            ("<title>", 100),  # Page title
-        ]
+        Args:
+            subdomain: Subdomain to update
+            fields: Tuple returned by _entry_fields
+        """
+        status_code, title, server, body_fields, cdn, technologies = fields
 
-        body_lower = body.lower()
+        subdomain.http_status, subdomain.http_title, subdomain.http_server = status_code, title, server
+        if body_fields is not None:
+            subdomain.http_body_snippet, subdomain.takeover_evidence = body_fields
+        if cdn is not None:
+            subdomain.cdn = cdn
+        if technologies is not None:
+            subdomain.technologies = technologies
 
+    def _extract_error_message(self, body: str, body_lower: str) -> str:
+        """
+        Extract relevant error message snippet from HTML body
+
+        Args:
+            body: Full HTML response body
+            body_lower: body.lower()
+
+        Returns:
+            Extracted error message (max 200 chars)
+        """
         # Try to find Shopify-specific messages first
-        for pattern, max_len in shopify_patterns[:6]:  # Shopify messages
-            pattern_lower = pattern.lower()
-            if pattern_lower in body_lower:
-                # Find the pattern and extract surrounding context
-                idx = body_lower.index(pattern_lower)
+        for pattern_lower, max_len in _SHOPIFY_MESSAGES:
+            # Find the pattern and extract surrounding context
+            idx = body_lower.find(pattern_lower)
+            if idx != -1:
                 # Extract from pattern start to +max_len chars
                 snippet = body[idx:idx+max_len].strip()
                 # Clean HTML tags
                 snippet = snippet.replace('<', ' <').replace('>', '> ')
-                import re
-                snippet = re.sub(r'<[^>]+>', '', snippet)  # Remove HTML tags
-                snippet = re.sub(r'\s+', ' ', snippet)  # Normalize whitespace
+                snippet = _TAG_RE.sub('', snippet)  # Remove HTML tags
+                snippet = _WS_RE.sub(' ', snippet)  # Normalize whitespace
                 return snippet[:200].strip()
 
         # Fallback: try to extract h1 or title
-        import re
-        for tag in ['h1', 'title']:
-            match = re.search(rf'<{tag}[^>]*>(.*?)</{tag}>', body, re.IGNORECASE | re.DOTALL)
+        for heading_re in _HEADING_RES:
+            match = heading_re.search(body)
             if match:
                 text = match.group(1).strip()
-                text = re.sub(r'<[^>]+>', '', text)  # Remove inner HTML tags
-                text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+                text = _TAG_RE.sub('', text)  # Remove inner HTML tags
+                text = _WS_RE.sub(' ', text)  # Normalize whitespace
                 if text:
                     return text[:200].strip()
 
         # Last resort: return first 200 chars of body (cleaned)
-        cleaned = re.sub(r'<[^>]+>', '', body)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        return cleaned[:200] if cleaned else "[No error message found]"
+        cleaned = self._clean_body_prefix(body, 200)
+        return cleaned if cleaned else "[No error message found]"
 
-    def _detect_takeover_patterns(self, body: str, status_code: int) -> str:
+    @staticmethod
+    def _clean_body_prefix(body: str, max_len: int) -> str:
+        """
+        First max_len chars of body with tags removed and whitespace normalized
+
+        Equivalent to cleaning the whole body and slicing, but only cleans
+        as much of the body as it needs: a prefix cut right after a '>' can't
+        split a tag, so its cleaned text is a prefix of the full cleaned text.
+        The window grows until it yields a non-space char past max_len.
+
+        Args:
+            body: HTML response body
+            max_len: Number of characters wanted
+
+        Returns:
+            Cleaned, stripped text (at most max_len chars)
+        """
+        window = 4096
+        while window < len(body):
+            cut = body.rfind('>', 0, window) + 1
+            if cut:
+                cleaned = _WS_RE.sub(' ', _TAG_RE.sub('', body[:cut])).lstrip()
+                if cleaned[max_len:].strip():
+                    return cleaned[:max_len]
+            window *= 4
+
+        cleaned = _WS_RE.sub(' ', _TAG_RE.sub('', body)).strip()
+        return cleaned[:max_len]
+
+    def _detect_takeover_patterns(self, body_lower: str, status_code: int,
+                                  table: tuple = _TAKEOVER_EVIDENCE_TABLE) -> str:
         """
         Detect specific takeover vulnerability patterns in response body
 
         Args:
-            body: HTTP response body
+            body_lower: Lowercased HTTP response body
             status_code: HTTP status code
+            table: (status gate, pattern, evidence) rows to check, in order
 
         Returns:
             Evidence description if takeover pattern detected, empty string otherwise
         """
-        body_lower = body.lower()
-
-        # Definitive Shopify takeover indicators
-        definitive_patterns = {
-            "only one step left": "DEFINITE TAKEOVER - Shopify unclaimed store page",
-            "this shop is currently unavailable": "HIGH PROBABILITY - Shop unavailable message",
-            "sorry, this shop is currently unavailable": "HIGH PROBABILITY - Shop unavailable message",
-            "no shop configured at this domain": "DEFINITE TAKEOVER - Domain not connected to any store",
-            "this domain is not connected to a shopify store": "DEFINITE TAKEOVER - Unclaimed domain",
-        }
-
-        for pattern, evidence in definitive_patterns.items():
+        for status_gate, pattern, evidence in table:
+            # Suspicious patterns only count for 403/404 responses
+            if status_gate is not None and status_code not in status_gate:
+                continue
             if pattern in body_lower:
                 return evidence
 
-        # Suspicious patterns (needs manual verification)
-        suspicious_patterns = {
-            "404": "SUSPICIOUS - 404 error (verify manually)",
-            "not found": "SUSPICIOUS - Not found message",
-            "doesn't exist": "SUSPICIOUS - Entity doesn't exist",
-        }
-
-        # Only flag suspicious if status is 404/403
-        if status_code in [403, 404]:
-            for pattern, evidence in suspicious_patterns.items():
-                if pattern in body_lower:
-                    return evidence
-
-        # Verification/setup page indicators (requires DNS/provider access)
-        # These look like "Needs setup" pages but cannot be taken over without DNS access
-        verification_patterns = [
-            "checking dns records",
-            "add these new dns records",
-            "shopify_verification_",
-            "needs setup",
-            "domain verification",
-            "verify your domain",
-            "txt record",
-            "dns management",
-            "cloudflare dns",
-            "update dns",
-            "log in to cloudflare",
-            "add dns record",
-            "domain setup",
-        ]
-
-        for verify_pattern in verification_patterns:
-            if verify_pattern in body_lower:
-                return "FALSE POSITIVE - Verification page (requires DNS/Cloudflare access)"
-
-        # False positive indicators (login pages, active sites)
-        false_positive_patterns = [
-            "login",
-            "password",
-            "sign in",
-            "log in",
-            "enter your email",
-            "username",
-            "forgot password",
-            "create account",
-            "register",
-        ]
-
-        for fp_pattern in false_positive_patterns:
-            if fp_pattern in body_lower:
-                return "FALSE POSITIVE - Active site with login/signup"
-
         return ""  # No clear evidence
+
+
+def _parse_chunk(entries: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    Worker-process side of HTTPXParser.parse_parallel
+
+    Args:
+        entries: httpx JSON objects
+
+    Returns:
+        (host, url, fields) per entry that could be analyzed, with fields as
+        returned by HTTPXParser._entry_fields
+    """
+    parser = HTTPXParser()
+    results = []
+    for entry in entries:
+        try:
+            results.append((entry.get('host', ''), entry.get('url', ''), parser._entry_fields(entry)))
+        except Exception:
+            continue
+    return results
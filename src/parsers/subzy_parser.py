@@ -1,26 +1,31 @@
 """
 Parser for subzy JSON output
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..models.subdomain import Subdomain
 
 
 class SubzyParser:
     """Parser for subzy JSON output"""
 
-    def parse(self, json_data: List[Dict[str, Any]], subdomains: List[Subdomain]) -> List[Subdomain]:
+    def parse(self, json_data: List[Dict[str, Any]], subdomains: Optional[List[Subdomain]] = None,
+              subdomain_map: Optional[Dict[str, Subdomain]] = None) -> List[Subdomain]:
         """
         Parse subzy JSON output and update subdomain objects
 
         Args:
             json_data: List of JSON objects from subzy
             subdomains: Existing subdomain objects to update
+            subdomain_map: Prebuilt {name: Subdomain} map to use instead of
+                          building one from subdomains
 
         Returns:
             Updated list of Subdomain objects with vulnerability info
         """
         # Create lookup map
-        subdomain_map = {s.subdomain: s for s in subdomains}
+        built_map = subdomain_map is None
+        if built_map:
+            subdomain_map = {s.subdomain: s for s in subdomains}
 
         for entry in json_data:
             try:
@@ -44,4 +49,8 @@ class SubzyParser:
             except Exception:
                 continue
 
+        # Without duplicate names the map holds exactly the caller's objects
+        # in the caller's order, so hand back that list instead of a copy
+        if built_map and len(subdomain_map) == len(subdomains):
+            return subdomains
         return list(subdomain_map.values())
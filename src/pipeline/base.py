@@ -2,13 +2,22 @@
 Base class for pipeline stages
 """
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import List, Any, Dict, Iterable, Iterator, Union
 from pathlib import Path
+import io
 import subprocess
+import threading
 import json
 
 from ..utils.logger import get_logger
 
+# orjson decodes tool output lines several times faster than the stdlib;
+# its JSONDecodeError subclasses json.JSONDecodeError so handlers still match
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class PipelineStage(ABC):
     """Abstract base class for pipeline stages"""
@@ -77,27 +86,150 @@ class PipelineStage(ABC):
             self.logger.error(f"Command execution failed: {str(e)}")
             raise
 
-    def parse_json_lines(self, output: str) -> List[dict]:
+    def run_command_streaming(self,
+                              args: List[str],
+                              input_data: str = None,
+                              timeout: int = 300) -> Iterator[bytes]:
         """
-        Parse JSON Lines (JSONL) output
+        Run a command with the tool binary, yielding stdout lines as they arrive
+
+        Unlike run_command, the tool's output is never held in memory as a
+        whole. stdin is fed and stderr drained from helper threads so
+        neither pipe can stall the tool while stdout is being consumed.
+        Lines are raw bytes: the JSON decoder accepts them directly, so
+        there is no point paying for a UTF-8 decode of every line first.
 
         Args:
-            output: JSONL string
+            args: Command arguments
+            input_data: Optional stdin input
+            timeout: Command timeout in seconds (the tool is killed after it)
 
-        Returns:
-            List of parsed JSON objects
+        Yields:
+            stdout lines (bytes)
+
+        Raises:
+            subprocess.TimeoutExpired: If the tool was killed for running too long
+        """
+        cmd = [str(self.binary_path)] + args
+
+        self.logger.debug(f"Executing: {' '.join(cmd)}")
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except Exception as e:
+            self.logger.error(f"Command execution failed: {str(e)}")
+            raise
+
+        stderr_chunks = []
+        helpers = [threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)]
+        if input_data is not None:
+            helpers.append(threading.Thread(target=self._feed_stdin, args=(process, input_data.encode('utf-8')),
+                                            daemon=True))
+        for helper in helpers:
+            helper.start()
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+
+        try:
+            yield from process.stdout
+            process.wait()
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                # Consumer stopped early; don't leave the tool running
+                process.kill()
+                process.wait()
+            for helper in helpers:
+                helper.join()
+            process.stdout.close()
+            process.stderr.close()
+
+        if timed_out.is_set():
+            self.logger.error(f"Command timed out after {timeout}s")
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        if process.returncode != 0:
+            self.logger.warning(
+                f"Command returned non-zero exit code: {process.returncode}"
+            )
+            if stderr_chunks and stderr_chunks[0]:
+                self.logger.debug(f"stderr: {stderr_chunks[0].decode('utf-8', 'replace')}")
+
+    @staticmethod
+    def _feed_stdin(process: subprocess.Popen, input_data: bytes):
+        """Write input_data to a process's stdin and close it"""
+        try:
+            process.stdin.write(input_data)
+            process.stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            # Tool exited (or was killed) before reading all of its input
+            pass
+
+    def iter_json_lines(self, output: Union[str, Iterable[Union[str, bytes]]]) -> Iterator[Dict]:
         """
-        results = []
+        Lazily parse JSON Lines (JSONL) output one object at a time
+
+        Args:
+            output: JSONL string, or an iterable of str/bytes lines (e.g.
+                    from run_command_streaming)
 
-        for line in output.strip().split('\n'):
+        Yields:
+            Parsed JSON objects
+        """
+        lines = io.StringIO(output) if isinstance(output, str) else output
+        # Failures are counted and reported once, since a tool printing
+        # plain-text noise on stdout can produce thousands of bad lines
+        bad_lines = 0
+        first_error = None
+        for line in lines:
             if not line.strip():
                 continue
 
             try:
-                obj = json.loads(line)
-                results.append(obj)
-            except json.JSONDecodeError as e:
-                self.logger.warning(f"Failed to parse JSON line: {e}")
+                yield _json_loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                # (stdlib json raises UnicodeDecodeError for bad bytes input)
+                bad_lines += 1
+                if first_error is None:
+                    first_error = e
                 continue
 
-        return results
+        if bad_lines:
+            self.logger.warning(f"Failed to parse {bad_lines} JSON lines; first error: {first_error}")
+
+    def parse_json_lines(self, output: str) -> List[dict]:
+        """
+        Parse JSON Lines (JSONL) output
+
+        Args:
+            output: JSONL string
+
+        Returns:
+            List of parsed JSON objects
+        """
+        lines = [line for line in output.splitlines() if line.strip()]
+        if not lines:
+            return []
+
+        # Well-formed output (the usual case) decodes as one JSON array in a
+        # single call; only malformed output pays for per-line decoding
+        try:
+            results = _json_loads('[' + ','.join(lines) + ']')
+            if len(results) == len(lines):
+                return results
+        except json.JSONDecodeError:
+            pass
+
+        return list(self.iter_json_lines(output))
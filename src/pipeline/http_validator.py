@@ -1,9 +1,11 @@
 """
 HTTP validation using httpx
 """
-from typing import List
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
 from pathlib import Path
-import tempfile
 
 from .base import PipelineStage
 from ..models.subdomain import Subdomain
@@ -13,6 +15,10 @@ from ..parsers.httpx_parser import HTTPXParser
 class HTTPValidator(PipelineStage):
     """HTTP validation pipeline stage"""
 
+    # Batches are split across one httpx process per SHARD_SIZE hosts, up to
+    # the CPU count, so large batches aren't bound to a single process
+    SHARD_SIZE = 1000
+
     def __init__(self, binary_path: Path, threads: int = 100, timeout: int = 10):
         """
         Initialize HTTP validator
@@ -42,50 +48,80 @@ class HTTPValidator(PipelineStage):
 
         self.logger.info(f"Validating HTTP for {len(subdomains)} subdomains")
 
-        # Create temporary file with subdomain list
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-            for subdomain in subdomains:
-                f.write(f"{subdomain.subdomain}\n")
-            temp_file = f.name
-
         try:
-            # Build httpx command with body extraction for takeover detection
-            args = [
-                '-l', temp_file,
-                '-json',            # JSON output
-                '-status-code',     # Include status codes
-                '-tech-detect',     # Detect technologies
-                '-cdn',             # Detect CDN
-                '-title',           # Get page title
-                '-server',          # Get server header
-                '-body',            # Extract response body (for error message detection)
-                '-follow-redirects',
-                '-silent',
-                '-t', str(self.threads),
-                '-timeout', str(self.timeout)
-            ]
-
-            result = self.run_command(args, timeout=600)
-
-            if result.stdout:
-                # Parse JSON output
-                json_data = self.parse_json_lines(result.stdout)
-                subdomains = self.parser.parse(json_data, subdomains)
-
-                validated_count = sum(1 for s in subdomains if s.http_status)
-                self.logger.info(f"Validated HTTP for {validated_count} subdomains")
+            # Disjoint shards of the unique hosts, so every Subdomain object is
+            # only ever updated by one worker thread
+            subdomain_map = {subdomain.subdomain: subdomain for subdomain in subdomains}
+            unique = list(subdomain_map.values())
+            shard_count = max(1, min(os.cpu_count() or 1, len(unique) // self.SHARD_SIZE))
+
+            if shard_count == 1:
+                self._run_httpx(unique, subdomain_map, self.threads)
+            else:
+                # The shards split the thread budget, so total outbound
+                # concurrency stays at self.threads however many run
+                shard_threads = max(1, self.threads // shard_count)
+                self.logger.debug(f"Running {shard_count} httpx processes concurrently ({shard_threads} threads each)")
+                shards = [unique[i::shard_count] for i in range(shard_count)]
+                # Body analysis is CPU-bound, so the shards share one process
+                # pool for parsing rather than contending for the GIL. Workers
+                # are spawned, not forked: a fork taken while another shard's
+                # httpx pipes are open would inherit them and hold them open
+                with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as parse_executor, \
+                        ThreadPoolExecutor(max_workers=shard_count) as executor:
+                    for _ in executor.map(
+                        lambda shard: self._run_httpx(shard, subdomain_map, shard_threads, parse_executor), shards
+                    ):
+                        pass
+
+            if len(unique) != len(subdomains):
+                subdomains = unique
+
+            validated_count = sum(1 for s in subdomains if s.http_status)
+            self.logger.info(f"Validated HTTP for {validated_count} subdomains")
 
             return subdomains
 
         except Exception as e:
             self.logger.error(f"Error validating HTTP: {str(e)}")
             return subdomains
-        finally:
-            # Clean up temp file
-            try:
-                Path(temp_file).unlink()
-            except:
-                pass
+
+    def _run_httpx(self, hosts: List[Subdomain], subdomain_map: Dict[str, Subdomain], threads: int,
+                   parse_executor: Optional[ProcessPoolExecutor] = None):
+        """
+        Run one httpx process over hosts and apply its results
+
+        Args:
+            hosts: Subdomain objects to probe
+            subdomain_map: Hostname -> Subdomain lookup the results are applied to
+            threads: httpx thread count (-t) for this process
+            parse_executor: Process pool to parse the output in, if any
+        """
+        # Build httpx command with body extraction for takeover detection
+        # (hosts are fed on stdin, so no temp file is needed)
+        args = [
+            '-json',            # JSON output
+            '-status-code',     # Include status codes
+            '-tech-detect',     # Detect technologies
+            '-cdn',             # Detect CDN
+            '-title',           # Get page title
+            '-server',          # Get server header
+            '-body',            # Extract response body (for error message detection)
+            '-follow-redirects',
+            '-silent',
+            '-t', str(threads),
+            '-timeout', str(self.timeout)
+        ]
+
+        host_list = ''.join(f"{subdomain.subdomain}\n" for subdomain in hosts)
+
+        # Parse httpx output line by line straight off its stdout pipe
+        output_lines = self.run_command_streaming(args, input_data=host_list, timeout=600)
+        json_data = self.iter_json_lines(output_lines)
+        if parse_executor is None:
+            self.parser.parse(json_data, subdomain_map=subdomain_map)
+        else:
+            self.parser.parse_parallel(json_data, subdomain_map=subdomain_map, executor=parse_executor)
 
     def execute(self, subdomains: List[Subdomain]) -> List[Subdomain]:
         """
@@ -3,12 +3,17 @@ Multi-tool subdomain enumeration for maximum coverage (98-99%)
 
 This enumerator orchestrates multiple tools in parallel and sequential modes:
 - Passive: subfinder + amass + findomain (90-95% coverage, 2-3 min)
-- Full: + puredns + bbot + alterx (98-99% coverage, 30 min)
+- Full: + puredns + bbot (98-99% coverage, 30 min), plus alterx-style
+  permutations when enabled
 """
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Optional, Tuple
+from itertools import islice
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor
+import codecs
+import selectors
 import subprocess
+import time
 import os
 import logging
 
@@ -16,43 +21,144 @@ from ..models.subdomain import Subdomain
 from ..utils.logger import get_logger
 
 
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+_GO_BIN = Path.home() / "go" / "bin"
+
+# Enumeration tools as {name: (environment variable overriding the path,
+# default path)}
+_DEFAULT_TOOL_PATHS = {
+    'subfinder': ('SUBFINDER_PATH', _PROJECT_ROOT / 'bin' / 'subfinder'),
+    'amass': ('AMASS_PATH', _GO_BIN / 'amass'),
+    'findomain': ('FINDOMAIN_PATH', _GO_BIN / 'findomain'),
+    'puredns': ('PUREDNS_PATH', _GO_BIN / 'puredns'),
+}
+
+# Passive tools as {name: (arguments after the binary, with '{domain}' as the
+# target placeholder, timeout in seconds)}
+_PASSIVE_TOOL_SPECS = {
+    'subfinder': (('-d', '{domain}', '-all', '-silent'), 300),
+    # Increased from 60s to 180s for larger domains
+    'findomain': (('-t', '{domain}', '-q'), 180),
+    # Internal timeout of 2 minutes (reduced from 5), 3 minute external
+    # timeout (reduced from 6.5)
+    'amass': (('enum', '-passive', '-d', '{domain}', '-timeout', '2'), 180),
+}
+
+_WORDLIST_PATH = _PROJECT_ROOT / 'data' / 'wordlists' / 'best-dns-wordlist.txt'
+_RESOLVERS_PATH = _PROJECT_ROOT / 'data' / 'resolvers' / 'resolvers.txt'
+
+# Words combined with known subdomains to generate permutations (see
+# MultiToolEnumerator._run_alterx); 100+ patterns optimized for Shopify
+# subdomain takeover detection
+_PERMUTATION_WORDS = (
+    # Development & Staging
+    'dev', 'staging', 'stage', 'prod', 'production', 'uat', 'qa', 'test', 'testing',
+    'demo', 'sandbox', 'lab', 'labs', 'preview', 'temp', 'tmp', 'dev2', 'staging2',
+
+    # API & Services
+    'api', 'api-v1', 'api-v2', 'api-v3', 'rest', 'graphql', 'ws', 'websocket', 'grpc',
+    'service', 'services', 'microservice', 'backend', 'gateway', 'api-gateway',
+
+    # Admin & Management
+    'admin', 'administrator', 'management', 'console', 'dashboard', 'panel',
+    'control', 'manager', 'portal', 'cpanel', 'admin-panel',
+
+    # E-commerce (Shopify-specific)
+    'shop', 'store', 'checkout', 'cart', 'payment', 'payments', 'billing',
+    'order', 'orders', 'merchant', 'pos', 'retail', 'ecommerce', 'catalog',
+    'products', 'inventory', 'fulfillment', 'shipping', 'returns',
+
+    # Content & Media
+    'cdn', 'static', 'assets', 'media', 'images', 'img', 'files', 'download',
+    'uploads', 'content', 'resources', 'video', 'videos', 'photo', 'photos',
+
+    # Applications
+    'app', 'mobile', 'ios', 'android', 'web', 'webapp', 'client', 'app2',
+
+    # Infrastructure
+    'vpn', 'mail', 'email', 'smtp', 'pop', 'imap', 'ftp', 'sftp',
+    'ssh', 'remote', 'proxy', 'load-balancer', 'lb', 'vpn2',
+
+    # Monitoring & Tools
+    'monitoring', 'metrics', 'logs', 'analytics', 'stats', 'status',
+    'health', 'grafana', 'kibana', 'prometheus', 'datadog',
+
+    # Database & Cache
+    'db', 'database', 'sql', 'mysql', 'postgres', 'postgresql', 'mongodb', 'redis',
+    'cache', 'memcache', 'memcached', 'db2',
+
+    # Documentation & Support
+    'docs', 'documentation', 'help', 'support', 'wiki', 'kb', 'knowledgebase',
+    'faq', 'helpdesk', 'ticket', 'tickets',
+
+    # Security & Auth
+    'auth', 'login', 'sso', 'oauth', 'security', 'secure', 'identity', 'saml',
+
+    # Geographic (common for CDN/regional deployments)
+    'us', 'eu', 'uk', 'ca', 'au', 'asia', 'apac', 'emea', 'na',
+    'us-east', 'us-west', 'eu-west', 'eu-central', 'ap-southeast',
+
+    # Cloud-specific
+    'aws', 'azure', 'gcp', 'cloud', 'k8s', 'kubernetes', 'docker',
+    's3', 'blob', 'storage', 'bucket',
+
+    # Marketing & Customer-facing
+    'www', 'www2', 'blog', 'news', 'marketing', 'promo', 'campaign',
+    'landing', 'lp', 'newsletter', 'email-campaigns'
+)
+
+
 class MultiToolEnumerator:
     """
     Orchestrate multiple subdomain enumeration tools
     for maximum coverage (98-99%)
     """
 
-    def __init__(self, config_dir: Path = None):
+    # Bytes read from a tool's stdout pipe at a time
+    READ_CHUNK_SIZE = 65536
+
+    # Default cap on permutation candidates per domain; every one of them
+    # goes through DNS validation
+    MAX_PERMUTATIONS = 10000
+
+    def __init__(self, config_dir: Path = None, permutations: bool = False,
+                 max_permutations: int = MAX_PERMUTATIONS):
         """
         Initialize multi-tool enumerator
 
         Args:
             config_dir: Path to config directory (for tool paths)
+            permutations: Generate alterx-style permutations in full mode
+            max_permutations: Cap on permutation candidates per domain
         """
         self.logger = get_logger(self.__class__.__name__)
-
-        # Get default paths
-        home = Path.home()
-        go_bin = home / "go" / "bin"
-        project_bin = Path(__file__).parent.parent.parent / "bin"
+        self.permutations = permutations
+        self.max_permutations = max_permutations
 
         # Tool paths - Check environment variables first, then fall back to defaults
         self.tools = {
-            'subfinder': Path(os.getenv('SUBFINDER_PATH', project_bin / 'subfinder')),
-            'amass': Path(os.getenv('AMASS_PATH', go_bin / 'amass')),
-            'findomain': Path(os.getenv('FINDOMAIN_PATH', go_bin / 'findomain')),
-            'puredns': Path(os.getenv('PUREDNS_PATH', go_bin / 'puredns')),
-            'alterx': Path(os.getenv('ALTERX_PATH', go_bin / 'alterx')),
+            tool: Path(os.getenv(env_var)) if os.getenv(env_var) else default
+            for tool, (env_var, default) in _DEFAULT_TOOL_PATHS.items()
         }
 
         # Data paths (relative to project root)
-        project_root = Path(__file__).parent.parent.parent
-        self.wordlist_path = project_root / 'data' / 'wordlists' / 'best-dns-wordlist.txt'
-        self.resolvers_path = project_root / 'data' / 'resolvers' / 'resolvers.txt'
+        self.wordlist_path = _WORDLIST_PATH
+        self.resolvers_path = _RESOLVERS_PATH
+
+        self.refresh_tools()
+
+    def refresh_tools(self):
+        """
+        Re-check which tool binaries exist
+
+        Availability is cached at construction so scans don't stat every
+        binary per domain; call this after installing or moving a tool.
+        """
+        self._available = {name: path.exists() for name, path in self.tools.items()}
 
         # Verify critical tools exist
         for tool_name in ['subfinder', 'amass', 'findomain']:
-            if not self.tools[tool_name].exists():
+            if not self._available[tool_name]:
                 self.logger.warning(f"{tool_name} not found at {self.tools[tool_name]}")
 
     def enumerate(self, domain: str, mode='passive') -> List[Subdomain]:
@@ -68,6 +174,14 @@ class MultiToolEnumerator:
         """
         self.logger.info(f"Starting {mode} enumeration for: {domain}")
 
+        # Puredns bruteforce doesn't depend on the passive results, so in full
+        # mode it starts right away and overlaps with the passive tools
+        puredns_future = None
+        if mode not in ('passive', 'quick') and self._available['puredns'] and self.wordlist_path.exists():
+            puredns_executor = ThreadPoolExecutor(max_workers=1)
+            puredns_future = puredns_executor.submit(self._run_puredns, domain)
+            puredns_executor.shutdown(wait=False)
+
         # Phase 1: Passive enumeration (parallel)
         passive_subdomains = self._run_passive_tools(domain)
 
@@ -80,8 +194,8 @@ class MultiToolEnumerator:
         if mode == 'passive' or mode == 'quick':
             return self._create_subdomain_objects(passive_subdomains, domain)
 
-        # Phase 2: Active enumeration (sequential)
-        active_subdomains = self._run_active_tools(domain, passive_subdomains)
+        # Phase 2: Active enumeration
+        active_subdomains = self._run_active_tools(domain, passive_subdomains, puredns_future)
 
         # Merge results (root domain already in passive_subdomains)
         all_subdomains = passive_subdomains | active_subdomains
@@ -100,173 +214,61 @@ class MultiToolEnumerator:
         Returns:
             Set of discovered subdomains
         """
-        results = {}
-
-        # Run all passive tools in parallel for maximum coverage
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {}
-
-            # Submit all available passive tools
-            if self.tools['subfinder'].exists():
-                futures[executor.submit(self._run_subfinder, domain)] = 'subfinder'
-
-            if self.tools['findomain'].exists():
-                futures[executor.submit(self._run_findomain, domain)] = 'findomain'
-
-            if self.tools['amass'].exists():
-                futures[executor.submit(self._run_amass, domain)] = 'amass'
+        # Run all available passive tools in parallel for maximum coverage
+        commands = {
+            tool: ([str(self.tools[tool])] + [arg.format(domain=domain) for arg in args], timeout)
+            for tool, (args, timeout) in _PASSIVE_TOOL_SPECS.items()
+            if self._available[tool]
+        }
 
-            # Wait for all tools to complete
-            for future in as_completed(futures):
-                tool = futures[future]
-                try:
-                    subs = future.result()
-                    results[tool] = subs
-                    self.logger.info(f"{tool}: found {len(subs)} subdomains")
-                except Exception as e:
-                    self.logger.warning(f"{tool} failed: {e}")
-                    results[tool] = set()
+        if 'amass' in commands:
+            self.logger.info("Running amass (max 3 minutes)...")
 
-        # Merge all results
+        # Every tool adds straight into this one set as its output streams in
         all_subs = set()
-        for tool_subs in results.values():
-            all_subs.update(tool_subs)
+
+        for tool, (found, timed_out) in self._stream_tools(commands, domain, all_subs).items():
+            if timed_out:
+                # Don't log timeout as error - it's expected for some domains
+                self.logger.debug(f"{tool} timed out for {domain} after {commands[tool][1]}s, using partial results")
+            self.logger.info(f"{tool}: found {found} subdomains")
 
         self.logger.info(f"Total unique subdomains from passive tools: {len(all_subs)}")
         return all_subs
 
-    def _run_subfinder(self, domain: str) -> Set[str]:
-        """Run subfinder enumeration"""
-        if not self.tools['subfinder'].exists():
-            self.logger.warning("Subfinder not available")
-            return set()
-
-        cmd = [
-            str(self.tools['subfinder']),
-            '-d', domain,
-            '-all',
-            '-silent'
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            if result.returncode == 0 and result.stdout:
-                subdomains = set(result.stdout.strip().split('\n'))
-                # Filter out empty strings
-                return {s for s in subdomains if s and '.' in s}
-
-            return set()
-
-        except Exception as e:
-            self.logger.error(f"Subfinder error: {e}")
-            return set()
-
-    def _run_amass(self, domain: str) -> Set[str]:
-        """Run amass passive enumeration with timeout handling"""
-        if not self.tools['amass'].exists():
-            self.logger.warning("Amass not available")
-            return set()
-
-        cmd = [
-            str(self.tools['amass']),
-            'enum',
-            '-passive',
-            '-d', domain,
-            '-timeout', '2'  # Internal timeout of 2 minutes (reduced from 5)
-        ]
-
-        try:
-            self.logger.info("Running amass (max 3 minutes)...")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=180  # 3 minute external timeout (reduced from 6.5)
-            )
-
-            if result.returncode == 0 and result.stdout:
-                subdomains = set(result.stdout.strip().split('\n'))
-                return {s for s in subdomains if s and '.' in s}
-
-            return set()
-
-        except subprocess.TimeoutExpired:
-            self.logger.debug("Amass timed out after 3 minutes, using partial results")
-            return set()
-        except Exception as e:
-            self.logger.error(f"Amass error: {e}")
-            return set()
-
-    def _run_findomain(self, domain: str) -> Set[str]:
-        """Run findomain enumeration"""
-        if not self.tools['findomain'].exists():
-            self.logger.warning("Findomain not available")
-            return set()
-
-        cmd = [
-            str(self.tools['findomain']),
-            '-t', domain,
-            '-q'  # Quiet mode
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=180  # Increased from 60s to 180s for larger domains
-            )
-
-            if result.returncode == 0 and result.stdout:
-                subdomains = set(result.stdout.strip().split('\n'))
-                return {s for s in subdomains if s and '.' in s}
-
-            return set()
-
-        except subprocess.TimeoutExpired:
-            # Don't log timeout as error - it's expected for some domains
-            self.logger.debug(f"Findomain timed out for {domain} after 180s")
-            return set()
-        except Exception as e:
-            self.logger.error(f"Findomain error: {e}")
-            return set()
-
-    def _run_active_tools(self, domain: str, passive_results: Set[str]) -> Set[str]:
+    def _run_active_tools(self, domain: str, passive_results: Set[str],
+                          puredns_future: Optional[Future] = None) -> Set[str]:
         """
-        Run active enumeration tools sequentially
+        Collect active enumeration results
 
         Args:
             domain: Target domain
             passive_results: Results from passive enumeration (for permutation generation)
+            puredns_future: Already-running _run_puredns call, or None if
+                            puredns isn't available
 
         Returns:
             Set of newly discovered subdomains
         """
         active_subs = set()
 
-        # Puredns DNS bruteforce
-        if self.tools['puredns'].exists() and self.wordlist_path.exists():
+        # Alterx-style permutations (generated in-process while puredns runs)
+        if self.permutations and passive_results:
             try:
-                puredns_subs = self._run_puredns(domain)
-                active_subs.update(puredns_subs)
-                self.logger.info(f"Puredns: found {len(puredns_subs)} new subdomains")
+                alterx_subs = self._run_alterx(domain, passive_results)
+                active_subs.update(alterx_subs)
+                self.logger.info(f"Permutations: generated {len(alterx_subs)} candidate subdomains")
             except Exception as e:
-                self.logger.error(f"Puredns failed: {e}")
+                self.logger.error(f"Permutation generation failed: {e}")
 
-        # Alterx permutations
-        if self.tools['alterx'].exists() and passive_results:
+        # Puredns DNS bruteforce (started in enumerate)
+        if puredns_future is not None:
             try:
-                alterx_subs = self._run_alterx(domain, passive_results)
-                active_subs.update(alterx_subs)
-                self.logger.info(f"Alterx: found {len(alterx_subs)} new subdomains")
+                puredns_subs = puredns_future.result()
+                active_subs.update(puredns_subs)
+                self.logger.info(f"Puredns: found {len(puredns_subs)} new subdomains")
             except Exception as e:
-                self.logger.error(f"Alterx failed: {e}")
+                self.logger.error(f"Puredns failed: {e}")
 
         return active_subs
 
@@ -280,6 +282,7 @@ class MultiToolEnumerator:
             self.logger.warning(f"Resolvers not found: {self.resolvers_path}")
             return set()
 
+        subdomains = set()
         cmd = [
             str(self.tools['puredns']),
             'bruteforce',
@@ -290,126 +293,154 @@ class MultiToolEnumerator:
             '-q'  # Quiet
         ]
 
-        try:
-            self.logger.info(f"Running puredns (this may take 15-20 minutes)...")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=1800  # 30 min timeout
-            )
-
-            if result.returncode == 0 and result.stdout:
-                subdomains = set(result.stdout.strip().split('\n'))
-                return {s for s in subdomains if s and '.' in s}
-
-            return set()
+        self.logger.info(f"Running puredns (this may take 15-20 minutes)...")
+        results = self._stream_tools({'puredns': (cmd, 1800)}, domain, subdomains)  # 30 min timeout
 
-        except subprocess.TimeoutExpired:
-            self.logger.warning("Puredns timed out after 30 minutes")
-            return set()
-        except Exception as e:
-            self.logger.error(f"Puredns error: {e}")
-            return set()
+        if results.get('puredns', (0, False))[1]:
+            self.logger.warning("Puredns timed out after 30 minutes, using partial results")
+        return subdomains
 
     def _run_alterx(self, domain: str, existing_subs: Set[str]) -> Set[str]:
         """
-        Run alterx for subdomain permutations
+        Generate subdomain permutations in the style of alterx's default
+        templates: {word}-{sub}, {sub}-{word}, {word}.{sub} and {sub}.{word}
 
         Args:
             domain: Target domain
             existing_subs: Existing subdomains to generate permutations from
 
         Returns:
-            Set of permuted subdomains
+            Set of at most max_permutations permuted subdomains
         """
-        # Comprehensive patterns optimized for Shopify subdomain takeover detection
-        # Total: 100+ patterns for maximum coverage
-        patterns = [
-            # Development & Staging
-            'dev', 'staging', 'stage', 'prod', 'production', 'uat', 'qa', 'test', 'testing',
-            'demo', 'sandbox', 'lab', 'labs', 'preview', 'temp', 'tmp', 'dev2', 'staging2',
-
-            # API & Services
-            'api', 'api-v1', 'api-v2', 'api-v3', 'rest', 'graphql', 'ws', 'websocket', 'grpc',
-            'service', 'services', 'microservice', 'backend', 'gateway', 'api-gateway',
-
-            # Admin & Management
-            'admin', 'administrator', 'management', 'console', 'dashboard', 'panel',
-            'control', 'manager', 'portal', 'cpanel', 'admin-panel',
-
-            # E-commerce (Shopify-specific)
-            'shop', 'store', 'checkout', 'cart', 'payment', 'payments', 'billing',
-            'order', 'orders', 'merchant', 'pos', 'retail', 'ecommerce', 'catalog',
-            'products', 'inventory', 'fulfillment', 'shipping', 'returns',
-
-            # Content & Media
-            'cdn', 'static', 'assets', 'media', 'images', 'img', 'files', 'download',
-            'uploads', 'content', 'resources', 'video', 'videos', 'photo', 'photos',
-
-            # Applications
-            'app', 'mobile', 'ios', 'android', 'web', 'webapp', 'client', 'app2',
-
-            # Infrastructure
-            'vpn', 'mail', 'email', 'smtp', 'pop', 'imap', 'ftp', 'sftp',
-            'ssh', 'remote', 'proxy', 'load-balancer', 'lb', 'vpn2',
-
-            # Monitoring & Tools
-            'monitoring', 'metrics', 'logs', 'analytics', 'stats', 'status',
-            'health', 'grafana', 'kibana', 'prometheus', 'datadog',
-
-            # Database & Cache
-            'db', 'database', 'sql', 'mysql', 'postgres', 'postgresql', 'mongodb', 'redis',
-            'cache', 'memcache', 'memcached', 'db2',
-
-            # Documentation & Support
-            'docs', 'documentation', 'help', 'support', 'wiki', 'kb', 'knowledgebase',
-            'faq', 'helpdesk', 'ticket', 'tickets',
-
-            # Security & Auth
-            'auth', 'login', 'sso', 'oauth', 'security', 'secure', 'identity', 'saml',
-
-            # Geographic (common for CDN/regional deployments)
-            'us', 'eu', 'uk', 'ca', 'au', 'asia', 'apac', 'emea', 'na',
-            'us-east', 'us-west', 'eu-west', 'eu-central', 'ap-southeast',
-
-            # Cloud-specific
-            'aws', 'azure', 'gcp', 'cloud', 'k8s', 'kubernetes', 'docker',
-            's3', 'blob', 'storage', 'bucket',
-
-            # Marketing & Customer-facing
-            'www', 'www2', 'blog', 'news', 'marketing', 'promo', 'campaign',
-            'landing', 'lp', 'newsletter', 'email-campaigns'
-        ]
 
-        cmd = [
-            str(self.tools['alterx']),
-            '-l', '-',  # Read from stdin
-            '-p', ','.join(patterns),
-            '-silent'
-        ]
+        # Seed with the first 100 known subdomains below the root; each one
+        # is split into its first label and the rest
+        seeds = islice((sub for sub in existing_subs if sub.endswith('.' + domain)), 100)
+
+        subdomains = set()
+        for seed in seeds:
+            sub, _, suffix = seed.partition('.')
+            for word in _PERMUTATION_WORDS:
+                for candidate in (f"{word}-{sub}.{suffix}", f"{sub}-{word}.{suffix}",
+                                  f"{word}.{seed}", f"{sub}.{word}.{suffix}"):
+                    subdomains.add(candidate)
+                    if len(subdomains) >= self.max_permutations:
+                        self.logger.info(f"Permutations capped at {self.max_permutations} candidates")
+                        return subdomains
+
+        return subdomains
+
+    def _stream_tools(self, commands: Dict[str, Tuple[List[str], float]],
+                      domain: str, sink: Set[str]) -> Dict[str, Tuple[int, bool]]:
+        """
+        Run enumeration tools concurrently, adding hostnames from their stdout
+        to sink as they are printed rather than buffering the whole output
+
+        All the tools' pipes are multiplexed from the calling thread with one
+        selector, and each tool is killed once its own timeout passes.
+
+        Args:
+            commands: {tool name: (command, timeout in seconds)}
+            domain: Target domain; only lines naming it or one of its
+                    subdomains are kept
+            sink: Set the hostnames are added to
+
+        Returns:
+            {tool name: (hostnames printed, whether it timed out)} for every
+            tool that could be started
+        """
+        suffix = '.' + domain
+        selector = selectors.DefaultSelector()
+        processes = {}
+        deadlines = {}
+        decoders = {}
+        partial_lines = {}
+        found = {}
+        timed_out = set()
 
         try:
-            # Take first 100 subdomains as seed
-            sample = '\n'.join(list(existing_subs)[:100])
+            for tool, (cmd, timeout) in commands.items():
+                try:
+                    process = subprocess.Popen(
+                        cmd,
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL
+                    )
+                except OSError as e:
+                    self.logger.warning(f"{tool} failed: {e}")
+                    continue
+
+                processes[tool] = process
+                deadlines[tool] = time.monotonic() + timeout
+                decoders[tool] = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                partial_lines[tool] = ''
+                found[tool] = 0
+                selector.register(process.stdout, selectors.EVENT_READ, tool)
+
+            while selector.get_map():
+                wait = min(deadlines[key.data] for key in selector.get_map().values()) - time.monotonic()
+
+                for key, _ in selector.select(max(wait, 0)):
+                    tool = key.data
+                    chunk = os.read(key.fd, self.READ_CHUNK_SIZE)
+                    text = partial_lines[tool] + decoders[tool].decode(chunk, final=not chunk)
+
+                    lines = text.split('\n')
+                    # Hold back an unterminated last line until more arrives
+                    partial_lines[tool] = lines.pop() if chunk else ''
+                    found[tool] += self._add_hostnames(lines, domain, suffix, sink)
+
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    if now >= deadlines[key.data]:
+                        timed_out.add(key.data)
+                        processes[key.data].kill()
+                        selector.unregister(key.fileobj)
+
+        finally:
+            selector.close()
+            for tool, process in processes.items():
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                process.stdout.close()
 
-            result = subprocess.run(
-                cmd,
-                input=sample,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 min
-            )
+                if process.returncode != 0 and tool not in timed_out:
+                    self.logger.debug(f"{tool} exited with code {process.returncode}")
 
-            if result.returncode == 0 and result.stdout:
-                subdomains = set(result.stdout.strip().split('\n'))
-                return {s for s in subdomains if s and '.' in s and domain in s}
+        return {tool: (found[tool], tool in timed_out) for tool in processes}
 
-            return set()
+    @staticmethod
+    def _add_hostnames(lines: List[str], domain: str, suffix: str, sink: Set[str]) -> int:
+        """
+        Add the lines of tool output that name domain or a subdomain of it
+        to sink
 
-        except Exception as e:
-            self.logger.error(f"Alterx error: {e}")
-            return set()
+        Args:
+            lines: Output lines
+            domain: Target domain
+            suffix: '.' + domain
+            sink: Set the hostnames are added to
+
+        Returns:
+            Number of lines added
+        """
+        # One bulk update per chunk grows the set in fewer steps than
+        # per-line add() calls
+        # A suffix check is a single compare at the end of the line, and
+        # also drops stray output that isn't under the target domain
+        hostnames = [
+            line for line in map(str.strip, lines)
+            if line.endswith(suffix) or line == domain
+        ]
+        sink.update(hostnames)
+        return len(hostnames)
 
     def _create_subdomain_objects(self, subdomains: Set[str], parent_domain: str) -> List[Subdomain]:
         """
@@ -420,25 +451,13 @@ class MultiToolEnumerator:
             parent_domain: Parent domain
 
         Returns:
-            List of Subdomain objects
+            List of Subdomain objects, in no particular order
         """
-        subdomain_objects = []
-
-        for subdomain in sorted(subdomains):
-            # Skip empty or invalid
-            if not subdomain or not subdomain.strip():
-                continue
-
-            # Create subdomain object
-            try:
-                sub_obj = Subdomain(
-                    subdomain=subdomain.strip(),
-                    parent_domain=parent_domain,
-                    source='multi_tool_enum'
-                )
-                subdomain_objects.append(sub_obj)
-            except Exception as e:
-                self.logger.warning(f"Failed to create subdomain object for {subdomain}: {e}")
-                continue
+        # Skip empty or invalid names up front, so construction can't raise
+        # (Subdomain only rejects empty names) and needs no per-item try
+        cleaned = {s.strip() for s in subdomains if s and not s.isspace()}
 
-        return subdomain_objects
+        return [
+            Subdomain(subdomain=subdomain, parent_domain=parent_domain, source='multi_tool_enum')
+            for subdomain in cleaned
+        ]
@@ -3,12 +3,19 @@ Subdomain takeover detector using subzy and nuclei
 """
 from typing import List
 from pathlib import Path
-import tempfile
+import json
 
 from .base import PipelineStage
 from ..models.subdomain import Subdomain
 from ..parsers.subzy_parser import SubzyParser
 
+# orjson decodes subzy's results several times faster than the stdlib; its
+# JSONDecodeError subclasses json.JSONDecodeError so the fallback still works
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class TakeoverDetector(PipelineStage):
     """Subdomain takeover detection pipeline stage"""
@@ -42,34 +49,31 @@ class TakeoverDetector(PipelineStage):
 
         self.logger.info(f"Verifying takeover for {len(subdomains)} subdomains")
 
-        # Create temporary file with subdomain list
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-            for subdomain in subdomains:
-                f.write(f"{subdomain.subdomain}\n")
-            temp_file = f.name
+        # Hand subzy the subdomain list on stdin; it only accepts a targets
+        # file, so point it at /dev/stdin rather than writing a temp file
+        host_list = ''.join(f"{subdomain.subdomain}\n" for subdomain in subdomains)
 
         try:
             # Run subzy
             args = [
-                '--targets', temp_file,
+                '--targets', '/dev/stdin',
                 '--hide_fails',
                 '--concurrency', '10'
             ]
 
-            result = self.run_command(args, timeout=300)
+            result = self.run_command(args, input_data=host_list, timeout=300)
 
             if result.stdout:
-                # Try to parse as JSON
+                # Try to parse as a single JSON document
                 try:
-                    import json
-                    json_data = json.loads(result.stdout)
+                    json_data = _json_loads(result.stdout)
                     if isinstance(json_data, dict):
                         json_data = [json_data]
-                    subdomains = self.parser.parse(json_data, subdomains)
                 except json.JSONDecodeError:
-                    # Parse line by line
+                    # JSON Lines output (decoded in one pass when well-formed)
                     json_data = self.parse_json_lines(result.stdout)
-                    subdomains = self.parser.parse(json_data, subdomains)
+
+                subdomains = self.parser.parse(json_data, subdomains)
 
             # Filter only vulnerable subdomains
             vulnerable = [s for s in subdomains if s.is_vulnerable]
@@ -81,12 +85,6 @@ class TakeoverDetector(PipelineStage):
         except Exception as e:
             self.logger.error(f"Error detecting takeover: {str(e)}")
             return []
-        finally:
-            # Clean up temp file
-            try:
-                Path(temp_file).unlink()
-            except:
-                pass
 
     def execute(self, subdomains: List[Subdomain]) -> List[Subdomain]:
         """
@@ -6,6 +6,9 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+# Simple message-only format shared by every handler setup_logger installs
+_FORMATTER = logging.Formatter('%(message)s')
+
 
 def setup_logger(
     name: str = "subdomain_takeover",
@@ -37,16 +40,16 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    # Remove existing handlers
-    logger.handlers.clear()
-
-    # Create simple formatter
-    formatter = logging.Formatter('%(message)s')
+    # Remove (and close) handlers from any earlier call, so reconfiguring
+    # doesn't duplicate output or leak an open log file
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
 
     # File handler (if specified)
@@ -56,7 +59,7 @@ def setup_logger(
 
         file_handler = logging.FileHandler(log_path)
         file_handler.setLevel(logging.DEBUG)  # Always log debug to file
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FORMATTER)
         logger.addHandler(file_handler)
 
     return logger
@@ -70,6 +73,7 @@ def get_logger(name: str) -> logging.Logger:
         name: Logger name
 
     Returns:
-        Logger instance
+        Logger instance (no handlers of its own; records propagate to the
+        subdomain_takeover logger setup_logger configures)
     """
     return logging.getLogger(f"subdomain_takeover.{name}")
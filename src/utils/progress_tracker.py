@@ -1,11 +1,43 @@
 """
 Progress tracker for real-time subdomain scan updates
 """
+import itertools
+import queue
+import sys
 import time
 import threading
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 
+# One row of the live results table (header and progress lines alike):
+# subdomain, status, provider, CNAME, evidence, message
+_ROW_FMT = "{:<40} {:<8} {:<12} {:<30} {:<50} {:<60}"
+
+
+# Emoji-decorated labels for terminals, with plain stand-ins used when stdout
+# is redirected to a file or pipe
+_TTY_LABELS = {
+    'started': "📊 SCAN INITIATED",
+    'vulnerable': "🔴VULN",
+    'definite': "🔴 DEFINITE TAKEOVER",
+    'high': "⚠️ HIGH PROBABILITY",
+    'false_positive': "❌ FALSE POSITIVE",
+    'complete': "✅ SCAN COMPLETE",
+}
+_PLAIN_LABELS = {
+    'started': "SCAN INITIATED",
+    'vulnerable': "VULN",
+    'definite': "DEFINITE TAKEOVER",
+    'high': "HIGH PROBABILITY",
+    'false_positive': "FALSE POSITIVE",
+    'complete': "SCAN COMPLETE",
+}
+
+
+def _clip(text: str, width: int) -> str:
+    """Truncate text to width chars, marking the cut with '..'"""
+    return text if len(text) <= width else text[:width - 2] + ".."
+
 
 class ProgressTracker:
     """Track and display real-time progress of subdomain scans"""
@@ -21,8 +53,37 @@ class ProgressTracker:
         self.total_domains = total_domains
         self.workers = workers
         self.completed = 0
+        # next() on itertools.count is atomic, so counting needs no lock
+        self._counter = itertools.count(1)
         self.start_time = None
-        self.lock = threading.Lock()
+        self._labels = _TTY_LABELS if sys.stdout.isatty() else _PLAIN_LABELS
+
+        # Output goes through a queue to one writer thread, so callers never
+        # block on a slow terminal or pipe
+        self._output = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_output, name='progress-writer', daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    def _print(self, text: str = ""):
+        """Queue a line of output for the writer thread"""
+        self._output.put(text + "\n")
+
+    def _write_output(self):
+        """Writer thread: write queued output in batches until close() sends None"""
+        while True:
+            batch = [self._output.get()]
+            try:
+                while True:
+                    batch.append(self._output.get_nowait())
+            except queue.Empty:
+                pass
+
+            done = None in batch
+            sys.stdout.write(''.join(text for text in batch if text is not None))
+            sys.stdout.flush()
+            if done:
+                return
 
     def start(self):
         """Start the progress tracker"""
@@ -38,16 +99,16 @@ class ProgressTracker:
         estimated_duration = timedelta(seconds=int(total_seconds))
         estimated_completion = datetime.now() + estimated_duration
 
-        print("\n" + "=" * 100)
-        print(f"📊 SCAN INITIATED")
-        print("=" * 100)
-        print(f"Total Domains    : {self.total_domains}")
-        print(f"Concurrent Workers: {self.workers}")
-        print(f"Estimated Time   : {estimated_duration}")
-        print(f"Estimated Done   : {estimated_completion.strftime('%H:%M:%S')}")
-        print("=" * 200)
-        print(f"{'SUBDOMAIN':<40} {'STATUS':<8} {'PROVIDER':<12} {'CNAME':<30} {'EVIDENCE':<50} {'MESSAGE':<60}")
-        print("=" * 200)
+        self._print("\n" + "=" * 100)
+        self._print(self._labels['started'])
+        self._print("=" * 100)
+        self._print(f"Total Domains    : {self.total_domains}")
+        self._print(f"Concurrent Workers: {self.workers}")
+        self._print(f"Estimated Time   : {estimated_duration}")
+        self._print(f"Estimated Done   : {estimated_completion.strftime('%H:%M:%S')}")
+        self._print("=" * 200)
+        self._print(_ROW_FMT.format('SUBDOMAIN', 'STATUS', 'PROVIDER', 'CNAME', 'EVIDENCE', 'MESSAGE'))
+        self._print("=" * 200)
 
     def update(self, subdomain: str, status: str = "✓", provider: Optional[str] = None,
                cname: Optional[str] = None, http_status: Optional[int] = None,
@@ -72,74 +133,89 @@ class ProgressTracker:
             a_records: A records
             final_cname_target: Final CNAME destination
         """
-        with self.lock:
-            self.completed += 1
-
-            # Truncate long values
-            subdomain_display = subdomain[:38] + ".." if len(subdomain) > 40 else subdomain
-            provider_display = (provider or "-")[:12]
-
-            # CNAME - show first CNAME or chain indicator
-            if cname_chain and len(cname_chain) > 1:
-                cname_display = f"{cname_chain[0][:25]}.. ({len(cname_chain)} hops)"
-            elif cname:
-                cname_display = cname[:28] + ".." if len(cname) > 30 else cname
-            else:
-                cname_display = "-"
+        # Truncate long values
+        subdomain_display = _clip(subdomain, 40)
+        provider_display = (provider or "-")[:12]
 
-            # Status column shows HTTP status code or vulnerability
-            if vulnerable:
-                status_display = "🔴VULN"
-            elif http_status:
-                status_display = str(http_status)
-            else:
-                status_display = "-"
-
-            # Evidence column - show takeover categorization
-            if takeover_evidence:
-                # Extract key part (e.g., "DEFINITE TAKEOVER", "FALSE POSITIVE")
-                if "DEFINITE TAKEOVER" in takeover_evidence:
-                    evidence_display = "🔴 DEFINITE TAKEOVER"
-                elif "HIGH PROBABILITY" in takeover_evidence:
-                    evidence_display = "⚠️ HIGH PROBABILITY"
-                elif "FALSE POSITIVE" in takeover_evidence:
-                    evidence_display = "❌ FALSE POSITIVE"
-                else:
-                    evidence_display = takeover_evidence[:48] + ".." if len(takeover_evidence) > 50 else takeover_evidence
-            else:
-                evidence_display = "-"
+        # CNAME - show first CNAME or chain indicator
+        if cname_chain and len(cname_chain) > 1:
+            cname_display = f"{cname_chain[0][:25]}.. ({len(cname_chain)} hops)"
+        elif cname:
+            cname_display = _clip(cname, 30)
+        else:
+            cname_display = "-"
+
+        # Status column shows HTTP status code or vulnerability
+        if vulnerable:
+            status_display = self._labels['vulnerable']
+        elif http_status:
+            status_display = str(http_status)
+        else:
+            status_display = "-"
 
-            # Message column - show error message from page
-            if http_body_snippet and http_body_snippet != "[No error message found]":
-                message_display = http_body_snippet[:58] + ".." if len(http_body_snippet) > 60 else http_body_snippet
+        # Evidence column - show takeover categorization
+        if takeover_evidence:
+            # Extract key part (e.g., "DEFINITE TAKEOVER", "FALSE POSITIVE")
+            if "DEFINITE TAKEOVER" in takeover_evidence:
+                evidence_display = self._labels['definite']
+            elif "HIGH PROBABILITY" in takeover_evidence:
+                evidence_display = self._labels['high']
+            elif "FALSE POSITIVE" in takeover_evidence:
+                evidence_display = self._labels['false_positive']
             else:
-                message_display = "-"
+                evidence_display = _clip(takeover_evidence, 50)
+        else:
+            evidence_display = "-"
+
+        # Message column - show error message from page
+        if http_body_snippet and http_body_snippet != "[No error message found]":
+            message_display = _clip(http_body_snippet, 60)
+        else:
+            message_display = "-"
+
+        line = _ROW_FMT.format(subdomain_display, status_display, provider_display,
+                               cname_display, evidence_display, message_display)
 
-            # Print progress line with all columns
-            print(f"{subdomain_display:<40} {status_display:<8} {provider_display:<12} {cname_display:<30} {evidence_display:<50} {message_display:<60}")
+        completed = self.completed = next(self._counter)
 
-            # Show progress every 10 domains or at completion
-            if self.completed % 10 == 0 or self.completed == self.total_domains:
-                self._print_progress()
+        # Print progress line with all columns
+        self._print(line)
 
-    def _print_progress(self):
-        """Print progress statistics"""
+        # Show progress every 10 domains or at completion
+        if completed % 10 == 0 or completed == self.total_domains:
+            self._print_progress(completed)
+
+    def _print_progress(self, completed: int):
+        """Print progress statistics as of the completed-th update"""
         elapsed = time.time() - self.start_time
-        rate = self.completed / elapsed if elapsed > 0 else 0
-        remaining = self.total_domains - self.completed
+        rate = completed / elapsed if elapsed > 0 else 0
+        remaining = self.total_domains - completed
         eta_seconds = remaining / rate if rate > 0 else 0
 
-        progress_pct = (self.completed / self.total_domains) * 100
+        progress_pct = (completed / self.total_domains) * 100
 
-        print(f"\n[{self.completed}/{self.total_domains}] {progress_pct:.1f}% complete | "
+        self._print(f"\n[{completed}/{self.total_domains}] {progress_pct:.1f}% complete | "
               f"Rate: {rate:.2f} domains/sec | ETA: {int(eta_seconds//60)}m {int(eta_seconds%60)}s\n")
 
     def finish(self):
-        """Print completion summary"""
+        """Print completion summary and flush output (only the first call prints)"""
+        if self._closed:
+            return
+
         elapsed = time.time() - self.start_time
-        print("\n" + "=" * 200)
-        print(f"✅ SCAN COMPLETE - {self.completed} subdomains processed in {int(elapsed//60)}m {int(elapsed%60)}s")
-        print("=" * 200 + "\n")
+        self._print("\n" + "=" * 200)
+        self._print(f"{self._labels['complete']} - {self.completed} subdomains processed in {int(elapsed//60)}m {int(elapsed%60)}s")
+        self._print("=" * 200 + "\n")
+        self.close()
+
+    def close(self):
+        """Write everything queued so far and stop the writer thread (idempotent)"""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._output.put(None)
+        self._writer.join()
 
 
 class SubdomainProgressTracker:
@@ -153,8 +229,8 @@ class SubdomainProgressTracker:
             domain: Domain being scanned
         """
         self.domain = domain
+        # (list.append is atomic, so concurrent add_result calls need no lock)
         self.subdomain_results = []
-        self.lock = threading.Lock()
 
     def add_result(self, subdomain: str, provider: Optional[str] = None,
                    cname: Optional[str] = None, http_status: Optional[int] = None,
@@ -170,15 +246,14 @@ class SubdomainProgressTracker:
             ip_address: IP address
             vulnerable: Whether vulnerable
         """
-        with self.lock:
-            self.subdomain_results.append({
-                'subdomain': subdomain,
-                'provider': provider,
-                'cname': cname,
-                'http_status': http_status,
-                'ip_address': ip_address,
-                'vulnerable': vulnerable
-            })
+        self.subdomain_results.append({
+            'subdomain': subdomain,
+            'provider': provider,
+            'cname': cname,
+            'http_status': http_status,
+            'ip_address': ip_address,
+            'vulnerable': vulnerable
+        })
 
     def print_live_result(self, subdomain: str, provider: Optional[str] = None,
                          cname: Optional[str] = None, http_status: Optional[int] = None,
@@ -2,6 +2,7 @@
 DNS and subdomain validation modules
 """
 from .dns_validator import DNSValidator
+from .dns_store import DNSStore
 from .wildcard_detector import WildcardDetector
 
-__all__ = ['DNSValidator', 'WildcardDetector']
+__all__ = ['DNSValidator', 'DNSStore', 'WildcardDetector']
@@ -2,10 +2,18 @@
 CNAME Blacklist Filter - Exclude untakeable CNAME patterns
 """
 import logging
+import re
 import yaml
 from pathlib import Path
 from typing import List, Set, Optional
 
+# pyahocorasick matches every pattern in one pass over the CNAME; without it
+# a single compiled alternation still avoids a Python-level loop per pattern
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class CNAMEBlacklist:
     """Filter out CNAMEs that cannot be taken over"""
@@ -24,6 +32,9 @@ class CNAMEBlacklist:
             config_path = Path(__file__).parent.parent.parent / 'config' / 'cname_blacklist.yaml'
 
         self.blacklist_patterns: Set[str] = set()
+        # Substring matcher over blacklist_patterns, rebuilt on first use
+        # after the patterns change
+        self._matcher = None
         self._load_blacklist(config_path)
 
     def _load_blacklist(self, config_path: Path):
@@ -101,11 +112,31 @@ class CNAMEBlacklist:
             return True
 
         # Substring match (e.g., "x.myshopify.verification" matches "myshopify.verification")
-        for pattern in self.blacklist_patterns:
-            if pattern in cname_lower:
-                return True
+        if self._matcher is None:
+            self._matcher = self._build_matcher()
+
+        return self._matcher(cname_lower)
+
+    def _build_matcher(self):
+        """
+        Build a substring matcher for the current patterns
+
+        Returns:
+            Callable taking a lowercased CNAME and returning True if any
+            pattern occurs in it
+        """
+        if not self.blacklist_patterns:
+            return lambda cname: False
 
-        return False
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for pattern in self.blacklist_patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            return lambda cname: next(automaton.iter(cname), None) is not None
+
+        regex = re.compile('|'.join(map(re.escape, self.blacklist_patterns)))
+        return lambda cname: regex.search(cname) is not None
 
     def filter_subdomains(self, subdomains: List, verbose: bool = False) -> List:
         """
@@ -120,27 +151,33 @@ class CNAMEBlacklist:
         """
         filtered = []
         blacklisted_count = 0
+        log = self.logger.debug if verbose else None
+
+        # Many subdomains point at the same CDN/provider targets, so each
+        # distinct hop is only checked once per batch
+        verdicts = {}
+
+        def is_blacklisted(hop: str) -> bool:
+            verdict = verdicts.get(hop)
+            if verdict is None:
+                verdict = verdicts[hop] = self.is_blacklisted(hop)
+            return verdict
 
         for subdomain in subdomains:
-            # Check primary CNAME
-            if subdomain.cname and self.is_blacklisted(subdomain.cname):
-                blacklisted_count += 1
-                if verbose:
-                    self.logger.debug(f"Blacklisted CNAME: {subdomain.subdomain} → {subdomain.cname}")
+            # Most subdomains have no CNAME at all; keep those without
+            # building a hop sequence
+            if not subdomain.cname and not subdomain.cname_chain:
+                filtered.append(subdomain)
                 continue
 
-            # Check CNAME chain (if present)
-            is_chain_blacklisted = False
-            if subdomain.cname_chain:
-                for cname_hop in subdomain.cname_chain:
-                    if self.is_blacklisted(cname_hop):
-                        blacklisted_count += 1
-                        is_chain_blacklisted = True
-                        if verbose:
-                            self.logger.debug(f"Blacklisted CNAME in chain: {subdomain.subdomain} → {cname_hop}")
-                        break
-
-            if is_chain_blacklisted:
+            # Primary CNAME first, then the rest of the chain (if present)
+            hops = (subdomain.cname, *(subdomain.cname_chain or ()))
+            hit = next((hop for hop in hops if hop and is_blacklisted(hop)), None)
+
+            if hit is not None:
+                blacklisted_count += 1
+                if log:
+                    log(f"Blacklisted CNAME: {subdomain.subdomain} → {hit}")
                 continue
 
             # Not blacklisted, keep it
@@ -159,6 +196,7 @@ class CNAMEBlacklist:
             pattern: CNAME pattern to blacklist
         """
         self.blacklist_patterns.add(pattern.lower().strip())
+        self._matcher = None
         self.logger.info(f"Added CNAME blacklist pattern: {pattern}")
 
     def remove_pattern(self, pattern: str):
@@ -171,6 +209,7 @@ class CNAMEBlacklist:
         pattern_lower = pattern.lower().strip()
         if pattern_lower in self.blacklist_patterns:
             self.blacklist_patterns.remove(pattern_lower)
+            self._matcher = None
             self.logger.info(f"Removed CNAME blacklist pattern: {pattern}")
 
     def get_patterns(self) -> List[str]:
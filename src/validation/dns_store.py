@@ -0,0 +1,104 @@
+"""
+Persistent DNS result store
+
+SQLite-backed second tier for DNSValidator's in-memory DNS cache, so a
+rerun over overlapping targets can skip resolving hostnames it has seen
+recently.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class DNSStore:
+    """
+    On-disk hostname -> DNS fields cache with per-entry expiry
+
+    Values are the same field dicts DNSValidator keeps in memory (or None
+    for hostnames that didn't resolve), stored as JSON. All access goes
+    through one connection guarded by a lock, since scan_domains shares a
+    single validator between worker threads. WildcardDetector stores its
+    results here too, under 'wildcard:'-prefixed keys.
+    """
+
+    # SQLite's default limit on bound parameters per statement is 999
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the store
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS dns_cache ('
+            'host TEXT PRIMARY KEY, fields TEXT, expires_at REAL NOT NULL)'
+        )
+        self._conn.execute('DELETE FROM dns_cache WHERE expires_at < ?', (time.time(),))
+        self._conn.commit()
+
+    def get_many(self, hosts: Iterable[str]) -> Dict[str, Tuple[float, Optional[Dict]]]:
+        """
+        Look up unexpired entries
+
+        Args:
+            hosts: Hostnames to look up
+
+        Returns:
+            {hostname: (epoch expiry, fields or None)} for every hostname found
+        """
+        hosts = list(hosts)
+        now = time.time()
+        found = {}
+
+        with self._lock:
+            for i in range(0, len(hosts), self.QUERY_CHUNK_SIZE):
+                chunk = hosts[i:i + self.QUERY_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT host, fields, expires_at FROM dns_cache "
+                    f"WHERE expires_at >= ? AND host IN ({','.join('?' * len(chunk))})",
+                    [now, *chunk]
+                )
+                for host, fields, expires_at in rows:
+                    found[host] = (expires_at, json.loads(fields) if fields is not None else None)
+
+        return found
+
+    def put_many(self, entries: Dict[str, Optional[Dict]], ttl: float):
+        """
+        Store entries, replacing any existing ones
+
+        Args:
+            entries: {hostname: DNS fields, or None if it didn't resolve}
+            ttl: Seconds until the entries expire
+        """
+        expires_at = time.time() + ttl
+        rows = [
+            (host, json.dumps(fields) if fields is not None else None, expires_at)
+            for host, fields in entries.items()
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO dns_cache (host, fields, expires_at) VALUES (?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -4,14 +4,102 @@ DNS Validation Module - Critical missing component
 Properly resolves DNS records, tracks CNAME chains, and detects NXDOMAIN.
 This is the step that was missing between enumeration and HTTP probing.
 """
+import importlib.util
+import io
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 import subprocess
 import json
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from ..models.subdomain import Subdomain
+from .dns_store import DNSStore
+
+# orjson decodes dnsx output lines several times faster than the stdlib;
+# its JSONDecodeError subclasses json.JSONDecodeError so handlers still match
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# CNAME hops under these service domains are recorded on the subdomain while
+# parsing dnsx output (leading dots so only real subdomains match, not e.g.
+# "shopify.com.example.net")
+_DNSX_VULNERABLE_HOP_SUFFIXES = tuple('.' + domain for domain in (
+    'myshopify.com', 'shopify.com',
+    'azurewebsites.net', 'cloudapp.net',
+    'herokuapp.com', 'herokudns.com',
+    'amazonaws.com', 's3.amazonaws.com',
+    'github.io', 'netlify.app',
+    'pantheonsite.io', 'readme.io',
+    'zendesk.com', 'helpscoutdocs.com',
+    'fastly.net', 'cloudfront.net'
+))
+
+# Vulnerable service domains checked against each CNAME hop by
+# verify_cname_target
+_VULNERABLE_SERVICE_PATTERNS = {
+    'shopify': ('myshopify.com', 'shopify.com'),
+    'azure': ('azurewebsites.net', 'cloudapp.azure.com', 'cloudapp.net'),
+    'heroku': ('herokuapp.com', 'herokudns.com'),
+    'aws': ('amazonaws.com', 's3.amazonaws.com', 'elasticbeanstalk.com'),
+    'github': ('github.io',),
+    'netlify': ('netlify.app', 'netlify.com'),
+    'pantheon': ('pantheonsite.io',),
+    'readme': ('readme.io',),
+    'zendesk': ('zendesk.com',),
+    'helpscout': ('helpscoutdocs.com',),
+    'fastly': ('fastly.net',),
+    'cloudfront': ('cloudfront.net',),
+    'bitbucket': ('bitbucket.io',),
+    'surge': ('surge.sh',),
+    'tumblr': ('tumblr.com',),
+    'wordpress': ('wordpress.com',),
+    'ghost': ('ghost.io',),
+    'smugmug': ('smugmug.com',),
+    'cargo': ('cargocollective.com',),
+    'statuspage': ('statuspage.io',),
+    'uservoice': ('uservoice.com',),
+    'getresponse': ('getresponse.com',),
+    'vend': ('vendhq.com',),
+    'jetbrains': ('myjetbrains.com',),
+    'brightcove': ('bcvp0rtal.com', 'brightcovegallery.com'),
+    'bigcartel': ('bigcartel.com',),
+    'campaignmonitor': ('createsend.com',),
+    'acquia': ('acquia.com',)
+}
+
+_SERVICE_BY_DOMAIN = {
+    domain: service
+    for service, domains in _VULNERABLE_SERVICE_PATTERNS.items()
+    for domain in domains
+}
+
+
+def _match_vulnerable_service(hop: str) -> Optional[str]:
+    """
+    Find the vulnerable service a normalized CNAME hop points at
+
+    Looks up each parent domain of the hop, longest first, so the cost is
+    one dict lookup per label rather than a scan per pattern.
+
+    Args:
+        hop: Lowercased CNAME hop without trailing dot
+
+    Returns:
+        Service name, or None if the hop isn't under any service domain
+    """
+    dot = hop.find('.')
+    while dot != -1:
+        hop = hop[dot + 1:]
+        service = _SERVICE_BY_DOMAIN.get(hop)
+        if service:
+            return service
+        dot = hop.find('.')
+    return None
 
 
 class DNSValidator:
@@ -22,7 +110,34 @@ class DNSValidator:
     Properly validates which subdomains actually resolve before HTTP probing.
     """
 
-    def __init__(self, dnsx_path: Path, use_dnspython_fallback: bool = True, resolvers: Optional[List[str]] = None):
+    # Subdomain fields filled in by DNS validation (what the DNS cache stores)
+    DNS_FIELDS = (
+        'cname', 'cname_chain', 'a_records', 'aaaa_records', 'ns_records',
+        'dns_resolved', 'nxdomain', 'dns_ttl', 'dns_response_code',
+        'authoritative_ns', 'soa_record', 'mx_records', 'txt_records',
+        'cname_chain_count', 'final_cname_target', 'dangling_cname',
+        'vulnerable_cname_hop', 'takeover_risk'
+    )
+
+    # DNS cache bounds: entries older than the TTL are re-resolved
+    DNS_CACHE_TTL = 900
+    DNS_CACHE_SIZE = 50000
+
+    # Concurrent dnspython lookups for CNAME targets dnsx couldn't answer
+    CNAME_VERIFY_WORKERS = 64
+
+    # Concurrent subdomains resolved by the dnspython fallback
+    FALLBACK_WORKERS = 64
+
+    # dnsx processes run at once when a batch is split into chunks
+    DNSX_WORKERS = 4
+
+    # How long dnspython NXDOMAIN / no-answer results are cached (positive
+    # answers use their record TTL, capped at DNS_CACHE_TTL)
+    NEGATIVE_CACHE_TTL = 300
+
+    def __init__(self, dnsx_path: Path, use_dnspython_fallback: bool = True, resolvers: Optional[List[str]] = None,
+                 cache_file: Optional[Path] = None):
         """
         Initialize DNS validator
 
@@ -30,12 +145,37 @@ class DNSValidator:
             dnsx_path: Path to dnsx binary
             use_dnspython_fallback: Use dnspython if dnsx fails
             resolvers: List of DNS resolvers (default: ['8.8.8.8', '1.1.1.1', '208.67.222.222'])
+            cache_file: Optional SQLite file that persists DNS results across
+                        runs (second tier behind the in-memory cache)
         """
         self.dnsx_path = dnsx_path
         self.use_dnspython_fallback = use_dnspython_fallback
         self.resolvers = resolvers or ['8.8.8.8', '1.1.1.1', '208.67.222.222']  # Google, Cloudflare, OpenDNS
         self.logger = logging.getLogger(__name__)
 
+        # hostname -> (expiry, DNS field values or None if it didn't validate)
+        self._dns_cache: Dict[str, Tuple[float, Optional[Dict]]] = {}
+
+        # (hostname, record type) -> (expiry, dnspython answer or the
+        # NXDOMAIN/NoAnswer exception class it raised)
+        self._record_cache: Dict[Tuple[str, str], Tuple[float, object]] = {}
+
+        # (CNAME target, chain) -> (expiry, verify_cname_target result)
+        self._cname_verify_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+
+        self._dns_store: Optional[DNSStore] = None
+        if cache_file:
+            try:
+                self._dns_store = DNSStore(cache_file)
+            except Exception as e:
+                self.logger.warning(f"Persistent DNS cache disabled ({cache_file}): {str(e)}")
+
+    def close(self):
+        """Close the persistent DNS cache, if one is open"""
+        if self._dns_store is not None:
+            self._dns_store.close()
+            self._dns_store = None
+
     def validate_batch(self, subdomains: List[Subdomain], chunk_size: int = 1000) -> List[Subdomain]:
         """
         Validate DNS resolution for batch of subdomains with chunking for performance
@@ -55,6 +195,171 @@ class DNSValidator:
         if not subdomains:
             return []
 
+        # Resolve each hostname once, even if several tools reported it
+        unique = {}
+        for subdomain in subdomains:
+            unique.setdefault(subdomain.subdomain, subdomain)
+        if len(unique) < len(subdomains):
+            return self._validate_deduplicated(subdomains, unique, chunk_size)
+
+        # Serve hostnames resolved recently (e.g. by an earlier scan) from cache
+        cached, misses = self._split_cached(subdomains)
+        if not misses:
+            self.logger.info(f"DNS cache hit for all {len(subdomains)} subdomains")
+            return cached
+
+        validated = self._validate_uncached(misses, chunk_size)
+        self._cache_results(misses, validated)
+        return cached + validated
+
+    def _validate_deduplicated(self, subdomains: List[Subdomain], unique: Dict[str, Subdomain],
+                               chunk_size: int) -> List[Subdomain]:
+        """
+        Validate the first object per hostname and copy its DNS fields to the
+        duplicates
+
+        Args:
+            subdomains: List of Subdomain objects, with repeated hostnames
+            unique: {hostname: first Subdomain with that name}
+            chunk_size: Number of domains to process per dnsx call
+
+        Returns:
+            Validated Subdomain objects (duplicates included), in input order
+        """
+        self.logger.debug(f"Resolving {len(unique)} unique hostnames for {len(subdomains)} subdomains")
+        validated_ids = {id(s) for s in self.validate_batch(list(unique.values()), chunk_size)}
+
+        validated = []
+        for subdomain in subdomains:
+            canonical = unique[subdomain.subdomain]
+            if id(canonical) not in validated_ids:
+                continue
+            if subdomain is not canonical:
+                for name in self.DNS_FIELDS:
+                    value = getattr(canonical, name)
+                    setattr(subdomain, name, list(value) if isinstance(value, list) else value)
+            validated.append(subdomain)
+
+        return validated
+
+    def _split_cached(self, subdomains: List[Subdomain]) -> Tuple[List[Subdomain], List[Subdomain]]:
+        """
+        Split subdomains into cache hits (DNS fields applied) and misses
+
+        Returns:
+            (validated subdomains served from cache, subdomains still to resolve)
+        """
+        now = time.monotonic()
+        cached = []
+        misses = []
+
+        for subdomain in subdomains:
+            entry = self._dns_cache.get(subdomain.subdomain)
+            if entry is None or entry[0] < now:
+                misses.append(subdomain)
+                continue
+
+            self._apply_cached_fields(subdomain, entry[1], cached)
+
+        if misses and self._dns_store is not None:
+            misses = self._split_stored(misses, cached)
+
+        return cached, misses
+
+    def _split_stored(self, subdomains: List[Subdomain], cached: List[Subdomain]) -> List[Subdomain]:
+        """
+        Serve in-memory cache misses from the persistent store
+
+        Hits are promoted into the in-memory cache and validated ones are
+        appended to cached.
+
+        Returns:
+            Subdomains the store had no fresh entry for
+        """
+        try:
+            stored = self._dns_store.get_many(s.subdomain for s in subdomains)
+        except Exception as e:
+            self.logger.warning(f"Persistent DNS cache lookup failed: {str(e)}")
+            return subdomains
+
+        if not stored:
+            return subdomains
+
+        # Store expiries are wall-clock; the in-memory cache runs on monotonic time
+        offset = time.monotonic() - time.time()
+        misses = []
+
+        for subdomain in subdomains:
+            entry = stored.get(subdomain.subdomain)
+            if entry is None:
+                misses.append(subdomain)
+                continue
+
+            expires_at, fields = entry
+            self._dns_cache[subdomain.subdomain] = (expires_at + offset, fields)
+            self._apply_cached_fields(subdomain, fields, cached)
+
+        self.logger.debug(f"Persistent DNS cache served {len(subdomains) - len(misses)} subdomains")
+        return misses
+
+    @staticmethod
+    def _apply_cached_fields(subdomain: Subdomain, fields: Optional[Dict], cached: List[Subdomain]):
+        """Copy cached DNS fields onto subdomain; collect it if it validated"""
+        if fields is not None:
+            for name, value in fields.items():
+                setattr(subdomain, name, list(value) if isinstance(value, list) else value)
+            cached.append(subdomain)
+
+    def _cache_results(self, attempted: List[Subdomain], validated: List[Subdomain]):
+        """
+        Remember DNS results, including subdomains that didn't validate
+
+        Args:
+            attempted: Subdomains that were resolved
+            validated: The ones that validated
+        """
+        # An empty result usually means dnsx/fallback failed outright; don't
+        # remember that as "doesn't resolve"
+        if not validated:
+            return
+
+        if len(self._dns_cache) + len(attempted) > self.DNS_CACHE_SIZE:
+            # Drop the oldest half (dicts keep insertion order)
+            for stale in list(self._dns_cache)[:self.DNS_CACHE_SIZE // 2]:
+                self._dns_cache.pop(stale, None)
+
+        expiry = time.monotonic() + self.DNS_CACHE_TTL
+        validated_ids = {id(s) for s in validated}
+        entries = {}
+
+        for subdomain in attempted:
+            if id(subdomain) in validated_ids:
+                fields = {name: getattr(subdomain, name) for name in self.DNS_FIELDS}
+                for name, value in fields.items():
+                    if isinstance(value, list):
+                        fields[name] = list(value)
+            else:
+                fields = None
+            self._dns_cache[subdomain.subdomain] = (expiry, fields)
+            entries[subdomain.subdomain] = fields
+
+        if self._dns_store is not None:
+            try:
+                self._dns_store.put_many(entries, self.DNS_CACHE_TTL)
+            except Exception as e:
+                self.logger.warning(f"Persistent DNS cache write failed: {str(e)}")
+
+    def _validate_uncached(self, subdomains: List[Subdomain], chunk_size: int) -> List[Subdomain]:
+        """
+        Validate DNS resolution with dnsx (or the fallback resolver)
+
+        Args:
+            subdomains: List of Subdomain objects
+            chunk_size: Number of domains to process per dnsx call
+
+        Returns:
+            List of Subdomain objects with DNS data populated
+        """
         self.logger.info(f"Validating DNS for {len(subdomains)} subdomains")
 
         # If dnsx binary is missing or not executable, go straight to fallback
@@ -87,32 +392,41 @@ class DNSValidator:
         validated_all = []
         total_chunks = (len(subdomains) + chunk_size - 1) // chunk_size
 
-        for i in range(0, len(subdomains), chunk_size):
-            chunk = subdomains[i:i + chunk_size]
-            chunk_num = (i // chunk_size) + 1
+        # Built once and shared (read-only) by every chunk's output parsing
+        subdomain_map = {s.subdomain: s for s in subdomains}
 
+        def validate_chunk(numbered_chunk: Tuple[int, List[Subdomain]]) -> List[Subdomain]:
+            chunk_num, chunk = numbered_chunk
             self.logger.info(f"Processing DNS chunk {chunk_num}/{total_chunks} ({len(chunk)} domains)")
-            validated_chunk = self._validate_single_batch(chunk)
-            validated_all.extend(validated_chunk)
+            return self._validate_single_batch(chunk, subdomain_map)
+
+        chunks = [subdomains[i:i + chunk_size] for i in range(0, len(subdomains), chunk_size)]
+
+        # Each chunk is its own dnsx process; run a few at once rather than
+        # waiting on them one after another. Chunks touch disjoint
+        # Subdomain objects, and results are collected in chunk order.
+        with ThreadPoolExecutor(max_workers=min(self.DNSX_WORKERS, total_chunks)) as executor:
+            for validated_chunk in executor.map(validate_chunk, enumerate(chunks, 1)):
+                validated_all.extend(validated_chunk)
 
         self.logger.info(f"Completed chunked validation: {len(validated_all)}/{len(subdomains)} domains validated")
         return validated_all
 
-    def _validate_single_batch(self, subdomains: List[Subdomain]) -> List[Subdomain]:
+    def _validate_single_batch(self, subdomains: List[Subdomain],
+                               subdomain_map: Optional[Dict[str, Subdomain]] = None) -> List[Subdomain]:
         """
         Validate a single batch of subdomains using dnsx
 
         Args:
             subdomains: List of Subdomain objects
+            subdomain_map: Optional prebuilt {name: Subdomain} lookup (see _parse_dnsx_output)
 
         Returns:
             List of validated Subdomain objects
         """
-        # Create temporary file with subdomain list
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-            for subdomain in subdomains:
-                f.write(f"{subdomain.subdomain}\n")
-            temp_file = f.name
+        # dnsx reads the hostnames from stdin (one buffer, one write) rather
+        # than from a temporary file on disk
+        host_list = ('\n'.join([subdomain.subdomain for subdomain in subdomains]) + '\n').encode('utf-8')
 
         try:
             # Run dnsx to resolve DNS records with custom resolvers
@@ -120,7 +434,6 @@ class DNSValidator:
             resolver_string = ','.join(self.resolvers)
             cmd = [
                 str(self.dnsx_path),
-                '-l', temp_file,
                 '-json',
                 '-cname',        # CNAME records
                 '-a',            # A records
@@ -131,24 +444,60 @@ class DNSValidator:
                 '-silent'
             ]
 
-            result = subprocess.run(
+            # Stream dnsx's output and apply each line as it arrives instead
+            # of buffering the whole result
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
             )
 
-            if result.returncode == 0 and result.stdout:
-                # Parse dnsx JSON output
-                lines_count = len([l for l in result.stdout.strip().split('\n') if l])
+            # Feed stdin from a helper thread so a full stdout pipe can't
+            # deadlock against the write
+            feeder = threading.Thread(target=self._feed_stdin, args=(process, host_list), daemon=True)
+            feeder.start()
+
+            timed_out = threading.Event()
+
+            def kill_on_timeout():
+                timed_out.set()
+                process.kill()
+
+            timer = threading.Timer(300, kill_on_timeout)
+            timer.start()
+
+            lines_count = 0
+
+            def counted_lines():
+                nonlocal lines_count
+                for line in process.stdout:
+                    if line.strip():
+                        lines_count += 1
+                    yield line
+
+            try:
+                validated = self._parse_dnsx_output(counted_lines(), subdomains, subdomain_map)
+                process.wait()
+            finally:
+                timer.cancel()
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                feeder.join()
+                process.stdout.close()
+
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, 300)
+
+            if process.returncode == 0 and lines_count:
                 self.logger.info(f"dnsx returned {lines_count} lines of output")
-                validated = self._parse_dnsx_output(result.stdout, subdomains)
                 self.logger.info(f"Successfully validated {len(validated)}/{len(subdomains)} subdomains")
-                if len(validated) == 0 and lines_count > 0:
+                if len(validated) == 0:
                     self.logger.warning(f"dnsx returned {lines_count} lines but parser found 0 matches!")
                 return validated
             else:
-                self.logger.warning(f"dnsx validation failed (rc={result.returncode}, stdout={len(result.stdout) if result.stdout else 0} bytes), using fallback")
+                self.logger.warning(f"dnsx validation failed (rc={process.returncode}, lines={lines_count}), using fallback")
                 if self.use_dnspython_fallback:
                     return self._fallback_validation(subdomains)
                 return []
@@ -163,147 +512,151 @@ class DNSValidator:
             if self.use_dnspython_fallback:
                 return self._fallback_validation(subdomains)
             return []
-        finally:
-            # Clean up temp file
-            try:
-                Path(temp_file).unlink()
-            except:
-                pass
 
-    def _parse_dnsx_output(self, output: str, original_subdomains: List[Subdomain]) -> List[Subdomain]:
+    @staticmethod
+    def _feed_stdin(process: subprocess.Popen, input_data: bytes):
+        """Write input_data to a process's stdin and close it"""
+        try:
+            process.stdin.write(input_data)
+            process.stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            # dnsx exited (or was killed) before reading all of its input
+            pass
+
+    def _parse_dnsx_output(self, output: Union[str, Iterable[Union[str, bytes]]],
+                           original_subdomains: List[Subdomain],
+                           subdomain_map: Optional[Dict[str, Subdomain]] = None) -> List[Subdomain]:
         """
         Parse dnsx JSON output and populate Subdomain objects
 
         Args:
-            output: dnsx JSON output
+            output: dnsx JSON output, or an iterable of its lines (str or
+                    bytes, e.g. straight from the dnsx stdout pipe)
             original_subdomains: Original subdomain list
+            subdomain_map: Optional prebuilt {name: Subdomain} lookup covering
+                          original_subdomains; built from them if omitted
 
         Returns:
             List of validated Subdomain objects
         """
         validated = []
-        subdomain_map = {s.subdomain: s for s in original_subdomains}
-
-        for line in output.strip().split('\n'):
-            if not line:
+        if subdomain_map is None:
+            subdomain_map = {s.subdomain: s for s in original_subdomains}
+
+        # Walk the output in place rather than splitting it into a list of
+        # lines; each entry is applied to its Subdomain as it is decoded
+        lines = io.StringIO(output) if isinstance(output, str) else output
+        for line in lines:
+            if not line.strip():
                 continue
 
             try:
-                data = json.loads(line)
+                data = _json_loads(line)
                 hostname = data.get('host', '')
 
-                # Debug: Log what we're trying to match
-                if hostname not in subdomain_map:
+                # One lookup per line rather than a membership test plus an index
+                subdomain = subdomain_map.get(hostname)
+                if subdomain is None:
+                    # Debug: Log what we're trying to match
                     self.logger.debug(f"Hostname '{hostname}' not in subdomain_map (have {len(subdomain_map)} entries)")
+                    continue
+
+                # Extract CNAME (track full chain)
+                # CRITICAL: For takeover detection, we need to know what the subdomain POINTS TO
+                # dnsx returns CNAME chain in resolution order: [first_hop, second_hop, ..., final]
+                cname_records = data.get('cname', [])
+                if cname_records:
+                    if isinstance(cname_records, list):
+                        # Full CNAME chain - dnsx returns in order of resolution
+                        subdomain.cname_chain = cname_records
+                        subdomain.cname = cname_records[0] if cname_records else None  # FIRST hop (what subdomain points to)
+                        subdomain.final_cname_target = cname_records[-1]  # FINAL destination
+                        subdomain.cname_chain_count = len(cname_records)
+
+                        # For takeover detection: Check if ANY hop in chain points to vulnerable service
+                        # Example: subdomain.com -> cdn.cloudflare.net -> shop.myshopify.com
+                        # We need to check ALL hops, not just first or last
+                        for cname_hop in cname_records:
+                            # Normalize: remove trailing dots, lowercase
+                            cname_hop_normalized = cname_hop.rstrip('.').lower()
+                            # Check if this hop points to a potentially vulnerable service
+                            if cname_hop_normalized.endswith(_DNSX_VULNERABLE_HOP_SUFFIXES):
+                                # Store the first vulnerable hop for verification
+                                if subdomain.vulnerable_cname_hop is None:
+                                    subdomain.vulnerable_cname_hop = cname_hop_normalized
 
-                if hostname in subdomain_map:
-                    subdomain = subdomain_map[hostname]
-
-                    # Extract CNAME (track full chain)
-                    # CRITICAL: For takeover detection, we need to know what the subdomain POINTS TO
-                    # dnsx returns CNAME chain in resolution order: [first_hop, second_hop, ..., final]
-                    cname_records = data.get('cname', [])
-                    if cname_records:
-                        if isinstance(cname_records, list):
-                            # Full CNAME chain - dnsx returns in order of resolution
-                            subdomain.cname_chain = cname_records
-                            subdomain.cname = cname_records[0] if cname_records else None  # FIRST hop (what subdomain points to)
-                            subdomain.final_cname_target = cname_records[-1]  # FINAL destination
-                            subdomain.cname_chain_count = len(cname_records)
-
-                            # For takeover detection: Check if ANY hop in chain points to vulnerable service
-                            # Example: subdomain.com -> cdn.cloudflare.net -> shop.myshopify.com
-                            # We need to check ALL hops, not just first or last
-                            for cname_hop in cname_records:
-                                # Normalize: remove trailing dots, lowercase
-                                cname_hop_normalized = cname_hop.rstrip('.').lower()
-                                # Check if this hop points to a potentially vulnerable service
-                                if any(pattern in cname_hop_normalized for pattern in [
-                                    'myshopify.com', 'shopify.com',
-                                    'azurewebsites.net', 'cloudapp.net',
-                                    'herokuapp.com', 'herokudns.com',
-                                    'amazonaws.com', 's3.amazonaws.com',
-                                    'github.io', 'netlify.app',
-                                    'pantheonsite.io', 'readme.io',
-                                    'zendesk.com', 'helpscoutdocs.com',
-                                    'fastly.net', 'cloudfront.net'
-                                ]):
-                                    # Store the vulnerable hop for verification
-                                    if not hasattr(subdomain, 'vulnerable_cname_hop'):
-                                        subdomain.vulnerable_cname_hop = cname_hop_normalized
-
-                        else:
-                            subdomain.cname = cname_records
-                            subdomain.final_cname_target = cname_records
-                            subdomain.cname_chain = [cname_records]
-                            subdomain.cname_chain_count = 1
-
-                    # CRITICAL: Check if CNAME target resolves
-                    # If subdomain has CNAME but NO A/AAAA records, the target might not exist (TAKEOVER!)
-                    # This is a STRONG indicator of subdomain takeover vulnerability
-                    if subdomain.cname and not data.get('a') and not data.get('aaaa'):
-                        # CNAME exists but doesn't resolve to IP - potential dangling CNAME
-                        subdomain.dangling_cname = True
-                        subdomain.takeover_risk = 'high'
                     else:
-                        subdomain.dangling_cname = False
-
-                    # Extract A records
-                    a_records = data.get('a', [])
-                    if a_records:
-                        subdomain.a_records = a_records if isinstance(a_records, list) else [a_records]
-                        # Use first IP as primary
-                        if subdomain.a_records and not hasattr(subdomain, 'ip_address'):
-                            subdomain.ip_address = subdomain.a_records[0]
-
-                    # Extract AAAA records
-                    aaaa_records = data.get('aaaa', [])
-                    if aaaa_records:
-                        subdomain.aaaa_records = aaaa_records if isinstance(aaaa_records, list) else [aaaa_records]
-
-                    # Extract NS records
-                    ns_records = data.get('ns', [])
-                    if ns_records:
-                        subdomain.ns_records = ns_records if isinstance(ns_records, list) else [ns_records]
-                        # First NS as authoritative
-                        if subdomain.ns_records:
-                            subdomain.authoritative_ns = subdomain.ns_records[0]
-
-                    # Extract MX records
-                    mx_records = data.get('mx', [])
-                    if mx_records:
-                        subdomain.mx_records = mx_records if isinstance(mx_records, list) else [mx_records]
-
-                    # Extract TXT records
-                    txt_records = data.get('txt', [])
-                    if txt_records:
-                        subdomain.txt_records = txt_records if isinstance(txt_records, list) else [txt_records]
-
-                    # Extract SOA record
-                    soa = data.get('soa', '')
-                    if soa:
-                        subdomain.soa_record = soa
-
-                    # Extract TTL
-                    ttl = data.get('ttl', None)
-                    if ttl:
-                        subdomain.dns_ttl = int(ttl)
-
-                    # Extract response code
-                    rcode = data.get('rcode', data.get('status_code', ''))
-                    if rcode:
-                        subdomain.dns_response_code = str(rcode)
-
-                    # Mark as resolved
-                    subdomain.dns_resolved = True
-
-                    # Check for NXDOMAIN in response
-                    if 'NXDOMAIN' in str(rcode) or 'NXDOMAIN' in str(data.get('status_code', '')):
-                        subdomain.nxdomain = True
-
-                    validated.append(subdomain)
+                        subdomain.cname = cname_records
+                        subdomain.final_cname_target = cname_records
+                        subdomain.cname_chain = [cname_records]
+                        subdomain.cname_chain_count = 1
+
+                # CRITICAL: Check if CNAME target resolves
+                # If subdomain has CNAME but NO A/AAAA records, the target might not exist (TAKEOVER!)
+                # This is a STRONG indicator of subdomain takeover vulnerability
+                if subdomain.cname and not data.get('a') and not data.get('aaaa'):
+                    # CNAME exists but doesn't resolve to IP - potential dangling CNAME
+                    subdomain.dangling_cname = True
+                    subdomain.takeover_risk = 'high'
+                else:
+                    subdomain.dangling_cname = False
+
+                # Extract A records
+                a_records = data.get('a', [])
+                if a_records:
+                    subdomain.a_records = a_records if isinstance(a_records, list) else [a_records]
+
+                # Extract AAAA records
+                aaaa_records = data.get('aaaa', [])
+                if aaaa_records:
+                    subdomain.aaaa_records = aaaa_records if isinstance(aaaa_records, list) else [aaaa_records]
+
+                # Extract NS records
+                ns_records = data.get('ns', [])
+                if ns_records:
+                    subdomain.ns_records = ns_records if isinstance(ns_records, list) else [ns_records]
+                    # First NS as authoritative
+                    if subdomain.ns_records:
+                        subdomain.authoritative_ns = subdomain.ns_records[0]
 
-            except json.JSONDecodeError:
+                # Extract MX records
+                mx_records = data.get('mx', [])
+                if mx_records:
+                    subdomain.mx_records = mx_records if isinstance(mx_records, list) else [mx_records]
+
+                # Extract TXT records
+                txt_records = data.get('txt', [])
+                if txt_records:
+                    subdomain.txt_records = txt_records if isinstance(txt_records, list) else [txt_records]
+
+                # Extract SOA record
+                soa = data.get('soa', '')
+                if soa:
+                    subdomain.soa_record = soa
+
+                # Extract TTL
+                ttl = data.get('ttl', None)
+                if ttl:
+                    subdomain.dns_ttl = int(ttl)
+
+                # Extract response code
+                rcode = data.get('rcode', data.get('status_code', ''))
+                if rcode:
+                    subdomain.dns_response_code = str(rcode)
+
+                # Mark as resolved
+                subdomain.dns_resolved = True
+
+                # Check for NXDOMAIN in response
+                if 'NXDOMAIN' in str(rcode) or 'NXDOMAIN' in str(data.get('status_code', '')):
+                    subdomain.nxdomain = True
+
+                validated.append(subdomain)
+
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # (stdlib json raises UnicodeDecodeError for bad bytes input)
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8', 'replace')
                 self.logger.warning(f"Failed to parse dnsx output line: {line[:100]}")
                 continue
 
@@ -319,42 +672,75 @@ class DNSValidator:
         Returns:
             List of validated Subdomain objects
         """
-        try:
-            import dns.resolver
-        except ImportError:
+        # The workers import dns.resolver themselves; only check it's installed
+        if importlib.util.find_spec('dns') is None:
             self.logger.error("dnspython not available for fallback")
             return []
 
         self.logger.info(f"Using dnspython fallback for {len(subdomains)} subdomains")
-        validated = []
 
-        for subdomain in subdomains:
+        # Each subdomain is several blocking lookups; resolve them concurrently
+        workers = max(1, min(self.FALLBACK_WORKERS, len(subdomains)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            validated = [
+                subdomain
+                for subdomain, resolved in zip(subdomains, executor.map(self._fallback_resolve, subdomains))
+                if resolved
+            ]
+
+        self.logger.info(f"Fallback validated {len(validated)} subdomains")
+        return validated
+
+    def _fallback_resolve(self, subdomain: Subdomain) -> bool:
+        """
+        Resolve one subdomain's records with dnspython (see _fallback_validation)
+
+        Args:
+            subdomain: Subdomain object, updated in place
+
+        Returns:
+            True if the subdomain resolved or has a CNAME
+        """
+        import dns.resolver
+
+        try:
+            # Try to resolve A records
+            a_answer = None
             try:
-                # Try to resolve A records
-                try:
-                    answers = dns.resolver.resolve(subdomain.subdomain, 'A')
-                    subdomain.a_records = [str(rdata) for rdata in answers]
-                    subdomain.dns_resolved = True
-                    # Extract TTL from first answer
-                    if answers.rrset:
-                        subdomain.dns_ttl = answers.rrset.ttl
-                except dns.resolver.NXDOMAIN:
-                    subdomain.nxdomain = True
-                    subdomain.dns_resolved = False
-                    subdomain.dns_response_code = 'NXDOMAIN'
-                except:
-                    pass
+                answers = a_answer = self._resolve_cached(subdomain.subdomain, 'A')
+                subdomain.a_records = [str(rdata) for rdata in answers]
+                subdomain.dns_resolved = True
+                # Extract TTL from first answer
+                if answers.rrset:
+                    subdomain.dns_ttl = answers.rrset.ttl
+            except dns.resolver.NXDOMAIN:
+                subdomain.nxdomain = True
+                subdomain.dns_resolved = False
+                subdomain.dns_response_code = 'NXDOMAIN'
+            except:
+                pass
 
-                # Try to resolve CNAME (track full chain)
-                try:
-                    # Manually resolve CNAME chain
+            # Try to resolve CNAME (track full chain)
+            try:
+                max_chain_length = 10  # Prevent infinite loops
+                chaining_result = getattr(a_answer, 'chaining_result', None)
+
+                if chaining_result is not None:
+                    # dnspython 2.1+: the A answer already carries the chain the
+                    # recursive resolver followed, so no query per hop
+                    cname_chain = [
+                        str(rrset[0].target).rstrip('.')
+                        for rrset in chaining_result.cnames[:max_chain_length]
+                    ]
+                else:
+                    # Manually resolve CNAME chain (A lookup failed, e.g. a
+                    # dangling CNAME, or older dnspython)
                     current_name = subdomain.subdomain
                     cname_chain = []
-                    max_chain_length = 10  # Prevent infinite loops
 
                     for _ in range(max_chain_length):
                         try:
-                            answers = dns.resolver.resolve(current_name, 'CNAME')
+                            answers = self._resolve_cached(current_name, 'CNAME')
                             if answers:
                                 cname_target = str(answers[0].target).rstrip('.')
                                 cname_chain.append(cname_target)
@@ -367,61 +753,112 @@ class DNSValidator:
                             subdomain.nxdomain = True
                             break
 
-                    if cname_chain:
-                        subdomain.cname = cname_chain[0]  # First CNAME
-                        subdomain.final_cname_target = cname_chain[-1]  # Final target
-                        subdomain.cname_chain = cname_chain
-                        subdomain.cname_chain_count = len(cname_chain)
-                except:
-                    pass
+                if cname_chain:
+                    subdomain.cname = cname_chain[0]  # First CNAME
+                    subdomain.final_cname_target = cname_chain[-1]  # Final target
+                    subdomain.cname_chain = cname_chain
+                    subdomain.cname_chain_count = len(cname_chain)
+            except:
+                pass
 
-                # Try to resolve AAAA
-                try:
-                    answers = dns.resolver.resolve(subdomain.subdomain, 'AAAA')
-                    subdomain.aaaa_records = [str(rdata) for rdata in answers]
-                except:
-                    pass
+            if subdomain.nxdomain and not subdomain.cname:
+                # The name doesn't exist (and isn't a dangling CNAME), so every
+                # other record type would be NXDOMAIN too; skip those lookups
+                return False
 
-                # Try to resolve NS
-                try:
-                    answers = dns.resolver.resolve(subdomain.subdomain, 'NS')
-                    subdomain.ns_records = [str(rdata).rstrip('.') for rdata in answers]
-                    if subdomain.ns_records:
-                        subdomain.authoritative_ns = subdomain.ns_records[0]
-                except:
-                    pass
+            # Try to resolve AAAA
+            try:
+                answers = self._resolve_cached(subdomain.subdomain, 'AAAA')
+                subdomain.aaaa_records = [str(rdata) for rdata in answers]
+            except:
+                pass
 
-                # Try to resolve MX
-                try:
-                    answers = dns.resolver.resolve(subdomain.subdomain, 'MX')
-                    subdomain.mx_records = [str(rdata.exchange).rstrip('.') for rdata in answers]
-                except:
-                    pass
+            # Try to resolve NS
+            try:
+                answers = self._resolve_cached(subdomain.subdomain, 'NS')
+                subdomain.ns_records = [str(rdata).rstrip('.') for rdata in answers]
+                if subdomain.ns_records:
+                    subdomain.authoritative_ns = subdomain.ns_records[0]
+            except:
+                pass
 
-                # Try to resolve TXT
-                try:
-                    answers = dns.resolver.resolve(subdomain.subdomain, 'TXT')
-                    subdomain.txt_records = [str(rdata) for rdata in answers]
-                except:
-                    pass
+            # Try to resolve MX
+            try:
+                answers = self._resolve_cached(subdomain.subdomain, 'MX')
+                subdomain.mx_records = [str(rdata.exchange).rstrip('.') for rdata in answers]
+            except:
+                pass
 
-                # Try to resolve SOA
-                try:
-                    answers = dns.resolver.resolve(subdomain.subdomain, 'SOA')
-                    if answers:
-                        subdomain.soa_record = str(answers[0])
-                except:
-                    pass
+            # Try to resolve TXT
+            try:
+                answers = self._resolve_cached(subdomain.subdomain, 'TXT')
+                subdomain.txt_records = [str(rdata) for rdata in answers]
+            except:
+                pass
+
+            # Try to resolve SOA
+            try:
+                answers = self._resolve_cached(subdomain.subdomain, 'SOA')
+                if answers:
+                    subdomain.soa_record = str(answers[0])
+            except:
+                pass
 
-                if subdomain.dns_resolved or subdomain.cname:
-                    validated.append(subdomain)
+            return bool(subdomain.dns_resolved or subdomain.cname)
 
-            except Exception as e:
-                self.logger.debug(f"Fallback validation failed for {subdomain.subdomain}: {str(e)}")
-                continue
+        except Exception as e:
+            self.logger.debug(f"Fallback validation failed for {subdomain.subdomain}: {str(e)}")
+            return False
 
-        self.logger.info(f"Fallback validated {len(validated)} subdomains")
-        return validated
+    def _resolve_cached(self, name: str, rdtype: str):
+        """
+        dns.resolver.resolve through a per-record cache that honors TTLs
+
+        CNAME chain walks and target checks for many subdomains keep
+        hitting the same provider hostnames, so each answer is reused until
+        it expires.
+
+        Args:
+            name: Hostname to resolve
+            rdtype: Record type
+
+        Returns:
+            dnspython Answer
+
+        Raises:
+            Whatever dns.resolver.resolve raises; cached NXDOMAIN / NoAnswer
+            results are raised again without a query
+        """
+        import dns.resolver
+
+        key = (name.lower(), rdtype)
+        now = time.monotonic()
+        entry = self._record_cache.get(key)
+        if entry is not None and entry[0] > now:
+            if isinstance(entry[1], type):
+                raise entry[1]()
+            return entry[1]
+
+        try:
+            answers = dns.resolver.resolve(name, rdtype)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            self._store_record(key, now + self.NEGATIVE_CACHE_TTL, type(e))
+            raise
+
+        ttl = answers.rrset.ttl if answers.rrset is not None else self.NEGATIVE_CACHE_TTL
+        self._store_record(key, now + min(ttl, self.DNS_CACHE_TTL), answers)
+        return answers
+
+    def _store_record(self, key: Tuple[str, str], expiry: float, value):
+        """Add a _record_cache entry, pruning in bulk once the cache is full"""
+        if len(self._record_cache) >= self.DNS_CACHE_SIZE:
+            now = time.monotonic()
+            expired = [k for k, (entry_expiry, _) in list(self._record_cache.items()) if entry_expiry <= now]
+            # Nothing expired: drop the oldest half (dicts keep insertion order)
+            for stale in expired or list(self._record_cache)[:self.DNS_CACHE_SIZE // 2]:
+                self._record_cache.pop(stale, None)
+
+        self._record_cache[key] = (expiry, value)
 
     def check_nxdomain(self, hostname: str) -> bool:
         """
@@ -435,7 +872,7 @@ class DNSValidator:
         """
         try:
             import dns.resolver
-            dns.resolver.resolve(hostname, 'A')
+            self._resolve_cached(hostname, 'A')
             return False
         except dns.resolver.NXDOMAIN:
             return True
@@ -446,12 +883,225 @@ class DNSValidator:
         """
         Deep verification of CNAME target for takeover detection
 
+        Results are memoized by (CNAME target, chain), so subdomains that
+        point at the same SaaS endpoint only cost one lookup.
+
         Args:
             subdomain: Subdomain object with CNAME data
 
         Returns:
             Dictionary with verification results
         """
+        if not subdomain.cname:
+            return self._verify_cname_target(subdomain)
+
+        results = self._get_cached_verification(subdomain)
+        if results is None:
+            results = self._verify_cname_target(subdomain)
+            self._store_verification(subdomain, results)
+
+        return results
+
+    def verify_cname_targets(self, subdomains: List[Subdomain]) -> Dict[str, dict]:
+        """
+        Batch version of verify_cname_target
+
+        All uncached CNAME targets are resolved with a single dnsx run
+        instead of one resolver query per subdomain. Targets dnsx gives no
+        answer for fall back to a concurrent dnspython lookup per target.
+
+        Args:
+            subdomains: Subdomain objects (those without a CNAME are skipped)
+
+        Returns:
+            Dict of subdomain name -> verification results
+        """
+        verified = {}
+        pending = []
+
+        for subdomain in subdomains:
+            if not subdomain.cname:
+                continue
+            results = self._get_cached_verification(subdomain)
+            if results is not None:
+                verified[subdomain.subdomain] = results
+            else:
+                pending.append(subdomain)
+
+        targets = sorted({(s.final_cname_target or s.cname).lower() for s in pending})
+        statuses = self._resolve_targets_dnsx(targets) if targets else {}
+
+        unresolved = []
+        for subdomain in pending:
+            target_status = statuses.get((subdomain.final_cname_target or subdomain.cname).lower())
+            if target_status is None:
+                unresolved.append(subdomain)
+                continue
+            results = self._verify_cname_target(subdomain, target_status)
+            self._store_verification(subdomain, results)
+            verified[subdomain.subdomain] = results
+
+        if unresolved:
+            # Fall back to dnspython, one blocking lookup per distinct target
+            # (not per subdomain), overlapped on a thread pool
+            targets = list({(s.final_cname_target or s.cname).lower() for s in unresolved})
+            workers = min(self.CNAME_VERIFY_WORKERS, len(targets))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                statuses = dict(zip(targets, executor.map(self._probe_target, targets)))
+
+                failed = []
+                for subdomain in unresolved:
+                    target_status = statuses[(subdomain.final_cname_target or subdomain.cname).lower()]
+                    if target_status is None:
+                        failed.append(subdomain)
+                        continue
+                    results = self._verify_cname_target(subdomain, target_status)
+                    self._store_verification(subdomain, results)
+                    verified[subdomain.subdomain] = results
+
+                # Lookups that errored get the full per-subdomain check, which
+                # records the error in the verification details
+                for subdomain, results in zip(failed, executor.map(self._verify_cname_target, failed)):
+                    self._store_verification(subdomain, results)
+                    verified[subdomain.subdomain] = results
+
+        return verified
+
+    def _probe_target(self, target: str) -> Optional[Tuple[str, int]]:
+        """
+        Resolve a CNAME target's A records with dnspython
+
+        Args:
+            target: Hostname to resolve
+
+        Returns:
+            Status in the _resolve_targets_dnsx format, or None if dnspython
+            is unavailable or the lookup failed some other way
+        """
+        try:
+            import dns.resolver
+        except ImportError:
+            return None
+
+        try:
+            return ('resolves', len(self._resolve_cached(target, 'A')))
+        except dns.resolver.NXDOMAIN:
+            return ('nxdomain', 0)
+        except dns.resolver.NoAnswer:
+            return ('noanswer', 0)
+        except Exception:
+            return None
+
+    def _resolve_targets_dnsx(self, targets: List[str]) -> Dict[str, Tuple[str, int]]:
+        """
+        Resolve A records for many CNAME targets with one dnsx run
+
+        Args:
+            targets: Lowercased hostnames
+
+        Returns:
+            Dict of target -> ('resolves', ip_count) | ('nxdomain', 0) | ('noanswer', 0);
+            targets without a usable answer are left out
+        """
+        if not self.dnsx_path or not Path(self.dnsx_path).exists():
+            return {}
+
+        cmd = [
+            str(self.dnsx_path),
+            '-json',
+            '-a',
+            '-resp',
+            '-rcode', 'noerror,nxdomain',  # Report NXDOMAIN/empty answers too
+            '-retry', '2',
+            '-r', ','.join(self.resolvers),
+            '-silent'
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                input='\n'.join(targets),
+                capture_output=True,
+                text=True,
+                timeout=300
+            )
+        except Exception as e:
+            self.logger.warning(f"Batch CNAME target resolution failed: {str(e)}")
+            return {}
+
+        statuses = {}
+        for line in result.stdout.splitlines():
+            try:
+                data = _json_loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            host = data.get('host', '').rstrip('.').lower()
+            status_code = str(data.get('status_code', ''))
+            a_records = data.get('a') or []
+
+            if 'NXDOMAIN' in status_code:
+                statuses[host] = ('nxdomain', 0)
+            elif a_records:
+                statuses[host] = ('resolves', len(a_records))
+            elif status_code == 'NOERROR':
+                statuses[host] = ('noanswer', 0)
+
+        return statuses
+
+    @staticmethod
+    def _apply_target_status(target: str, target_status: Tuple[str, int], results: dict):
+        """Record a pre-resolved target status the same way the dnspython check does"""
+        status, ip_count = target_status
+        if status == 'resolves':
+            results['target_resolves'] = True
+            results['verification_details'].append(f"Target {target} resolves to {ip_count} IPs")
+        elif status == 'nxdomain':
+            results['is_dangling'] = True
+            results['takeover_confidence'] += 50
+            results['verification_details'].append(f"CRITICAL: Target {target} returns NXDOMAIN")
+        else:
+            results['is_dangling'] = True
+            results['takeover_confidence'] += 40
+            results['verification_details'].append(f"WARNING: Target {target} has no A records")
+
+    def _cname_verify_key(self, subdomain) -> Tuple:
+        """Cache key for CNAME verification: what the result depends on"""
+        return ((subdomain.final_cname_target or subdomain.cname).lower(), tuple(subdomain.cname_chain))
+
+    def _get_cached_verification(self, subdomain) -> Optional[dict]:
+        """Return a copy of a fresh cached verification result, or None"""
+        entry = self._cname_verify_cache.get(self._cname_verify_key(subdomain))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+
+        results = dict(entry[1])
+        results['verification_details'] = list(results['verification_details'])
+        return results
+
+    def _store_verification(self, subdomain, results: dict):
+        """Cache a verification result (definitive answers only)"""
+        # Only remember definitive answers, not transient DNS errors
+        if not (results['target_resolves'] or results['is_dangling']):
+            return
+
+        if len(self._cname_verify_cache) >= self.DNS_CACHE_SIZE:
+            for stale in list(self._cname_verify_cache)[:self.DNS_CACHE_SIZE // 2]:
+                self._cname_verify_cache.pop(stale, None)
+
+        cached = dict(results)
+        cached['verification_details'] = list(results['verification_details'])
+        self._cname_verify_cache[self._cname_verify_key(subdomain)] = (time.monotonic() + self.DNS_CACHE_TTL, cached)
+
+    def _verify_cname_target(self, subdomain, target_status: Optional[Tuple[str, int]] = None) -> dict:
+        """
+        Uncached CNAME target verification (see verify_cname_target)
+
+        Args:
+            subdomain: Subdomain object with CNAME data
+            target_status: Pre-resolved target status from _resolve_targets_dnsx;
+                          if None, the target is resolved with dnspython
+        """
         results = {
             'cname_exists': False,
             'target_resolves': False,
@@ -466,68 +1116,40 @@ class DNSValidator:
 
         results['cname_exists'] = True
 
+        target = subdomain.final_cname_target or subdomain.cname
+
         try:
-            import dns.resolver
+            if target_status is not None:
+                # Target was already resolved in bulk by verify_cname_targets
+                self._apply_target_status(target, target_status, results)
+            else:
+                import dns.resolver
 
-            # Check if final CNAME target resolves
-            target = subdomain.final_cname_target or subdomain.cname
-            try:
-                answers = dns.resolver.resolve(target, 'A')
-                results['target_resolves'] = True
-                results['verification_details'].append(f"Target {target} resolves to {len(answers)} IPs")
-            except dns.resolver.NXDOMAIN:
-                results['is_dangling'] = True
-                results['takeover_confidence'] += 50
-                results['verification_details'].append(f"CRITICAL: Target {target} returns NXDOMAIN")
-            except dns.resolver.NoAnswer:
-                results['is_dangling'] = True
-                results['takeover_confidence'] += 40
-                results['verification_details'].append(f"WARNING: Target {target} has no A records")
-            except Exception as e:
-                results['verification_details'].append(f"DNS error for {target}: {str(e)}")
+                # Check if final CNAME target resolves
+                try:
+                    answers = self._resolve_cached(target, 'A')
+                    results['target_resolves'] = True
+                    results['verification_details'].append(f"Target {target} resolves to {len(answers)} IPs")
+                except dns.resolver.NXDOMAIN:
+                    results['is_dangling'] = True
+                    results['takeover_confidence'] += 50
+                    results['verification_details'].append(f"CRITICAL: Target {target} returns NXDOMAIN")
+                except dns.resolver.NoAnswer:
+                    results['is_dangling'] = True
+                    results['takeover_confidence'] += 40
+                    results['verification_details'].append(f"WARNING: Target {target} has no A records")
+                except Exception as e:
+                    results['verification_details'].append(f"DNS error for {target}: {str(e)}")
 
             # Check each hop in CNAME chain for vulnerable patterns
             for hop in subdomain.cname_chain:
                 hop_normalized = hop.rstrip('.').lower()
 
-                # Vulnerable service patterns
-                vulnerable_patterns = {
-                    'shopify': ['myshopify.com', 'shopify.com'],
-                    'azure': ['azurewebsites.net', 'cloudapp.azure.com', 'cloudapp.net'],
-                    'heroku': ['herokuapp.com', 'herokudns.com'],
-                    'aws': ['amazonaws.com', 's3.amazonaws.com', 'elasticbeanstalk.com'],
-                    'github': ['github.io'],
-                    'netlify': ['netlify.app', 'netlify.com'],
-                    'pantheon': ['pantheonsite.io'],
-                    'readme': ['readme.io'],
-                    'zendesk': ['zendesk.com'],
-                    'helpscout': ['helpscoutdocs.com'],
-                    'fastly': ['fastly.net'],
-                    'cloudfront': ['cloudfront.net'],
-                    'bitbucket': ['bitbucket.io'],
-                    'surge': ['surge.sh'],
-                    'tumblr': ['tumblr.com'],
-                    'wordpress': ['wordpress.com'],
-                    'ghost': ['ghost.io'],
-                    'smugmug': ['smugmug.com'],
-                    'cargo': ['cargocollective.com'],
-                    'statuspage': ['statuspage.io'],
-                    'uservoice': ['uservoice.com'],
-                    'getresponse': ['getresponse.com'],
-                    'vend': ['vendhq.com'],
-                    'jetbrains': ['myjetbrains.com'],
-                    'brightcove': ['bcvp0rtal.com', 'brightcovegallery.com'],
-                    'bigcartel': ['bigcartel.com'],
-                    'campaignmonitor': ['createsend.com'],
-                    'acquia': ['acquia.com']
-                }
-
-                for service, patterns in vulnerable_patterns.items():
-                    if any(pattern in hop_normalized for pattern in patterns):
-                        results['vulnerable_pattern'] = service
-                        results['takeover_confidence'] += 30
-                        results['verification_details'].append(f"VULNERABLE: Found {service} pattern in {hop}")
-                        break
+                service = _match_vulnerable_service(hop_normalized)
+                if service:
+                    results['vulnerable_pattern'] = service
+                    results['takeover_confidence'] += 30
+                    results['verification_details'].append(f"VULNERABLE: Found {service} pattern in {hop}")
 
         except ImportError:
             results['verification_details'].append("dnspython not available for deep verification")
@@ -5,12 +5,43 @@ Detects wildcard DNS configurations that create massive false positives.
 This was completely missing from the original implementation.
 """
 import logging
-import random
-import string
-from typing import List, Set, Dict
+import os
+import threading
+from pathlib import Path
+from typing import List, Set, Dict, Optional
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from ..models.subdomain import Subdomain
+from .dns_store import DNSStore
+
+# One resolver shared by every WildcardDetector, so resolv.conf is parsed once
+# per process rather than per detector; dnspython resolvers are safe to query
+# from the probe threads concurrently
+_probe_resolver = None
+_probe_resolver_lock = threading.Lock()
+
+
+def _get_probe_resolver(lifetime: float):
+    """
+    Return the shared probe resolver, creating it on first use
+
+    Args:
+        lifetime: Seconds a single probe lookup may take in total
+
+    Returns:
+        dns.resolver.Resolver
+    """
+    global _probe_resolver
+    if _probe_resolver is None:
+        with _probe_resolver_lock:
+            if _probe_resolver is None:
+                import dns.resolver
+                resolver = dns.resolver.Resolver()
+                resolver.timeout = lifetime
+                resolver.lifetime = lifetime
+                _probe_resolver = resolver
+    return _probe_resolver
 
 
 class WildcardDetector:
@@ -21,17 +52,53 @@ class WildcardDetector:
     This module is CRITICAL for accurate subdomain takeover detection.
     """
 
-    def __init__(self, num_tests: int = 15):
+    # Concurrent probe lookups across all parent domains being checked
+    PROBE_WORKERS = 64
+
+    # Random probes are expected to NXDOMAIN; don't let a slow nameserver
+    # hold a probe thread for dnspython's default 5s lifetime
+    PROBE_LIFETIME = 2.0
+
+    # Probes go out in waves: a first wave settles most domains, a second
+    # confirms "no wildcard", and only ambiguous domains get all num_tests
+    FIRST_WAVE = 3
+    CONFIRM_WAVE = 3
+
+    # Persistent cache expiry: wildcard results, and shorter for "no wildcard"
+    # so a newly added wildcard record is noticed sooner
+    CACHE_TTL = 3600
+    NEGATIVE_CACHE_TTL = 600
+
+    # Store keys are namespaced so cache_file can be shared with DNSValidator's
+    # hostname cache (hostnames never contain ':')
+    STORE_KEY_PREFIX = 'wildcard:'
+
+    def __init__(self, num_tests: int = 15, cache_file: Optional[Path] = None):
         """
         Initialize wildcard detector
 
         Args:
             num_tests: Number of random subdomains to test per domain (default: 15 for better accuracy)
+            cache_file: Optional SQLite file that persists detection results
+                        across runs (behind the in-memory cache)
         """
         self.num_tests = num_tests
         self.logger = logging.getLogger(__name__)
         self.wildcard_cache: Dict[str, Set[str]] = {}  # domain -> set of wildcard IPs
 
+        self._store: Optional[DNSStore] = None
+        if cache_file:
+            try:
+                self._store = DNSStore(cache_file)
+            except Exception as e:
+                self.logger.warning(f"Persistent wildcard cache disabled ({cache_file}): {str(e)}")
+
+    def close(self):
+        """Close the persistent wildcard cache, if one is open"""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
     def filter_wildcards(self, subdomains: List[Subdomain]) -> List[Subdomain]:
         """
         Filter out wildcard DNS matches from subdomain list
@@ -52,10 +119,13 @@ class WildcardDetector:
         for subdomain in subdomains:
             by_domain[subdomain.parent_domain].append(subdomain)
 
-        # Detect wildcards for each parent domain
+        # Detect wildcards for every parent domain up front, probing them all
+        # concurrently rather than one domain after another
+        wildcards = self._detect_wildcards(list(by_domain))
+
         filtered = []
         for parent_domain, subs in by_domain.items():
-            wildcard_ips = self._detect_wildcard(parent_domain)
+            wildcard_ips = wildcards[parent_domain]
 
             if wildcard_ips:
                 self.logger.info(f"Detected wildcard DNS for {parent_domain}: {wildcard_ips}")
@@ -91,37 +161,143 @@ class WildcardDetector:
         Returns:
             Set of IP addresses that wildcard DNS resolves to (empty if no wildcard)
         """
-        # Check cache first
-        if domain in self.wildcard_cache:
-            return self.wildcard_cache[domain]
+        return self._detect_wildcards([domain])[domain]
 
-        wildcard_ips = set()
+    def _detect_wildcards(self, domains: List[str]) -> Dict[str, Set[str]]:
+        """
+        Batch version of _detect_wildcard
 
-        # Generate random non-existent subdomains
-        for _ in range(self.num_tests):
-            random_subdomain = self._generate_random_subdomain(domain)
+        The probes of all uncached domains are independent lookups, so they
+        share one thread pool and detection costs about one resolver round
+        trip per PROBE_WORKERS probes instead of num_tests per domain. Probes
+        are sent in waves (see _probes_needed), so a clear wildcard or a clear
+        NXDOMAIN domain stops after 3-6 probes instead of num_tests.
 
-            # Try to resolve it
-            try:
-                import dns.resolver
-                answers = dns.resolver.resolve(random_subdomain, 'A')
-                ips = [str(rdata) for rdata in answers]
-                wildcard_ips.update(ips)
-            except dns.resolver.NXDOMAIN:
-                # Good - non-existent subdomain returns NXDOMAIN
-                pass
-            except:
-                # Other DNS errors, ignore
-                pass
-
-        # If multiple random subdomains resolve to the same IPs, it's a wildcard
-        if len(wildcard_ips) > 0:
-            self.wildcard_cache[domain] = wildcard_ips
-            return wildcard_ips
-
-        # No wildcard detected
-        self.wildcard_cache[domain] = set()
-        return set()
+        Args:
+            domains: Parent domains to check
+
+        Returns:
+            Dict of domain -> wildcard IPs (empty set if no wildcard)
+        """
+        pending = [domain for domain in dict.fromkeys(domains) if domain not in self.wildcard_cache]
+        if pending and self._store is not None:
+            pending = self._load_stored(pending)
+
+        if pending:
+            answers: Dict[str, List[List[str]]] = {domain: [] for domain in pending}
+            workers = max(1, min(self.PROBE_WORKERS, len(pending) * self.num_tests))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                wave = {domain: min(self.FIRST_WAVE, self.num_tests) for domain in pending}
+                while wave:
+                    # Random non-existent subdomains for every domain in this wave
+                    probes = [
+                        (domain, self._generate_random_subdomain(domain))
+                        for domain, count in wave.items()
+                        for _ in range(count)
+                    ]
+                    for (domain, _), ips in zip(probes, executor.map(self._resolve_probe, [p for _, p in probes])):
+                        answers[domain].append(ips)
+
+                    wave = {}
+                    for domain in pending:
+                        needed = self._probes_needed(answers[domain])
+                        if needed:
+                            wave[domain] = needed
+
+            # Any random subdomain resolving means a wildcard; an empty set
+            # caches "no wildcard"
+            for domain in pending:
+                self.wildcard_cache[domain] = set().union(*answers[domain])
+
+            if self._store is not None:
+                self._save_stored({domain: self.wildcard_cache[domain] for domain in pending})
+
+        return {domain: self.wildcard_cache[domain] for domain in domains}
+
+    def _probes_needed(self, answers: List[List[str]]) -> int:
+        """
+        Decide how many more probes a domain needs after a wave
+
+        Two probes resolving to the same IP set is a settled wildcard; a
+        first and confirmation wave that all fail to resolve is settled as no
+        wildcard. Anything else gets the rest of num_tests.
+
+        Args:
+            answers: IPs returned by each probe sent so far
+
+        Returns:
+            Number of probes to send in the next wave (0 if settled)
+        """
+        remaining = self.num_tests - len(answers)
+        if remaining <= 0:
+            return 0
+
+        resolved = [frozenset(ips) for ips in answers if ips]
+        if len(set(resolved)) < len(resolved):
+            return 0
+
+        if not resolved:
+            if len(answers) >= self.FIRST_WAVE + self.CONFIRM_WAVE:
+                return 0
+            return min(self.CONFIRM_WAVE, remaining)
+
+        return remaining
+
+    def _load_stored(self, domains: List[str]) -> List[str]:
+        """
+        Serve domains from the persistent cache into wildcard_cache
+
+        Returns:
+            Domains the store had no fresh entry for
+        """
+        keys = {self.STORE_KEY_PREFIX + domain: domain for domain in domains}
+
+        try:
+            stored = self._store.get_many(keys)
+        except Exception as e:
+            self.logger.warning(f"Persistent wildcard cache lookup failed: {str(e)}")
+            return domains
+
+        for key, (_, fields) in stored.items():
+            ips = fields.get('ips') if isinstance(fields, dict) else None
+            # Rows not written by _save_stored are ignored and re-probed
+            if isinstance(ips, list):
+                self.wildcard_cache[keys[key]] = set(ips)
+
+        return [domain for domain in domains if domain not in self.wildcard_cache]
+
+    def _save_stored(self, results: Dict[str, Set[str]]):
+        """Write fresh detection results to the persistent cache"""
+        prefix = self.STORE_KEY_PREFIX
+        wildcard = {prefix + domain: {'ips': sorted(ips)} for domain, ips in results.items() if ips}
+        no_wildcard = {prefix + domain: {'ips': []} for domain, ips in results.items() if not ips}
+
+        try:
+            if wildcard:
+                self._store.put_many(wildcard, self.CACHE_TTL)
+            if no_wildcard:
+                self._store.put_many(no_wildcard, self.NEGATIVE_CACHE_TTL)
+        except Exception as e:
+            self.logger.warning(f"Persistent wildcard cache write failed: {str(e)}")
+
+    def _resolve_probe(self, hostname: str) -> List[str]:
+        """
+        Resolve a random probe subdomain
+
+        Args:
+            hostname: Probe hostname
+
+        Returns:
+            A record IPs (empty if it doesn't resolve)
+        """
+        try:
+            answers = _get_probe_resolver(self.PROBE_LIFETIME).resolve(hostname, 'A')
+            return [str(rdata) for rdata in answers]
+        except Exception:
+            # NXDOMAIN is the expected (non-wildcard) answer; other DNS
+            # errors are ignored as well
+            return []
 
     def _generate_random_subdomain(self, domain: str) -> str:
         """
@@ -131,10 +307,9 @@ class WildcardDetector:
             domain: Parent domain
 
         Returns:
-            Random subdomain like "xkqp7z2m.example.com"
+            Random subdomain like "3f9a0c7be214.example.com"
         """
-        random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=12))
-        return f"{random_str}.{domain}"
+        return f"{os.urandom(6).hex()}.{domain}"
 
     def _is_wildcard_match(self, subdomain: Subdomain, wildcard_ips: Set[str]) -> bool:
         """
@@ -150,10 +325,10 @@ class WildcardDetector:
         if not subdomain.a_records:
             return False
 
-        # Check if any of the subdomain's IPs match wildcard IPs
-        subdomain_ips = set(subdomain.a_records)
-        return len(subdomain_ips.intersection(wildcard_ips)) > 0
+        # isdisjoint walks a_records directly and stops at the first wildcard
+        # IP, so no per-subdomain set is built
+        return not wildcard_ips.isdisjoint(subdomain.a_records)
 
     def clear_cache(self):
-        """Clear wildcard detection cache"""
+        """Clear wildcard detection cache (in-memory; the persistent cache expires on its own)"""
         self.wildcard_cache.clear()
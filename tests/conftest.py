@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the scanner as the `src` package, the same way scan.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
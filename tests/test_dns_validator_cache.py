@@ -0,0 +1,109 @@
+from pathlib import Path
+
+from src.config import Config
+from src.models.subdomain import Subdomain
+from src.validation.dns_store import DNSStore
+from src.validation.dns_validator import DNSValidator
+
+RESOLVING = {
+    'shop.example.com': {'cname': 'shops.myshopify.com', 'a_records': ['23.227.38.65']},
+    'www.example.com': {'cname': None, 'a_records': ['93.184.216.34']},
+}
+
+
+class FakeResolution:
+    """Stands in for dnsx: resolves RESOLVING, everything else fails"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, subdomains, chunk_size):
+        self.calls.append(sorted(s.subdomain for s in subdomains))
+        validated = []
+        for subdomain in subdomains:
+            answer = RESOLVING.get(subdomain.subdomain)
+            if answer is None:
+                continue
+            subdomain.cname = answer['cname']
+            subdomain.a_records = list(answer['a_records'])
+            subdomain.dns_resolved = True
+            validated.append(subdomain)
+        return validated
+
+
+def make_subdomains():
+    return [
+        Subdomain(subdomain=name, parent_domain='example.com')
+        for name in ('shop.example.com', 'www.example.com', 'gone.example.com')
+    ]
+
+
+def make_validator(monkeypatch, cache_file=None):
+    validator = DNSValidator(dnsx_path=Path('/nonexistent/dnsx'), cache_file=cache_file)
+    resolution = FakeResolution()
+    monkeypatch.setattr(validator, '_validate_uncached', resolution)
+    return validator, resolution
+
+
+def summarize(subdomains):
+    return sorted((s.subdomain, s.cname, tuple(s.a_records), s.dns_resolved) for s in subdomains)
+
+
+def test_persistent_cache_matches_uncached_results(tmp_path, monkeypatch):
+    cache_file = tmp_path / 'dns_cache.sqlite3'
+
+    uncached, _ = make_validator(monkeypatch)
+    expected = summarize(uncached.validate_batch(make_subdomains()))
+
+    first, first_resolution = make_validator(monkeypatch, cache_file)
+    assert summarize(first.validate_batch(make_subdomains())) == expected
+    first.close()
+
+    # A new validator (next run) is served entirely from the store, including
+    # the hostname that didn't resolve
+    second, second_resolution = make_validator(monkeypatch, cache_file)
+    assert summarize(second.validate_batch(make_subdomains())) == expected
+    assert second_resolution.calls == []
+    second.close()
+
+    assert len(first_resolution.calls) == 1
+
+
+def test_close_is_idempotent_and_disables_store(tmp_path, monkeypatch):
+    validator, _ = make_validator(monkeypatch, tmp_path / 'dns_cache.sqlite3')
+    validator.close()
+    validator.close()
+
+    assert len(validator.validate_batch(make_subdomains())) == 2
+
+
+def test_store_round_trip_and_expiry(tmp_path):
+    store = DNSStore(tmp_path / 'store.sqlite3')
+    store.put_many({'a.example.com': {'a_records': ['192.0.2.1']}, 'b.example.com': None}, ttl=60)
+    store.put_many({'old.example.com': {'a_records': []}}, ttl=-1)
+
+    found = store.get_many(['a.example.com', 'b.example.com', 'old.example.com', 'c.example.com'])
+    store.close()
+
+    assert {host: fields for host, (_, fields) in found.items()} == {
+        'a.example.com': {'a_records': ['192.0.2.1']},
+        'b.example.com': None,
+    }
+
+
+def test_cache_paths_resolve_against_project_root(tmp_path, monkeypatch):
+    config = Config()
+    monkeypatch.chdir(tmp_path)
+
+    config.config.setdefault('tools', {}).setdefault('dnsx', {})['cache_file'] = 'output/cache/dns.sqlite3'
+    assert config.get_path('tools.dnsx.cache_file') == Config.PROJECT_ROOT / 'output' / 'cache' / 'dns.sqlite3'
+
+    config.config['tools']['dnsx']['cache_file'] = str(tmp_path / 'dns.sqlite3')
+    assert config.get_path('tools.dnsx.cache_file') == tmp_path / 'dns.sqlite3'
+
+    config.config['tools']['dnsx']['cache_file'] = ''
+    assert config.get_path('tools.dnsx.cache_file') is None
+
+
+def test_persistent_dns_cache_is_opt_in():
+    assert Config().get_path('tools.dnsx.cache_file') is None
@@ -0,0 +1,127 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+dns_resolver = pytest.importorskip('dns.resolver')
+
+from src.models.subdomain import Subdomain
+from src.validation.dns_validator import DNSValidator
+
+# CNAME records and A records of a fake zone; anything else is NXDOMAIN
+CNAMES = {
+    'shop.example.com': 'shops.myshopify.com',
+    'blog.example.com': 'example.ghost.io',
+    'example.ghost.io': 'ghost-lb.example.net',
+    'old.example.com': 'removed-app.herokuapp.com',   # dangling
+    'docs.example.com': 'gone.readthedocs.io',        # dangling
+}
+A_RECORDS = {
+    'shops.myshopify.com': ['23.227.38.65'],
+    'ghost-lb.example.net': ['178.128.137.126'],
+    'www.example.com': ['93.184.216.34'],
+}
+
+
+class FakeAnswer(list):
+    def __init__(self, items, chaining_result=None):
+        super().__init__(items)
+        self.rrset = SimpleNamespace(ttl=300)
+        if chaining_result is not None:
+            self.chaining_result = chaining_result
+
+
+def fake_resolve(name, rdtype, chaining=True):
+    name = name.rstrip('.')
+    if rdtype == 'CNAME':
+        if name in CNAMES:
+            return FakeAnswer([SimpleNamespace(target=CNAMES[name] + '.')])
+        if name in A_RECORDS:
+            raise dns_resolver.NoAnswer()
+        raise dns_resolver.NXDOMAIN()
+
+    # Follow the chain like a recursive resolver would
+    cnames = []
+    current = name
+    while current in CNAMES:
+        cnames.append([SimpleNamespace(target=CNAMES[current] + '.')])
+        current = CNAMES[current]
+    if current not in A_RECORDS:
+        raise dns_resolver.NXDOMAIN()
+    if rdtype != 'A':
+        raise dns_resolver.NoAnswer()
+    chaining_result = SimpleNamespace(cnames=cnames) if chaining else None
+    return FakeAnswer(A_RECORDS[current], chaining_result)
+
+
+def baseline_fallback(subdomains):
+    """The original fallback: A lookup, then always a full CNAME walk"""
+    validated = []
+    for subdomain in subdomains:
+        try:
+            subdomain.a_records = list(fake_resolve(subdomain.subdomain, 'A'))
+            subdomain.dns_resolved = True
+        except dns_resolver.NXDOMAIN:
+            subdomain.nxdomain = True
+        except dns_resolver.NoAnswer:
+            pass
+
+        chain = []
+        current = subdomain.subdomain
+        for _ in range(10):
+            try:
+                current = str(fake_resolve(current, 'CNAME')[0].target).rstrip('.')
+                chain.append(current)
+            except dns_resolver.NoAnswer:
+                break
+            except dns_resolver.NXDOMAIN:
+                subdomain.nxdomain = True
+                break
+        if chain:
+            subdomain.cname = chain[0]
+            subdomain.final_cname_target = chain[-1]
+            subdomain.cname_chain = chain
+
+        if subdomain.dns_resolved or subdomain.cname:
+            validated.append(subdomain)
+    return validated
+
+
+def make_subdomains():
+    names = ['shop', 'blog', 'old', 'docs', 'www', 'nothing', 'also-nothing']
+    return [Subdomain(subdomain=f'{name}.example.com', parent_domain='example.com') for name in names]
+
+
+def summarize(subdomains):
+    return sorted(
+        (s.subdomain, s.nxdomain, s.cname, s.final_cname_target, tuple(s.cname_chain or ()), tuple(s.a_records))
+        for s in subdomains
+    )
+
+
+@pytest.mark.parametrize('chaining', [True, False])
+def test_fallback_matches_baseline(monkeypatch, chaining):
+    monkeypatch.setattr(dns_resolver, 'resolve', lambda name, rdtype: fake_resolve(name, rdtype, chaining))
+
+    expected = summarize(baseline_fallback(make_subdomains()))
+    validator = DNSValidator(dnsx_path=Path('/nonexistent/dnsx'))
+    assert summarize(validator._fallback_validation(make_subdomains())) == expected
+
+
+def test_dangling_cname_is_validated_and_nxdomain_short_circuits(monkeypatch):
+    queries = []
+
+    def recording_resolve(name, rdtype):
+        queries.append((name, rdtype))
+        return fake_resolve(name, rdtype)
+
+    monkeypatch.setattr(dns_resolver, 'resolve', recording_resolve)
+    validator = DNSValidator(dnsx_path=Path('/nonexistent/dnsx'))
+
+    dangling = Subdomain(subdomain='old.example.com', parent_domain='example.com')
+    assert validator._fallback_resolve(dangling)
+    assert dangling.nxdomain and dangling.cname == 'removed-app.herokuapp.com'
+
+    missing = Subdomain(subdomain='nothing.example.com', parent_domain='example.com')
+    assert not validator._fallback_resolve(missing)
+    assert [rdtype for name, rdtype in queries if name == 'nothing.example.com'] == ['A', 'CNAME']
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from src.collection.domain_collector import DomainCollector
+
+
+def test_myleadfox_domains_sorted_and_deduplicated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / 'data' / 'domain_sources' / 'myleadfox'
+    source_dir.mkdir(parents=True)
+    (source_dir / 'b.csv').write_text('Name,Website\nx,zeta.com\ny,"alpha.com"\n')
+    (source_dir / 'a.csv').write_text('Name,Website\nz,mid.com\nw,zeta.com\nv,\n')
+
+    domains = DomainCollector(cache_dir=tmp_path / 'cache').collect_myleadfox_domains()
+
+    # scan.py resumes by row number, so the order must not depend on file
+    # or row order
+    assert domains == ['alpha.com', 'mid.com', 'zeta.com']
+
+
+def test_tranco_cache_round_trips_as_csv(tmp_path):
+    collector = DomainCollector(cache_dir=tmp_path)
+    domains = [
+        {'rank': 1, 'domain': 'google.com', 'authority_score': 100},
+        {'rank': 2, 'domain': 'youtube.com', 'authority_score': 97},
+    ]
+
+    collector._write_tranco_cache(2, domains)
+
+    assert (tmp_path / 'tranco_top2.csv').read_text() == '1,google.com,100\n2,youtube.com,97\n'
+    assert collector._read_tranco_cache(2) == domains
+    assert collector._read_tranco_cache(5) is None
@@ -0,0 +1,56 @@
+import json
+import threading
+
+from src.models.subdomain import Subdomain
+from src.pipeline import http_validator
+from src.pipeline.http_validator import HTTPValidator
+
+
+def make_validator(tmp_path, threads):
+    binary = tmp_path / 'httpx'
+    binary.write_text('#!/bin/sh\n')
+    binary.chmod(0o755)
+    return HTTPValidator(binary_path=binary, threads=threads)
+
+
+def test_shards_split_the_thread_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_validator.os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(HTTPValidator, 'SHARD_SIZE', 5)
+
+    validator = make_validator(tmp_path, threads=100)
+    runs = []
+    lock = threading.Lock()
+
+    def fake_httpx(args, input_data=None, timeout=300):
+        hosts = input_data.split()
+        with lock:
+            runs.append((int(args[args.index('-t') + 1]), hosts))
+        for host in hosts:
+            yield json.dumps({'host': host, 'url': f'https://{host}', 'status_code': 404}).encode() + b'\n'
+
+    monkeypatch.setattr(validator, 'run_command_streaming', fake_httpx)
+
+    subdomains = [Subdomain(subdomain=f'h{i}.example.com', parent_domain='example.com') for i in range(40)]
+    validated = validator.validate_batch(subdomains)
+
+    assert len(runs) == 4
+    assert sum(threads for threads, _ in runs) <= 100
+    assert all(threads == 25 for threads, _ in runs)
+
+    probed = [host for _, hosts in runs for host in hosts]
+    assert sorted(probed) == sorted(s.subdomain for s in subdomains)
+    assert all(s.http_status == 404 for s in validated)
+
+
+def test_single_process_uses_full_thread_budget(tmp_path, monkeypatch):
+    validator = make_validator(tmp_path, threads=100)
+    runs = []
+
+    def fake_httpx(args, input_data=None, timeout=300):
+        runs.append(int(args[args.index('-t') + 1]))
+        return iter(())
+
+    monkeypatch.setattr(validator, 'run_command_streaming', fake_httpx)
+    validator.validate_batch([Subdomain(subdomain='a.example.com', parent_domain='example.com')])
+
+    assert runs == [100]
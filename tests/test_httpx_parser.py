@@ -0,0 +1,34 @@
+import pytest
+
+from src.parsers.httpx_parser import HTTPXParser
+
+BODIES = [
+    "<html><title>Shop</title><body>Only one step left! Claim this store</body></html>",
+    "<html><h1>Checking DNS records</h1><p>Add these new DNS records to verify</p></html>",
+    "<html><title>Welcome</title><form>Log in with your password</form></html>",
+    "<html><h1>404 Not Found</h1></html>",
+    "<html><body><p>Plain landing page</p></body></html>",
+]
+
+
+@pytest.mark.parametrize('status', [200, 204, 301, 403, 404, 500])
+@pytest.mark.parametrize('body', BODIES)
+def test_body_fields_match_full_scan(status, body):
+    parser = HTTPXParser()
+    body_lower = body.lower()
+
+    _, _, _, body_fields, _, _ = parser._entry_fields({'status_code': status, 'body': body})
+
+    assert body_fields == (
+        parser._extract_error_message(body, body_lower),
+        parser._detect_takeover_patterns(body_lower, status),
+    )
+
+
+def test_live_verification_page_keeps_snippet_and_label():
+    parser = HTTPXParser()
+
+    _, _, _, (snippet, evidence), _, _ = parser._entry_fields({'status_code': 200, 'body': BODIES[1]})
+
+    assert snippet == 'Checking DNS records'
+    assert evidence.startswith('FALSE POSITIVE - Verification page')
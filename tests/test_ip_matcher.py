@@ -0,0 +1,141 @@
+import ipaddress
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from src.identification.ip_matcher import IPMatcher
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / 'config'
+
+
+class LinearScanMatcher:
+    """The original IPMatcher lookup: first listed network containing the IP wins"""
+
+    def __init__(self, config_dir: Path):
+        self.ip_ranges = {}
+        ranges_dir = config_dir / 'ip_ranges'
+
+        for provider, filename, region_key in (
+            ('AWS', 'aws.json', 'region'),
+            ('GCP', 'gcp.json', 'scope'),
+            ('Azure', 'azure.json', 'region'),
+        ):
+            path = ranges_dir / filename
+            if path.exists():
+                data = json.loads(path.read_text())
+                self.ip_ranges[provider] = [
+                    (ipaddress.ip_network(p['ip_prefix']), p.get('service'), p.get(region_key))
+                    for p in data.get('ipv4_ranges', [])
+                ]
+
+        path = ranges_dir / 'shopify.json'
+        if path.exists():
+            data = json.loads(path.read_text())
+            self.ip_ranges['Shopify'] = [
+                (ipaddress.ip_network(cidr), 'Shopify', None)
+                for cidr in data.get('ipv4_ranges', []) + data.get('ipv6_ranges', [])
+            ]
+
+    def match_ip(self, ip_address: str):
+        try:
+            ip = ipaddress.ip_address(ip_address)
+        except ValueError:
+            return None
+
+        for provider, ranges in self.ip_ranges.items():
+            for network, service, region in ranges:
+                if ip in network:
+                    return {
+                        'provider': provider,
+                        'service': service,
+                        'region': region,
+                        'detection_method': 'ip_range',
+                        'ip_confirmed': True
+                    }
+
+        return None
+
+
+def probe_ips(networks, rng):
+    """Boundary and interior addresses of each network, plus their neighbours"""
+    for network in networks:
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+        address_class = ipaddress.IPv4Address if network.version == 4 else ipaddress.IPv6Address
+        for value in (first - 1, first, rng.randint(first, last), last, last + 1):
+            try:
+                yield str(address_class(value))
+            except ipaddress.AddressValueError:
+                continue
+
+
+def write_ranges(config_dir: Path, aws=(), shopify_v4=(), shopify_v6=()):
+    ranges_dir = config_dir / 'ip_ranges'
+    ranges_dir.mkdir(parents=True)
+    (ranges_dir / 'aws.json').write_text(json.dumps({
+        'ipv4_ranges': [
+            {'ip_prefix': prefix, 'service': service, 'region': region}
+            for prefix, service, region in aws
+        ]
+    }))
+    (ranges_dir / 'shopify.json').write_text(json.dumps({
+        'ipv4_ranges': list(shopify_v4),
+        'ipv6_ranges': list(shopify_v6),
+    }))
+
+
+def test_first_listed_network_wins(tmp_path):
+    write_ranges(tmp_path, aws=[
+        ('3.5.140.0/22', 'AMAZON', 'ap-northeast-2'),
+        ('3.5.142.0/24', 'EC2', 'ap-northeast-2'),       # nested, listed later
+        ('3.5.140.0/22', 'S3', 'ap-northeast-2'),        # duplicate, listed later
+        ('52.94.0.0/24', 'DYNAMODB', 'us-east-1'),
+        ('52.94.0.0/16', 'AMAZON', 'us-east-1'),         # broader, listed later
+        ('52.95.0.0/24', 'AMAZON', 'us-east-1'),         # adjacent, same metadata
+    ])
+    matcher = IPMatcher(tmp_path)
+
+    assert matcher.match_ip('3.5.142.10')['service'] == 'AMAZON'
+    assert matcher.match_ip('52.94.0.7')['service'] == 'DYNAMODB'
+    assert matcher.match_ip('52.94.1.7')['service'] == 'AMAZON'
+    assert matcher.match_ip('52.95.0.255')['service'] == 'AMAZON'
+    assert matcher.match_ip('52.96.0.0') is None
+    assert matcher.match_ip('not-an-ip') is None
+
+
+def test_synthetic_ranges_match_linear_scan(tmp_path):
+    rng = random.Random(7)
+    services = ['AMAZON', 'EC2', 'S3', 'CLOUDFRONT']
+    aws = []
+    for _ in range(300):
+        network = ipaddress.ip_network(f'10.{rng.randrange(4)}.{rng.randrange(256)}.0/{rng.randint(16, 28)}', strict=False)
+        aws.append((str(network), rng.choice(services), rng.choice(['us-east-1', 'eu-west-1'])))
+    write_ranges(
+        tmp_path,
+        aws=aws,
+        shopify_v4=['10.1.0.0/16', '23.227.38.0/23'],
+        shopify_v6=['2606:4700::/32', '2606:4700:10::/48'],
+    )
+
+    matcher = IPMatcher(tmp_path)
+    reference = LinearScanMatcher(tmp_path)
+    networks = [network for ranges in reference.ip_ranges.values() for network, _, _ in ranges]
+
+    for ip in probe_ips(networks, rng):
+        assert matcher.match_ip(ip) == reference.match_ip(ip), ip
+
+
+@pytest.mark.skipif(not (CONFIG_DIR / 'ip_ranges').exists(), reason='no bundled IP ranges')
+def test_bundled_ranges_match_linear_scan():
+    rng = random.Random(42)
+    matcher = IPMatcher(CONFIG_DIR)
+    reference = LinearScanMatcher(CONFIG_DIR)
+
+    networks = [network for ranges in reference.ip_ranges.values() for network, _, _ in ranges]
+    ips = list(probe_ips(rng.sample(networks, min(400, len(networks))), rng))
+    ips += [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(200)]
+
+    for ip in ips:
+        assert matcher.match_ip(ip) == reference.match_ip(ip), ip
@@ -0,0 +1,26 @@
+import logging
+import threading
+
+from src.orchestrator_v2 import _WarningsOnlyFilter, _batch_thread
+
+
+def record(level):
+    return logging.LogRecord('test', level, __file__, 1, 'message', None, None)
+
+
+def test_filter_only_mutes_batch_worker_threads():
+    quiet_filter = _WarningsOnlyFilter()
+    seen = {}
+
+    def batch_worker():
+        _batch_thread.quiet = True
+        seen['info'] = quiet_filter.filter(record(logging.INFO))
+        seen['warning'] = quiet_filter.filter(record(logging.WARNING))
+
+    worker = threading.Thread(target=batch_worker)
+    worker.start()
+    worker.join()
+
+    assert seen == {'info': False, 'warning': True}
+    # Other threads keep their INFO records
+    assert quiet_filter.filter(record(logging.INFO))
@@ -0,0 +1,27 @@
+from src.utils.progress_tracker import ProgressTracker
+
+
+def test_close_writes_queued_rows_without_summary(capsys):
+    tracker = ProgressTracker(total_domains=3, workers=1)
+    tracker.start()
+    tracker.update(subdomain='shop.example.com', http_status=404)
+    tracker.close()
+    tracker.close()
+
+    out = capsys.readouterr().out
+    assert 'shop.example.com' in out
+    assert 'SCAN COMPLETE' not in out
+    assert not tracker._writer.is_alive()
+
+
+def test_finish_is_idempotent(capsys):
+    tracker = ProgressTracker(total_domains=1, workers=1)
+    tracker.start()
+    tracker.update(subdomain='www.example.com', http_status=200)
+    tracker.finish()
+    tracker.finish()
+    tracker.close()
+
+    out = capsys.readouterr().out
+    assert out.count('SCAN COMPLETE') == 1
+    assert 'www.example.com' in out
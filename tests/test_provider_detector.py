@@ -0,0 +1,49 @@
+import json
+
+from src.identification.provider_detector import ProviderDetector
+from src.models.subdomain import Subdomain
+
+PROVIDERS_CONFIG = {
+    'providers': {
+        'shopify': {'name': 'Shopify', 'patterns': {'cname': [r'\.myshopify\.com$']}},
+        's3': {'name': 'Amazon S3', 'patterns': {'cname': [r's3.*\.amazonaws\.com$']}},
+    }
+}
+
+
+def make_detector(tmp_path):
+    ranges_dir = tmp_path / 'ip_ranges'
+    ranges_dir.mkdir()
+    (ranges_dir / 'aws.json').write_text(json.dumps({
+        'ipv4_ranges': [{'ip_prefix': '52.216.0.0/15', 'service': 'S3', 'region': 'us-east-1'}]
+    }))
+    (ranges_dir / 'shopify.json').write_text(json.dumps({'ipv4_ranges': ['23.227.38.0/23']}))
+    return ProviderDetector(tmp_path, PROVIDERS_CONFIG)
+
+
+def test_first_matching_a_record_decides_provider_over_cname(tmp_path):
+    detector = make_detector(tmp_path)
+    sub = Subdomain(
+        subdomain='shop.example.com',
+        parent_domain='example.com',
+        cname='shop.myshopify.com',
+        a_records=['52.216.1.1', '23.227.38.65'],
+    )
+
+    assert detector.detect_provider(sub) == 'AWS'
+    assert sub.provider_detection_method == 'ip_range'
+    assert sub.provider_service == 'S3'
+
+
+def test_cname_pattern_used_when_no_ip_matches(tmp_path):
+    detector = make_detector(tmp_path)
+    sub = Subdomain(
+        subdomain='shop.example.com',
+        parent_domain='example.com',
+        cname='shop.myshopify.com',
+        a_records=['198.51.100.7'],
+    )
+
+    assert detector.detect_provider(sub) == 'Shopify'
+    assert sub.provider_detection_method == 'cname_pattern'
+    assert sub.ip_confirmed is False
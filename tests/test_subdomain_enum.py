@@ -0,0 +1,26 @@
+from src.pipeline.subdomain_enum_v2 import MultiToolEnumerator, _PERMUTATION_WORDS
+
+KNOWN = {'example.com', 'shop.example.com', 'api.example.com', 'dev-example.com'}
+
+
+def test_permutations_are_off_by_default():
+    enumerator = MultiToolEnumerator()
+
+    assert enumerator._run_active_tools('example.com', KNOWN) == set()
+
+
+def test_permutations_when_enabled():
+    enumerator = MultiToolEnumerator(permutations=True)
+
+    found = enumerator._run_active_tools('example.com', KNOWN)
+
+    assert 'dev-shop.example.com' in found
+    assert 'api.staging.example.com' in found
+    assert all(name.endswith('.example.com') for name in found)
+    assert len(found) <= 2 * 4 * len(_PERMUTATION_WORDS)
+
+
+def test_permutations_are_capped():
+    enumerator = MultiToolEnumerator(permutations=True, max_permutations=50)
+
+    assert len(enumerator._run_alterx('example.com', KNOWN)) == 50
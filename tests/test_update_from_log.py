@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+import update_from_log
+
+EXISTING = [
+    {'subdomain': 'old.example.com', 'http_status': 404, 'provider': 'Shopify',
+     'cname': 'shops.myshopify.com', 'risk_level': 'high', 'confidence_score': 90},
+    {'subdomain': 'www.example.com', 'http_status': 200, 'provider': '-',
+     'cname': '', 'risk_level': 'low', 'confidence_score': 30},
+]
+
+LOG = [
+    "381.3s\t1318\tshop.example.org    404    Shopify    shops.myshopify.com\n",
+    "381.4s\t1319\twww.example.com    403    -    cdn.example.net\n",
+    "381.5s\t1320\tblog.example.net    403    Shopify    shops.myshopify.com  (2 hops)\n",
+    "Progress saved\n",
+    "381.6s\t1321\tshop.example.org    500    Shopify    shops.myshopify.com\n",
+]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_from_log, 'RESULTS_FILE', tmp_path / 'all_results.json')
+    monkeypatch.setattr(update_from_log, 'RESULTS_LOG_FILE', tmp_path / 'all_results.ndjson')
+    monkeypatch.setattr(update_from_log, 'PROGRESS_FILE', tmp_path / 'scan_progress.json')
+    (tmp_path / 'all_results.json').write_text(json.dumps(EXISTING))
+    return tmp_path
+
+
+def baseline_results(existing, lines):
+    """The original update: append unseen subdomains (first wins), then sort"""
+    results = list(existing)
+    seen = {r['subdomain'] for r in results}
+    for line in lines:
+        result, _ = update_from_log.parse_log_line(line)
+        if result and result['subdomain'] not in seen:
+            results.append(result)
+            seen.add(result['subdomain'])
+    results.sort(key=lambda x: (-x.get('authority_score', 0), -x['confidence_score'], x['subdomain']))
+    return results
+
+
+def test_run_appends_and_compact_matches_baseline(workdir):
+    stats = update_from_log.process_log(LOG[:2], jobs=1)
+    assert stats['new_entries'] == 1
+    stats = update_from_log.process_log(LOG[2:], jobs=1)
+    assert stats['new_entries'] == 1
+    assert stats['total_results'] == 4
+
+    # Runs below the threshold leave all_results.json alone
+    assert json.loads((workdir / 'all_results.json').read_text()) == EXISTING
+    assert json.loads((workdir / 'scan_progress.json').read_text())['last_row'] == 1321
+
+    assert update_from_log.compact_results() == 4
+    assert json.loads((workdir / 'all_results.json').read_text()) == baseline_results(EXISTING, LOG)
+    assert not (workdir / 'all_results.ndjson').exists()
+
+
+def test_large_sidecar_is_compacted_by_the_run(workdir, monkeypatch):
+    monkeypatch.setattr(update_from_log, 'COMPACT_THRESHOLD_BYTES', 1)
+
+    update_from_log.process_log(LOG, jobs=1)
+
+    assert json.loads((workdir / 'all_results.json').read_text()) == baseline_results(EXISTING, LOG)
+    assert not (workdir / 'all_results.ndjson').exists()
+
+
+def test_scan_skips_subdomains_already_in_sidecar(workdir):
+    scan = pytest.importorskip('scan')
+    update_from_log.process_log(LOG, jobs=1)
+    results_file = workdir / 'all_results.json'
+
+    assert not scan.save_result_to_all_results({'subdomain': 'shop.example.org'}, results_file)
+    assert scan.save_result_to_all_results({'subdomain': 'new.example.org', 'confidence_score': 60}, results_file)
+    assert update_from_log.compact_results() == 5
+
+
+def test_dry_run_writes_nothing(workdir):
+    update_from_log.process_log(LOG, dry_run=True, jobs=1)
+
+    assert json.loads((workdir / 'all_results.json').read_text()) == EXISTING
+    assert not (workdir / 'all_results.ndjson').exists()
+    assert not (workdir / 'scan_progress.json').exists()
@@ -0,0 +1,90 @@
+from src.config import Config
+from src.models.subdomain import Subdomain
+from src.validation.dns_store import DNSStore
+from src.validation.wildcard_detector import WildcardDetector
+
+# Parent domains whose random probes resolve (wildcard DNS)
+WILDCARDS = {'wild.example': ['198.51.100.7']}
+
+
+class FakeProbes:
+    """Stands in for the probe resolver: wildcard domains answer every name"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, hostname):
+        self.calls.append(hostname)
+        return list(WILDCARDS.get(hostname.split('.', 1)[1], []))
+
+
+def make_detector(monkeypatch, cache_file=None):
+    detector = WildcardDetector(num_tests=5, cache_file=cache_file)
+    probes = FakeProbes()
+    monkeypatch.setattr(detector, '_resolve_probe', probes)
+    return detector, probes
+
+
+def make_subdomains():
+    return [
+        Subdomain(subdomain='a.wild.example', parent_domain='wild.example', a_records=['198.51.100.7']),
+        Subdomain(subdomain='b.wild.example', parent_domain='wild.example', a_records=['203.0.113.9']),
+        Subdomain(subdomain='www.tame.example', parent_domain='tame.example', a_records=['198.51.100.7']),
+    ]
+
+
+def test_persistent_cache_matches_uncached_results(tmp_path, monkeypatch):
+    cache_file = tmp_path / 'wildcard_cache.sqlite3'
+
+    uncached, _ = make_detector(monkeypatch)
+    expected = [s.subdomain for s in uncached.filter_wildcards(make_subdomains())]
+    assert expected == ['b.wild.example', 'www.tame.example']
+
+    first, first_probes = make_detector(monkeypatch, cache_file)
+    assert [s.subdomain for s in first.filter_wildcards(make_subdomains())] == expected
+    first.close()
+    assert first_probes.calls
+
+    # The next run is answered from the store, "no wildcard" included
+    second, second_probes = make_detector(monkeypatch, cache_file)
+    assert [s.subdomain for s in second.filter_wildcards(make_subdomains())] == expected
+    assert second_probes.calls == []
+    second.close()
+
+
+def test_close_is_idempotent_and_disables_store(tmp_path, monkeypatch):
+    detector, probes = make_detector(monkeypatch, tmp_path / 'wildcard_cache.sqlite3')
+    detector.close()
+    detector.close()
+
+    assert detector._detect_wildcard('wild.example') == {'198.51.100.7'}
+    assert probes.calls
+
+
+def test_cache_file_shared_with_dns_cache(tmp_path, monkeypatch):
+    cache_file = tmp_path / 'cache.sqlite3'
+    store = DNSStore(cache_file)
+    # DNSValidator rows for the parent domains, plus a malformed wildcard row
+    store.put_many({'wild.example': {'a_records': ['192.0.2.1']}, 'tame.example': None}, ttl=60)
+    store.put_many({'wildcard:tame.example': {'a_records': []}}, ttl=60)
+    store.close()
+
+    detector, probes = make_detector(monkeypatch, cache_file)
+    assert [s.subdomain for s in detector.filter_wildcards(make_subdomains())] == [
+        'b.wild.example', 'www.tame.example'
+    ]
+    assert {probe.split('.', 1)[1] for probe in probes.calls} == {'wild.example', 'tame.example'}
+    detector.close()
+
+    # The hostname rows are left as DNSValidator wrote them
+    store = DNSStore(cache_file)
+    found = store.get_many(['wild.example', 'tame.example'])
+    store.close()
+    assert {host: fields for host, (_, fields) in found.items()} == {
+        'wild.example': {'a_records': ['192.0.2.1']},
+        'tame.example': None,
+    }
+
+
+def test_persistent_wildcard_cache_is_opt_in():
+    assert Config().get_path('pipeline.wildcard_cache_file') is None
@@ -7,23 +7,79 @@ Usage:
     2. Run: python update_from_log.py < paste_log.txt
        Or:  python update_from_log.py --file kaggle_output.txt
        Or:  python update_from_log.py --paste  (reads from stdin until EOF)
+    3. Optionally: python update_from_log.py --compact  (fold new entries into all_results.json)
 
 The script will:
     - Parse scan results from the log (handles Kaggle timestamp format)
-    - Merge new entries into all_results.json (avoiding duplicates)
+    - Append new entries to all_results.ndjson (avoiding duplicates); --compact,
+      or a sidecar past COMPACT_THRESHOLD_BYTES, merges them into the sorted
+      all_results.json. scan.py checks the sidecar for duplicates, so a scan
+      can run before compaction
     - Update scan_progress.json with the latest row number
 """
+import os
 import sys
 import json
 import re
 import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 from datetime import datetime
+from typing import Iterable, Iterator
+
+# orjson reads and writes the results file several times faster than the
+# stdlib; its JSONDecodeError subclasses json.JSONDecodeError so handlers
+# still match
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, indent: bool = True) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent: bool = True) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+# ijson streams just the subdomain of each entry out of all_results.json, so
+# a normal run never holds the whole results tree in memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 RESULTS_FILE = Path("all_results.json")
+# Append-only sidecar for entries added since the last --compact
+RESULTS_LOG_FILE = Path("all_results.ndjson")
 PROGRESS_FILE = Path("scan_progress.json")
 
+# Sidecar size at which a run compacts on its own, so it can't grow unbounded
+COMPACT_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+# Non-data lines (tool output, banners, table headers)
+SKIP_PATTERNS = [
+    'complete |', 'Rate:', 'go: downloading', 'github.com/',
+    'Cloning', 'Building', 'Installing', 'Downloading',
+    'RESUME MODE', 'Skipping', 'Remaining:', 'Starting',
+    'Progress saved', 'All domains', 'Found ', 'Saved to',
+    'Error', 'Warning', 'Debugger', 'SUBDOMAIN', '====',
+    'total ', 'drwx', '-rw-', 'Shopify takeover'
+]
+
+# Lines per parse job; inputs that fit in one chunk are parsed in-process
+PARSE_CHUNK_LINES = 50_000
+
+# Compiled once: parse_log_line runs on every line of the log
+_SKIP_RE = re.compile('|'.join(re.escape(p) for p in SKIP_PATTERNS))
+_KAGGLE_RE = re.compile(r'^(\d+\.\d+)s\s+(\d+)\s+')
+_SPLIT_RE = re.compile(r'\s{2,}')
+_HOPS_RE = re.compile(r'\s*(\(\d+\s*hops?\))')
+
 
 def calculate_risk_and_confidence(http_status: int, provider: str, cname: str) -> tuple:
     """Calculate risk level and confidence score."""
@@ -51,22 +107,13 @@ def parse_log_line(line: str) -> tuple[dict | None, int | None]:
         return None, None
 
     # Skip non-data lines
-    skip_patterns = [
-        'complete |', 'Rate:', 'go: downloading', 'github.com/',
-        'Cloning', 'Building', 'Installing', 'Downloading',
-        'RESUME MODE', 'Skipping', 'Remaining:', 'Starting',
-        'Progress saved', 'All domains', 'Found ', 'Saved to',
-        'Error', 'Warning', 'Debugger', 'SUBDOMAIN', '====',
-        'total ', 'drwx', '-rw-', 'Shopify takeover'
-    ]
-    for pattern in skip_patterns:
-        if pattern in line:
-            return None, None
+    if _SKIP_RE.search(line):
+        return None, None
 
     # Extract Kaggle timestamp and row number if present
     # Format: "381.3s	1318	subdomain.com    403    Shopify    ..."
     row_number = None
-    kaggle_match = re.match(r'^(\d+\.\d+)s\s+(\d+)\s+', line)
+    kaggle_match = _KAGGLE_RE.match(line)
     if kaggle_match:
         row_number = int(kaggle_match.group(2))
         line = line[kaggle_match.end():]
@@ -76,7 +123,7 @@ def parse_log_line(line: str) -> tuple[dict | None, int | None]:
         return None, row_number
 
     # Split by multiple spaces (table format)
-    parts = re.split(r'\s{2,}', line.strip())
+    parts = _SPLIT_RE.split(line.strip())
 
     if len(parts) < 4:
         return None, row_number
@@ -100,10 +147,10 @@ def parse_log_line(line: str) -> tuple[dict | None, int | None]:
     cname = cname_raw.replace("..", "")
 
     # Extract hops info
-    hops_match = re.search(r'\((\d+)\s*hops?\)', cname)
+    hops_match = _HOPS_RE.search(cname)
     if hops_match:
-        hops = hops_match.group(0)
-        cname_clean = re.sub(r'\s*\(\d+\s*hops?\)', '', cname).strip()
+        hops = hops_match.group(1)
+        cname_clean = _HOPS_RE.sub('', cname).strip()
         cname = f"{cname_clean} {hops}"
 
     risk_level, confidence_score = calculate_risk_and_confidence(http_status, provider, cname)
@@ -118,33 +165,97 @@ def parse_log_line(line: str) -> tuple[dict | None, int | None]:
     }, row_number
 
 
+def _iter_appended_results():
+    """Yield entries from the NDJSON sidecar, skipping a torn last line."""
+    if not RESULTS_LOG_FILE.exists():
+        return
+
+    with open(RESULTS_LOG_FILE, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield _json_loads(line)
+            except json.JSONDecodeError:
+                # Partial line from an interrupted append
+                continue
+
+
 def load_existing_results() -> tuple[list, set]:
-    """Load existing results and return (results_list, subdomains_set)."""
+    """Load existing results (base file plus appended entries) and return (results_list, subdomains_set)."""
     results = []
-    subdomains = set()
 
     if RESULTS_FILE.exists():
         try:
-            with open(RESULTS_FILE, 'r') as f:
-                results = json.load(f)
-                subdomains = {r['subdomain'] for r in results}
+            results = _json_loads(RESULTS_FILE.read_bytes())
         except (json.JSONDecodeError, IOError):
             pass
 
+    results.extend(_iter_appended_results())
+    subdomains = {r['subdomain'] for r in results}
+
     return results, subdomains
 
 
+def load_existing_subdomains() -> tuple[int, set]:
+    """
+    Load only what a log update needs: the result count and subdomains set.
+
+    With ijson installed the base file is streamed, keeping memory at the
+    size of the subdomains set instead of the full results tree.
+
+    Returns:
+        tuple: (number of existing results, subdomains_set)
+    """
+    if ijson is None:
+        results, subdomains = load_existing_results()
+        return len(results), subdomains
+
+    count = 0
+    subdomains = set()
+
+    if RESULTS_FILE.exists():
+        try:
+            with open(RESULTS_FILE, 'rb') as f:
+                for subdomain in ijson.items(f, 'item.subdomain'):
+                    count += 1
+                    subdomains.add(subdomain)
+        except (ijson.JSONError, IOError):
+            # Same as a corrupt file in load_existing_results: start empty
+            count = 0
+            subdomains = set()
+
+    for entry in _iter_appended_results():
+        count += 1
+        subdomains.add(entry['subdomain'])
+
+    return count, subdomains
+
+
 def load_progress() -> dict:
     """Load current progress."""
     if PROGRESS_FILE.exists():
         try:
-            with open(PROGRESS_FILE, 'r') as f:
-                return json.load(f)
+            return _json_loads(PROGRESS_FILE.read_bytes())
         except (json.JSONDecodeError, IOError):
             pass
     return {'last_row': 0, 'total_scanned': 0}
 
 
+def _write_atomic(path: Path, data: bytes):
+    """
+    Replace path with data without ever leaving a truncated file behind.
+
+    Writes a temp file next to it, fsyncs once, then renames it over path.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
 def save_results(results: list):
     """Save results sorted by authority_score then confidence_score."""
     results.sort(key=lambda x: (
@@ -153,8 +264,34 @@ def save_results(results: list):
         x['subdomain']
     ))
 
-    with open(RESULTS_FILE, 'w') as f:
-        json.dump(results, f, indent=2)
+    _write_atomic(RESULTS_FILE, _json_dumps(results))
+
+
+def save_new_entries(new_entries: list):
+    """Append new entries to the NDJSON sidecar without rewriting all_results.json."""
+    with open(RESULTS_LOG_FILE, 'ab') as f:
+        f.writelines(_json_dumps(entry, indent=False) + b'\n' for entry in new_entries)
+
+
+def compact_results() -> int:
+    """
+    Merge the NDJSON sidecar into a sorted all_results.json.
+
+    Returns:
+        Number of results in the compacted file
+    """
+    results, _ = load_existing_results()
+
+    # A compaction interrupted between the rename and the unlink leaves the
+    # sidecar entries in both files; keep the first copy of each subdomain
+    unique = {}
+    for result in results:
+        unique.setdefault(result['subdomain'], result)
+    results = list(unique.values())
+
+    save_results(results)
+    RESULTS_LOG_FILE.unlink(missing_ok=True)
+    return len(results)
 
 
 def save_progress(last_row: int, total_scanned: int, scanned_domains: list = None):
@@ -167,50 +304,108 @@ def save_progress(last_row: int, total_scanned: int, scanned_domains: list = Non
     if scanned_domains:
         data['scanned_domains'] = scanned_domains
 
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    _write_atomic(PROGRESS_FILE, _json_dumps(data))
+
+
+def parse_chunk(lines: list[str]) -> tuple[list, int, int]:
+    """
+    Parse a chunk of log lines (runs in a worker process).
+
+    Returns:
+        tuple: (parsed results in input order, highest row number, line count)
+    """
+    results = []
+    max_row = 0
+
+    for line in lines:
+        result, row_number = parse_log_line(line)
+        if row_number and row_number > max_row:
+            max_row = row_number
+        if result:
+            results.append(result)
+
+    return results, max_row, len(lines)
 
 
-def process_log(lines: list[str]) -> dict:
+def _parse_chunks(line_iter: Iterable[str], jobs: int) -> Iterator[tuple[list, int, int]]:
+    """
+    Parse lines in PARSE_CHUNK_LINES chunks, yielding parse_chunk results in order.
+
+    Chunks are spread over a process pool once the input turns out to be
+    longer than one chunk. At most 2 * jobs chunks are in flight, so input is
+    still read only as fast as it is parsed.
+    """
+    lines = iter(line_iter)
+    chunks = iter(lambda: list(islice(lines, PARSE_CHUNK_LINES)), [])
+
+    first = next(chunks, None)
+    second = next(chunks, None) if first is not None else None
+    if second is None or jobs <= 1:
+        for chunk in chain(filter(None, (first, second)), chunks):
+            yield parse_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chain((first, second), chunks):
+            pending.append(executor.submit(parse_chunk, chunk))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def process_log(line_iter: Iterable[str], dry_run: bool = False, jobs: int | None = None) -> dict:
     """
     Process log lines and update results/progress.
 
+    Lines are consumed in a single pass, so a file handle or sys.stdin can
+    be passed directly without reading the whole log into memory first.
+
+    Args:
+        line_iter: Log lines (file handle, sys.stdin or any iterable of str)
+        dry_run: Parse only, do not save changes
+        jobs: Parser processes for long logs (default: CPU count)
+
     Returns:
         dict with stats about what was updated
     """
-    results, existing_subdomains = load_existing_results()
+    total_results, existing_subdomains = load_existing_subdomains()
     progress = load_progress()
 
     new_entries = []
     max_row = progress.get('last_row', 0)
     parsed_count = 0
+    line_count = 0
 
-    for line in lines:
-        result, row_number = parse_log_line(line)
-
-        if row_number and row_number > max_row:
-            max_row = row_number
+    for chunk_results, chunk_max_row, chunk_lines in _parse_chunks(line_iter, jobs or os.cpu_count() or 1):
+        line_count += chunk_lines
+        parsed_count += len(chunk_results)
+        max_row = max(max_row, chunk_max_row)
 
-        if result:
-            parsed_count += 1
+        # Dedup in input order so the first occurrence of a subdomain wins
+        for result in chunk_results:
             if result['subdomain'] not in existing_subdomains:
                 new_entries.append(result)
                 existing_subdomains.add(result['subdomain'])
 
-    # Merge new entries
-    if new_entries:
-        results.extend(new_entries)
-        save_results(results)
+    if not dry_run:
+        # Append new entries; all_results.json is only rewritten by --compact
+        # or once the sidecar gets large
+        if new_entries:
+            save_new_entries(new_entries)
+            if RESULTS_LOG_FILE.stat().st_size >= COMPACT_THRESHOLD_BYTES:
+                compact_results()
 
-    # Update progress if we found a higher row number
-    if max_row > progress.get('last_row', 0):
-        save_progress(max_row, len(existing_subdomains))
+        # Update progress if we found a higher row number
+        if max_row > progress.get('last_row', 0):
+            save_progress(max_row, len(existing_subdomains))
 
     return {
-        'lines_processed': len(lines),
+        'lines_processed': line_count,
         'entries_parsed': parsed_count,
         'new_entries': len(new_entries),
-        'total_results': len(results),
+        'total_results': total_results + (0 if dry_run else len(new_entries)),
         'last_row': max_row,
         'previous_row': progress.get('last_row', 0)
     }
@@ -233,6 +428,9 @@ Examples:
 
     # Redirect from file:
     python update_from_log.py < log.txt
+
+    # Merge appended entries into the sorted all_results.json:
+    python update_from_log.py --compact
 """
     )
     parser.add_argument(
@@ -249,52 +447,51 @@ Examples:
         action='store_true',
         help='Parse only, do not save changes'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Parser processes for long logs (default: CPU count)'
+    )
+    parser.add_argument(
+        '--compact', '-c',
+        action='store_true',
+        help=f'Merge {RESULTS_LOG_FILE} into a sorted {RESULTS_FILE} and exit'
+    )
 
     args = parser.parse_args()
 
-    # Read input
+    if args.compact:
+        total = compact_results()
+        print(f"Compacted {total} results into {RESULTS_FILE}")
+        return 0
+
+    # Read input, streaming lines straight into the parser
     if args.file:
-        with open(args.file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
         print(f"Reading from file: {args.file}")
+        with open(args.file, 'r', encoding='utf-8', errors='ignore') as f:
+            stats = process_log(f, dry_run=args.dry_run, jobs=args.jobs)
     elif args.paste or sys.stdin.isatty():
         print("Paste Kaggle log output below, then press Ctrl+D (Mac/Linux) or Ctrl+Z+Enter (Windows):")
         print("-" * 60)
-        lines = sys.stdin.readlines()
+        stats = process_log(sys.stdin, dry_run=args.dry_run, jobs=args.jobs)
         print("-" * 60)
     else:
         # Piped input
-        lines = sys.stdin.readlines()
+        stats = process_log(sys.stdin, dry_run=args.dry_run, jobs=args.jobs)
 
-    if not lines:
+    if not stats['lines_processed']:
         print("No input received.")
         return 1
 
-    print(f"\nProcessing {len(lines)} lines...")
+    print(f"\nProcessed {stats['lines_processed']} lines")
 
     if args.dry_run:
-        # Dry run - just parse and show what would happen
-        results, existing = load_existing_results()
-        progress = load_progress()
-
-        new_count = 0
-        max_row = progress.get('last_row', 0)
-
-        for line in lines:
-            result, row_number = parse_log_line(line)
-            if row_number and row_number > max_row:
-                max_row = row_number
-            if result and result['subdomain'] not in existing:
-                new_count += 1
-                existing.add(result['subdomain'])
-
-        print(f"\n[DRY RUN] Would add {new_count} new entries")
-        print(f"[DRY RUN] Would update last_row from {progress.get('last_row', 0)} to {max_row}")
+        # Dry run - just show what would happen
+        print(f"\n[DRY RUN] Would add {stats['new_entries']} new entries")
+        print(f"[DRY RUN] Would update last_row from {stats['previous_row']} to {stats['last_row']}")
         return 0
 
-    # Process and save
-    stats = process_log(lines)
-
     print(f"\n{'='*50}")
     print(f"RESULTS UPDATED")
     print(f"{'='*50}")